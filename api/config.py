@@ -15,9 +15,47 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
 
-    # Qdrant
+    # Qdrant (server for production, embedded for tests/single-node pilots)
+    qdrant_mode: str = "server"  # server, memory, local
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: Optional[str] = None
+    qdrant_path: str = "qdrant_data"  # On-disk storage for local mode
+    qdrant_hnsw_profile: str = "balanced"  # low-latency, balanced, high-recall
+    flyer_image_match_threshold: float = 0.997  # Re-sent flyer photo vs indexed flyer
+    qdrant_warmup_queries: int = 20  # Searches per collection at startup (0 = off)
+
+    # Qdrant outbox relay (Postgres -> Qdrant sync)
+    outbox_relay_interval_seconds: int = 5
+    outbox_batch_size: int = 100
+    outbox_max_attempts: int = 5
+    qdrant_reconcile_interval_seconds: int = 3600
+
+    # Parent message indexing (write-behind buffer)
+    message_index_batch_size: int = 64
+    message_index_flush_seconds: float = 1.0
+    message_index_max_pending: int = 5000
+
+    # Qdrant retention (parent_messages, correction_tickets)
+    message_retention_days: int = 90
+    ticket_retention_days: int = 180
+    retention_interval_seconds: int = 86400
+    retention_batch_size: int = 500
+    compact_message_history: bool = False  # Fold expired messages into per-parent summaries
+
+    # Weekly digests (batch generation)
+    digest_concurrency: int = 16  # Parent digests in flight
+    digest_timeout_seconds: float = 60.0  # Per parent (0 = no limit)
+    digest_shards: int = 0  # Worker processes for sharded runs (0 = one per core)
+    digest_senders: int = 8  # Concurrent sends when delivering a digest stream
+
+    # Digest delivery scheduling (parent's local time, quiet hours, provider rate)
+    delivery_send_time: str = "18:00"  # Preferred local send time
+    delivery_slot_seconds: int = 300
+    delivery_rate_per_second: float = 10.0  # Provider throughput (messages/s), paced per worker
+    delivery_schedule_backend: str = "redis"  # redis, memory
+    delivery_default_timezone: str = "America/Vancouver"
+    delivery_retry_seconds: int = 300  # First retry of a failed send (doubles per failure)
+    delivery_max_retries: int = 3
 
     # Gemini AI
     gemini_api_key: Optional[str] = None
@@ -1,5 +1,5 @@
 """Database configuration with hybrid SQLite/PostgreSQL support"""
-from sqlalchemy import create_engine, String, JSON
+from sqlalchemy import create_engine, inspect, String, JSON
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
 from typing import AsyncGenerator, Generator
@@ -12,6 +12,52 @@ IS_POSTGRES = settings.database_url.startswith("postgresql")
 # Base class for models (shared by both modes)
 Base = declarative_base()
 
+
+def _add_missing_columns(connection) -> None:
+    """
+    Add nullable model columns missing from existing tables
+
+    create_all never alters a table that already exists, so a column added
+    to the model later (e.g. items.school_id, newsletters.school_id) would
+    otherwise break every ORM query on an older database. Only nullable,
+    non-key columns are added; anything else needs a hand-written migration.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or column.primary_key or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            )
+
+
+def _create_missing_indexes(connection) -> None:
+    """
+    Create model indexes missing from existing tables
+
+    create_all skips tables that already exist, and with them any index
+    added to the model later (e.g. ix_items_audience_tags,
+    ix_items_approved_window); checkfirst makes this a no-op once created.
+    Run after _add_missing_columns: an index whose columns are still
+    missing from the table is skipped rather than failing startup.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if any(column.name not in existing for column in index.columns):
+                continue
+            index.create(connection, checkfirst=True)
+
 if IS_SQLITE:
     # ===== SQLite Mode (Synchronous) =====
 
@@ -44,6 +90,9 @@ if IS_SQLITE:
     def init_db():
         """Initialize database tables (sync)"""
         Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            _add_missing_columns(conn)
+            _create_missing_indexes(conn)
         print("[OK] SQLite database initialized")
 
 else:
@@ -81,6 +130,8 @@ else:
         """Initialize database tables (async)"""
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+            await conn.run_sync(_create_missing_indexes)
         print("[OK] PostgreSQL database initialized")
 
 
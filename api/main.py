@@ -3,12 +3,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from api.config import settings
 from api.database import init_db
 from api.routers import health, intake, admin, family, webhooks
 from api.services.qdrant_service import init_qdrant_collections
+from api.services.qdrant_outbox import run_outbox_relay
+from api.services.message_indexer import message_index_buffer
+from api.services.qdrant_retention import run_retention_loop
+from api.services.qdrant_backup import warm_up_collections
 
 # Configure logging
 logging.basicConfig(
@@ -37,11 +42,40 @@ async def lifespan(app: FastAPI):
         logger.error(f"Startup error: {e}")
         raise
 
+    # Page in Qdrant segments before the first parent query (best-effort)
+    if settings.qdrant_warmup_queries:
+        try:
+            await asyncio.to_thread(warm_up_collections)
+        except Exception as e:
+            logger.warning(f"Qdrant warm-up skipped: {e}")
+
+    # Start write-behind message indexer
+    message_index_buffer.start()
+
+    # Start Qdrant outbox relay (approved items reach Qdrant only through it)
+    relay_stop = asyncio.Event()
+    relay_task = asyncio.create_task(run_outbox_relay(relay_stop))
+    logger.info("Qdrant outbox relay started")
+
+    # Start retention pruning for message history and tickets
+    retention_stop = asyncio.Event()
+    retention_task = asyncio.create_task(run_retention_loop(retention_stop))
+
     yield
 
     # Shutdown
     logger.info("Shutting down ParentPath API...")
 
+    relay_stop.set()
+    await relay_task
+
+    retention_stop.set()
+    await retention_task
+
+    # Flush buffered message history before exit
+    await message_index_buffer.stop()
+    logger.info(f"Message indexer stopped: {message_index_buffer.stats}")
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -1,20 +1,23 @@
 """Database models"""
 from api.models.parent import Parent, Child, Subscription
-from api.models.item import Item, Newsletter
+from api.models.item import Item, ItemAudienceTag, Newsletter
 from api.models.card import Card
 from api.models.message import MessageLog
 from api.models.ticket import Ticket
 from api.models.audit import AuditLog, PointTransaction
+from api.models.outbox import QdrantOutbox
 
 __all__ = [
     "Parent",
     "Child",
     "Subscription",
     "Item",
+    "ItemAudienceTag",
     "Newsletter",
     "Card",
     "MessageLog",
     "Ticket",
     "AuditLog",
     "PointTransaction",
+    "QdrantOutbox",
 ]
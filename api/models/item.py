@@ -1,10 +1,11 @@
 """Newsletter and item models"""
 from sqlalchemy import Column, String, Text, Date, Time, Integer, DECIMAL, Boolean, DateTime, ForeignKey, BIGINT
+from sqlalchemy import DDL, Index, event, select, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 
-from api.database import Base, UUID, ARRAY
+from api.database import Base, UUID, ARRAY, IS_SQLITE
 
 
 class Newsletter(Base):
@@ -12,6 +13,7 @@ class Newsletter(Base):
     __tablename__ = "newsletters"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    school_id = Column(UUID(as_uuid=True), nullable=True)
     title = Column(String(255), nullable=True)
     publish_date = Column(Date, nullable=False)
     file_hash = Column(String(64), nullable=False, unique=True)
@@ -48,6 +50,7 @@ class Item(Base):
     cost = Column(DECIMAL(10, 2), nullable=True)
 
     # Source tracking
+    school_id = Column(UUID(as_uuid=True), nullable=True, index=True)  # Qdrant tenant key
     source_newsletter_id = Column(UUID(as_uuid=True), ForeignKey("newsletters.id"), nullable=True)
     source_url = Column(Text, nullable=True)
     source_snippet = Column(Text, nullable=True)
@@ -73,5 +76,69 @@ class Item(Base):
     newsletter = relationship("Newsletter", back_populates="items")
     cards = relationship("Card", back_populates="item")
 
+    # Targeting: approved items in a created_at window, audience overlap
+    # (GIN on the array in PostgreSQL; item_audience_tags in SQLite)
+    __table_args__ = (
+        Index(
+            "ix_items_approved_window", "created_at", "date",
+            postgresql_where=text("status = 'approved'"),
+            sqlite_where=text("status = 'approved'")
+        ),
+        *([] if IS_SQLITE else [
+            Index("ix_items_audience_tags", "audience_tags", postgresql_using="gin"),
+        ]),
+    )
+
     def __repr__(self):
         return f"<Item {self.id} {self.type}: {self.title}>"
+
+
+@event.listens_for(Item, "before_insert")
+def _inherit_newsletter_school(mapper, connection, target):
+    """New items are scoped to their newsletter's school (Qdrant tenant key)"""
+    if target.school_id is None and target.source_newsletter_id is not None:
+        target.school_id = connection.scalar(
+            select(Newsletter.school_id).where(Newsletter.id == target.source_newsletter_id)
+        )
+
+
+class ItemAudienceTag(Base):
+    """
+    One row per (item, audience tag): indexed tag lookups for SQLite, where
+    audience_tags is a JSON column. Kept in sync by triggers on items
+    (created with this table, which also backfills existing items).
+    Unused in PostgreSQL, which indexes the array itself.
+    """
+    __tablename__ = "item_audience_tags"
+
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(Text, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_item_audience_tags_tag", "tag", "item_id"),
+    )
+
+    def __repr__(self):
+        return f"<ItemAudienceTag {self.item_id} {self.tag}>"
+
+
+_AUDIENCE_TAGS_OF_NEW = (
+    "INSERT OR IGNORE INTO item_audience_tags (item_id, tag) "
+    "SELECT NEW.id, value FROM json_each(NEW.audience_tags);"
+)
+
+for _statement in (
+    "CREATE TRIGGER IF NOT EXISTS items_audience_tags_insert AFTER INSERT ON items "
+    f"BEGIN {_AUDIENCE_TAGS_OF_NEW} END",
+    "CREATE TRIGGER IF NOT EXISTS items_audience_tags_update AFTER UPDATE OF audience_tags ON items "
+    f"BEGIN DELETE FROM item_audience_tags WHERE item_id = OLD.id; {_AUDIENCE_TAGS_OF_NEW} END",
+    "CREATE TRIGGER IF NOT EXISTS items_audience_tags_delete AFTER DELETE ON items "
+    "BEGIN DELETE FROM item_audience_tags WHERE item_id = OLD.id; END",
+    "INSERT OR IGNORE INTO item_audience_tags (item_id, tag) "
+    "SELECT items.id, json_each.value FROM items, json_each(items.audience_tags)",
+):
+    event.listen(
+        ItemAudienceTag.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite")
+    )
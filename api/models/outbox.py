@@ -0,0 +1,29 @@
+"""Outbox model - pending Qdrant sync operations"""
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from datetime import datetime
+import uuid
+
+from api.database import Base, UUID
+
+
+class QdrantOutbox(Base):
+    """Qdrant sync operation, written in the same transaction as the entity change"""
+    __tablename__ = "qdrant_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity_type = Column(String(50), nullable=False, default="item")  # item
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    operation = Column(String(20), nullable=False)  # upsert, delete
+    status = Column(String(20), default="pending")  # pending, done, failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, default=datetime.utcnow)  # next attempt (retry backoff)
+    processed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_qdrant_outbox_pending", "status", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<QdrantOutbox {self.id} {self.operation} {self.entity_type}:{self.entity_id} {self.status}>"
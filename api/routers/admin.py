@@ -2,12 +2,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from collections import defaultdict
 from datetime import datetime
 import logging
+import uuid
 
 from api.database import get_db
 from api.models import Item, Newsletter, Ticket
+from api.services.qdrant_service import find_duplicate_items_batch, item_embedding_text
+from api.services.qdrant_outbox import enqueue_item_sync
+from api.services.newsletter_dedupe import dedupe_newsletter_items
+from api.services.fragment_cache import fragment_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -64,11 +70,83 @@ async def list_newsletters(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/newsletters/{newsletter_id}/duplicates")
+async def review_newsletter_duplicates(
+    newsletter_id: str,
+    threshold: float = Query(0.85, ge=0, le=1),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Group a newsletter's pending items into distinct items for review
+
+    The same event repeated in one newsletter (page 2 and page 9) comes
+    back as one group; each group also lists similar items the school has
+    already published.
+
+    Args:
+        newsletter_id: UUID of newsletter
+        threshold: Similarity threshold for duplicates
+
+    Returns:
+        One group per distinct item (representative, copies, existing matches)
+    """
+    try:
+        result = await db.execute(select(Newsletter).where(Newsletter.id == newsletter_id))
+        newsletter = result.scalar_one_or_none()
+
+        if not newsletter:
+            raise HTTPException(status_code=404, detail="Newsletter not found")
+
+        stmt = select(Item).where(
+            Item.source_newsletter_id == newsletter_id,
+            Item.status == "pending"
+        ).order_by(Item.source_page, Item.created_at)
+        result = await db.execute(stmt)
+        items = result.scalars().all()
+
+        groups = await dedupe_newsletter_items(
+            [
+                {
+                    field: getattr(item, field)
+                    for field in ("title", "description", "location", "confidence_score")
+                    if getattr(item, field) is not None
+                }
+                for item in items
+            ],
+            threshold=threshold,
+            school_id=str(newsletter.school_id) if newsletter.school_id else None
+        )
+
+        return {
+            "newsletter_id": str(newsletter.id),
+            "groups": [
+                {
+                    "item_id": str(items[group["item_index"]].id),
+                    "title": items[group["item_index"]].title,
+                    "duplicate_item_ids": [str(items[i].id) for i in group["duplicate_indices"]],
+                    "existing_matches": [
+                        {"id": str(match["id"]), "title": match.get("title"), "score": match["score"]}
+                        for match in group["existing_matches"]
+                    ]
+                }
+                for group in groups
+            ],
+            "total_items": len(items),
+            "total_groups": len(groups)
+        }
+
+    except Exception as e:
+        logger.error(f"Error reviewing newsletter duplicates: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/items")
 async def list_items(
     status: str = "pending",
     limit: int = Query(20, le=100),
     offset: int = 0,
+    school_id: Optional[uuid.UUID] = None,
+    include_similar: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -78,18 +156,25 @@ async def list_items(
         status: Filter by status (pending, approved, rejected)
         limit: Max results
         offset: Pagination offset
+        school_id: Only this school's items (optional)
+        include_similar: Look up possible duplicates among each item's
+            school's indexed items (embedding + Qdrant query)
 
     Returns:
-        List of items with confidence scores and similar items
+        List of items with confidence scores (and similar items if requested)
     """
     try:
         stmt = select(Item).where(Item.status == status).limit(limit).offset(offset)
+        if school_id:
+            stmt = stmt.where(Item.school_id == str(school_id))
         stmt = stmt.order_by(Item.created_at.desc())
 
         result = await db.execute(stmt)
         items = result.scalars().all()
 
-        # TODO: Enrich with Qdrant similar items
+        # Similar items cost an embedding call and a Qdrant query per
+        # school on the page, so they are only looked up on request
+        similar = await _similar_items(items) if include_similar else {}
 
         return {
             "items": [
@@ -103,7 +188,8 @@ async def list_items(
                     "confidence_score": float(item.confidence_score) if item.confidence_score else 0,
                     "gemini_reasoning": item.gemini_reasoning,
                     "status": item.status,
-                    "created_at": item.created_at.isoformat()
+                    "created_at": item.created_at.isoformat(),
+                    "similar_items": similar.get(str(item.id), [])
                 }
                 for item in items
             ],
@@ -116,6 +202,43 @@ async def list_items(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _similar_items(items: List[Item]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Possible duplicates of a page of items, one batch lookup per school
+
+    Args:
+        items: Items on the page
+
+    Returns:
+        Dict of item ID -> similar indexed items (id, title, score)
+    """
+    by_school: Dict[Optional[str], List[Item]] = defaultdict(list)
+    for item in items:
+        by_school[str(item.school_id) if item.school_id else None].append(item)
+
+    similar = {}
+    for item_school_id, group in by_school.items():
+        hits = await find_duplicate_items_batch(
+            [
+                item_embedding_text({
+                    "title": item.title,
+                    "description": item.description,
+                    "location": item.location
+                })
+                for item in group
+            ],
+            exclude_ids=[str(item.id) for item in group],
+            school_id=item_school_id
+        )
+        for item, item_hits in zip(group, hits):
+            similar[str(item.id)] = [
+                {"id": str(hit["id"]), "title": hit.get("title"), "score": hit["score"]}
+                for hit in item_hits
+            ]
+
+    return similar
+
+
 @router.post("/items/{item_id}/approve")
 async def approve_item(
     item_id: str,
@@ -148,16 +271,25 @@ async def approve_item(
                 if hasattr(item, field):
                     setattr(item, field, value)
 
+            # Already published: delta digests re-send it as changed
+            if item.status == "approved":
+                item.updated_flag = True
+
         item.status = "approved"
         item.approved_at = datetime.utcnow()
         # item.approved_by = current_admin_id  # TODO: Add auth
 
+        # Qdrant indexing happens in the outbox relay (same transaction)
+        enqueue_item_sync(db, item)
+
         await db.commit()
         await db.refresh(item)
 
-        logger.info(f"Item {item_id} approved")
+        # Edited text: drop this item's rendered digest fragments
+        if edits:
+            fragment_cache.invalidate(item.id)
 
-        # TODO: Index in Qdrant
+        logger.info(f"Item {item_id} approved")
 
         return {
             "id": str(item.id),
@@ -196,6 +328,9 @@ async def reject_item(
 
         item.status = "rejected"
 
+        # Remove from search via the outbox relay (same transaction)
+        enqueue_item_sync(db, item)
+
         await db.commit()
 
         logger.info(f"Item {item_id} rejected: {reason}")
@@ -2,14 +2,19 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Optional
+import asyncio
 import hashlib
 import shutil
+import uuid
 from pathlib import Path
 from datetime import date
 import logging
 
 from api.database import get_db
 from api.models import Newsletter
+from api.services.image_embedding import embed_image
+from api.services.qdrant_service import find_item_by_image
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,6 +28,7 @@ async def upload_newsletter(
     file: UploadFile = File(...),
     title: str = None,
     publish_date: str = None,
+    school_id: Optional[uuid.UUID] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -32,10 +38,13 @@ async def upload_newsletter(
         file: PDF or image file
         title: Newsletter title (optional)
         publish_date: YYYY-MM-DD format (optional, defaults to today)
+        school_id: UUID of the publishing school (optional, validated)
 
     Returns:
         Newsletter ID and status
     """
+    school_id = str(school_id) if school_id else None
+
     try:
         # Validate file type
         if not file.content_type in ["application/pdf", "image/jpeg", "image/png"]:
@@ -71,6 +80,7 @@ async def upload_newsletter(
 
         # Create newsletter record
         newsletter = Newsletter(
+            school_id=school_id,
             title=title or file.filename,
             publish_date=date.fromisoformat(publish_date) if publish_date else date.today(),
             file_hash=file_hash,
@@ -89,18 +99,56 @@ async def upload_newsletter(
         # TODO: Queue parsing job
         # await queue_parse_job(str(newsletter.id))
 
-        return {
+        response = {
             "newsletter_id": str(newsletter.id),
             "status": "queued",
             "estimated_parse_time": "10 minutes",
             "message": "Newsletter queued for parsing"
         }
 
+        # Possibly a re-sent flyer photo (different bytes, same flyer): a
+        # hint for review only, the upload is stored and queued regardless.
+        # Scoped to the school; other schools' flyers are never compared.
+        if school_id and file.content_type.startswith("image/"):
+            match = await _match_flyer_photo(content, school_id)
+            if match:
+                logger.info(f"Newsletter {newsletter.id} looks like flyer of item {match['id']}")
+                response["possible_duplicate"] = {
+                    "item_id": str(match["id"]),
+                    "title": match.get("title"),
+                    "score": match["score"]
+                }
+
+        return response
+
     except Exception as e:
         logger.error(f"Error uploading newsletter: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _match_flyer_photo(content: bytes, school_id: str):
+    """
+    Look up one school's indexed item by flyer photo
+
+    Args:
+        content: Uploaded image bytes
+        school_id: UUID of the school
+
+    Returns:
+        Matching item dict or None
+    """
+    try:
+        image_vector = await asyncio.to_thread(embed_image, content)
+    except Exception as e:
+        logger.warning(f"Could not embed uploaded image: {e}")
+        return None
+
+    if not image_vector:
+        return None
+
+    return await find_item_by_image(image_vector, school_id=school_id)
+
+
 @router.post("/email")
 async def email_webhook(
     # Email webhook payload from SendGrid/Mailgun
@@ -0,0 +1,99 @@
+"""
+ParentPath Audience Index - Inverted index from audience tag to items
+
+Purpose: Target a window of items to many parents without a per-parent
+audience_tags query (see batch_analyzer.audience_overlap for the
+index-backed SQL form used by single-parent lookups)
+
+Architecture:
+    AudienceIndex(items)            - built once per window, items in date order
+      ├─ postings: tag -> sorted item positions
+      ├─ positions(tags)            - k-way merge of the tags' posting lists
+      └─ match(tags)                - matching items, in window order
+
+A parent's tags are their children's grade tags, their activity
+subscriptions and "all" (see BatchAnalyzer._audience_tags), so a match is
+the union of a handful of short lists. Used by digests, and reusable for
+reminders and delta fan-out over the same window.
+
+Integration:
+- api/services/batch_analyzer.py (set-based digests)
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+
+class AudienceIndex:
+    """
+    Tag -> sorted positions into a fixed list of items
+
+    Items are expected in delivery order (date ascending); positions
+    preserve it, so merged results need no re-sort.
+    """
+
+    def __init__(self, items: Sequence[Any]):
+        """
+        Build the index
+
+        Args:
+            items: Items with an audience_tags list, in delivery order
+        """
+        self.items = list(items)
+
+        postings: Dict[str, List[int]] = {}
+        for position, item in enumerate(self.items):
+            for tag in set(item.audience_tags or ()):
+                postings.setdefault(tag, []).append(position)
+
+        # Positions are appended in increasing order, so lists are sorted
+        self.postings: Dict[str, Tuple[int, ...]] = {
+            tag: tuple(positions) for tag, positions in postings.items()
+        }
+
+    def __len__(self) -> int:
+        """Number of items in the window"""
+        return len(self.items)
+
+    @property
+    def tags(self) -> List[str]:
+        """Tags present in the window"""
+        return list(self.postings)
+
+    def positions(self, tags: Iterable[str]) -> List[int]:
+        """
+        Sorted, de-duplicated positions of items carrying any of the tags
+
+        Args:
+            tags: Audience tags (e.g., ['grade_5', 'Basketball', 'all'])
+
+        Returns:
+            Ascending item positions
+        """
+        lists = [self.postings[tag] for tag in set(tags) if tag in self.postings]
+
+        if not lists:
+            return []
+        if len(lists) == 1:
+            return list(lists[0])
+
+        merged = []
+        last = -1
+        for position in heapq.merge(*lists):
+            if position != last:
+                merged.append(position)
+                last = position
+        return merged
+
+    def match(self, tags: Iterable[str]) -> List[Any]:
+        """
+        Items carrying any of the tags, in window order
+
+        Args:
+            tags: Audience tags
+
+        Returns:
+            Matching items
+        """
+        items = self.items
+        return [items[position] for position in self.positions(tags)]
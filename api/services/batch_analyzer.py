@@ -11,23 +11,91 @@ Architecture:
       ├─ Group by type (Events, PermissionSlips, etc.)
       └─ Format with emojis for WhatsApp + translate
 
+Set-based batch mode (generate_batch_digests default):
+    1 query for the approved items in the date window, then parents in
+    keyset-paged chunks with children + subscriptions eager-loaded
+    (selectinload, 3 queries per chunk); items are matched to parents in
+    memory through an AudienceIndex (tag -> posting list). Query count no
+    longer grows with parents x relationships.
+
+    Families with the same audience signature (grade set, activity set,
+    language, window) get the same digest, so each distinct digest is
+    formatted and translated once as a template; per-family fields (child
+    names) are filled in afterwards.
+
+    stream_batch_digests yields (parent_id, digest) chunk by chunk for
+    senders (see digest_delivery.py); generate_batch_digests collects the
+    same stream into a dict.
+
+    Delta mode (delta=True) anti-joins each chunk's parents and window
+    items against delivered Cards in SQL (NOT EXISTS) and sends only new
+    items and items edited since delivery, as a short "what changed"
+    message; parents with nothing new get no message.
+
+Parents are served as concurrent tasks (settings.digest_concurrency in
+flight, settings.digest_timeout_seconds each), so translation round trips
+overlap; a failing or slow parent gets an error message and is logged
+without holding up the batch. DB access stays synchronous on one session,
+done between awaits.
+
+Rendering works on fragments: each item's text and the digest labels are
+formatted and translated once per language (batched Gemini calls) and
+cached by (item id, updated_at, language), then assembled into digests.
+
 Integration:
 - api/models/parent.py (Parent, Child, Subscription models)
 - api/models/item.py (Item model with audience_tags)
+- api/models/card.py (Card delivery state for delta digests)
 - api/services/gemini_service.py (translation)
+- api/services/audience_index.py (in-memory targeting)
+- api/services/fragment_cache.py (per-item, per-language fragments)
+- api/services/digest_shards.py (multi-process runs over parent shards)
+- api/services/digest_delivery.py (streaming send + message log)
 
 Evidence:
 - chai/batch_analyzer.py:162-211 (parallel analysis pattern)
 - chai/batch_analyzer.py:302-353 (aggregation pattern)
 """
 
-from typing import Dict, List, Any, Optional
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, exists, or_, select, true
 
+from api.config import settings
+from api.database import IS_SQLITE
 from api.models.parent import Parent, Child, Subscription
-from api.models.item import Item
+from api.models.item import Item, ItemAudienceTag
+from api.models.card import Card
+from api.services.audience_index import AudienceIndex
+from api.services.fragment_cache import FragmentCache, fragment_cache
+from api.services.gemini_service import translate_texts
+
+logger = logging.getLogger(__name__)
+
+
+def audience_overlap(tags: List[str]):
+    """
+    SQL condition: item carries any of the audience tags (index-backed)
+
+    PostgreSQL: audience_tags && ARRAY[...] (GIN ix_items_audience_tags).
+    SQLite: id IN (tag lookup on item_audience_tags).
+
+    Args:
+        tags: Audience tags (e.g., ['grade_5', 'Basketball', 'all'])
+
+    Returns:
+        SQLAlchemy boolean clause
+    """
+    tags = list(tags)
+    if IS_SQLITE:
+        return Item.id.in_(
+            select(ItemAudienceTag.item_id).where(ItemAudienceTag.tag.in_(tags))
+        )
+    return Item.audience_tags.overlap(tags)
 
 
 class BatchAnalyzer:
@@ -52,19 +120,47 @@ class BatchAnalyzer:
         'default': '📌'
     }
 
-    def __init__(self, db: Session):
+    # Parents per chunk in set-based mode (matches selectinload's IN batch
+    # size, so each chunk is exactly one query per relationship)
+    PARENT_CHUNK_SIZE = 500
+
+    # Per-family field in digest templates (kept verbatim by translation)
+    CHILDREN_PLACEHOLDER = "{children}"
+
+    # Digest sections in display order
+    TYPE_ORDER = ['Event', 'PermissionSlip', 'Fundraiser', 'HotLunch', 'Announcement']
+
+    # Digest chrome, translated once per language like item fragments
+    DIGEST_LABELS = {
+        'title': 'Weekly Digest',
+        'greeting': 'Updates for {children}:',
+        'total': 'Total: {count} items',
+        'delta_title': "What's New",
+        'new': 'New',
+        'changed': 'Changed',
+        **{item_type: f'{item_type}s' for item_type in TYPE_ORDER}
+    }
+
+    def __init__(self, db: Session, cache: Optional[FragmentCache] = None):
         """
         Initialize batch analyzer
 
         Args:
             db: SQLAlchemy session
+            cache: Fragment cache (default the shared process cache)
         """
         self.db = db
+        self.cache = cache if cache is not None else fragment_cache
+
+        # Last batch run: parents served, distinct digests rendered,
+        # failures/timeouts and throughput (see generate_batch_digests)
+        self.stats = {"parents": 0, "rendered": 0, "failed": 0, "timed_out": 0}
 
     async def generate_digest(
         self,
         parent: Parent,
-        date_range_days: int = 7
+        date_range_days: int = 7,
+        items: Optional[List[Item]] = None
     ) -> str:
         """
         Generate personalized weekly digest for parent
@@ -74,26 +170,50 @@ class BatchAnalyzer:
         Args:
             parent: Parent record
             date_range_days: Number of days to include (default 7)
+            items: Items already matched to this parent (set-based mode);
+                queried when None
 
         Returns:
             Formatted digest text for WhatsApp
         """
+        template = await self._render_digest_template(parent, date_range_days, items)
+        return self._fill_digest(template, parent)
+
+    async def _render_digest_template(
+        self,
+        parent: Parent,
+        date_range_days: int,
+        items: Optional[List[Item]] = None
+    ) -> str:
+        """
+        Format (and translate) a digest with per-family fields left as
+        placeholders, so it can be shared by every parent with the same
+        audience signature
+
+        Args:
+            parent: Parent record (any parent with the signature)
+            date_range_days: Number of days to include
+            items: Items already matched to this signature; queried when None
+
+        Returns:
+            Digest template (see _fill_digest)
+        """
         # Get children and their grades/activities
         children = parent.children
 
         if not children:
             return self._format_no_children_message(parent)
 
-        # Build filter criteria
-        grade_list = [child.grade for child in children]
-        activity_list = [sub.activity for sub in parent.subscriptions]
-
         # Query relevant items
-        items = self._query_relevant_items(
-            grade_list=grade_list,
-            activity_list=activity_list,
-            date_range_days=date_range_days
-        )
+        if items is None:
+            grade_list = [child.grade for child in children]
+            activity_list = [sub.activity for sub in parent.subscriptions]
+
+            items = self._query_relevant_items(
+                grade_list=grade_list,
+                activity_list=activity_list,
+                date_range_days=date_range_days
+            )
 
         if not items:
             return self._format_no_items_message(parent, date_range_days)
@@ -101,18 +221,195 @@ class BatchAnalyzer:
         # Group items by type
         grouped_items = self._group_items_by_type(items)
 
+        # Item fragments + labels in the parent's language (cached)
+        fragments, labels = await self._render_fragments(items, parent.language or 'en')
+
         # Format digest
-        digest = self._format_digest(
+        return self._format_digest(
             parent=parent,
             grouped_items=grouped_items,
-            date_range_days=date_range_days
+            date_range_days=date_range_days,
+            children_text=self.CHILDREN_PLACEHOLDER,
+            fragments=fragments,
+            labels=labels
+        )
+
+    def _fragment_key(self, item: Item, language: str) -> Tuple:
+        """Cache key of an item's fragment (edits change updated_at)"""
+        return (item.id, item.updated_at, language)
+
+    def _label_key(self, name: str, language: str) -> Tuple:
+        """Cache key of a digest label"""
+        return (f"label:{name}", None, language)
+
+    async def _render_fragments(
+        self,
+        items: List[Item],
+        language: str
+    ) -> Tuple[Dict[Any, str], Dict[str, str]]:
+        """
+        Item fragments and digest labels in one language
+
+        English fragments come from _format_item; anything missing from the
+        cache in another language is translated in one batched call.
+        Fallbacks (translation returned the English text) are not cached,
+        so they are retried on the next render.
+
+        Args:
+            items: Items in the digest
+            language: ISO 639-1 code
+
+        Returns:
+            (item id -> fragment, label name -> label)
+        """
+        english = {}
+        for item in items:
+            key = self._fragment_key(item, 'en')
+            text = self.cache.get(key)
+            if text is None:
+                text = self._format_item(item)
+                self.cache.set(key, text)
+            english[item.id] = text
+
+        if language == 'en':
+            return english, dict(self.DIGEST_LABELS)
+
+        wanted = {self._fragment_key(item, language): english[item.id] for item in items}
+        wanted.update({
+            self._label_key(name, language): label
+            for name, label in self.DIGEST_LABELS.items()
+        })
+
+        found = self.cache.get_many(list(wanted))
+        missing = [key for key in wanted if key not in found]
+
+        if missing:
+            translated = await translate_texts([wanted[key] for key in missing], language)
+            for key, text in zip(missing, translated):
+                found[key] = text
+                if text != wanted[key]:
+                    self.cache.set(key, text)
+
+        fragments = {item.id: found[self._fragment_key(item, language)] for item in items}
+        labels = {
+            name: found[self._label_key(name, language)]
+            for name in self.DIGEST_LABELS
+        }
+        return fragments, labels
+
+    def _pending_deliveries(
+        self,
+        parents: List[Parent],
+        items: List[Item]
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        (parent, item) pairs of a chunk still to deliver (one anti-join query)
+
+        A pair is pending unless a delivered card exists that is not older
+        than the item's last edit after approval (updated_flag with
+        updated_at past delivered_at). Cards are only read inside the
+        NOT EXISTS, bounded by chunk x window and the chunk's audience tags.
+
+        Args:
+            parents: Parent chunk
+            items: Window items
+
+        Returns:
+            (parent_id, item_id) -> True if delivered before (changed),
+            False if never delivered (new); IDs as strings
+        """
+        if not parents or not items:
+            return {}
+
+        delivered = and_(
+            Card.parent_id == Parent.id,
+            Card.item_id == Item.id,
+            Card.delivered_at.isnot(None)
+        )
+        up_to_date = or_(
+            Item.updated_flag.isnot(True),
+            Item.updated_at.is_(None),
+            Item.updated_at <= Card.delivered_at
         )
+        chunk_tags = sorted({tag for parent in parents for tag in self._parent_audience_tags(parent)})
+
+        rows = self.db.query(
+            Parent.id, Item.id, exists().where(delivered)
+        ).join(Item, true()).filter(
+            and_(
+                Parent.id.in_([parent.id for parent in parents]),
+                Item.id.in_([item.id for item in items]),
+                audience_overlap(chunk_tags),
+                ~exists().where(and_(delivered, up_to_date))
+            )
+        ).all()
+
+        return {(str(parent_id), str(item_id)): bool(changed) for parent_id, item_id, changed in rows}
+
+    def _delta_items(
+        self,
+        parent: Parent,
+        matched: List[Item],
+        pending: Dict[Tuple[str, str], bool]
+    ) -> Tuple[List[Item], List[Item]]:
+        """
+        Split a parent's matched items into new and changed
+
+        Anything not in pending was already received as-is and is dropped.
+
+        Args:
+            parent: Parent record
+            matched: Items matching the parent's audience tags
+            pending: Output of _pending_deliveries for the parent's chunk
+
+        Returns:
+            (new items, changed items), each in window order
+        """
+        new, changed = [], []
+        parent_id = str(parent.id)
+
+        for item in matched:
+            state = pending.get((parent_id, str(item.id)))
+            if state is False:
+                new.append(item)
+            elif state:
+                changed.append(item)
+
+        return new, changed
+
+    async def _render_delta_template(
+        self,
+        parent: Parent,
+        new: List[Item],
+        changed: List[Item]
+    ) -> str:
+        """
+        Compact "what changed" message template (see _fill_digest)
+
+        Args:
+            parent: Parent record (any parent with the same delta)
+            new: Items not delivered yet
+            changed: Delivered items edited since
+
+        Returns:
+            Message template
+        """
+        fragments, labels = await self._render_fragments(new + changed, parent.language or 'en')
 
-        # Translate if needed
-        if parent.language != 'en':
-            digest = await self._translate_digest(digest, parent.language)
+        lines = [f"🔔 *{labels['delta_title']}*", ""]
+        lines.append(labels['greeting'])
+        lines.append("")
+
+        for label, section in (('new', new), ('changed', changed)):
+            if not section:
+                continue
+            lines.append(f"*{labels[label]} ({len(section)})*")
+            lines.append("")
+            for item in section:
+                lines.append(fragments[item.id])
+                lines.append("")
 
-        return digest
+        return "\n".join(lines).rstrip()
 
     def _query_relevant_items(
         self,
@@ -134,38 +431,172 @@ class BatchAnalyzer:
             List of matching items
         """
         # Calculate date range
-        now = datetime.utcnow()
-        cutoff_date = now - timedelta(days=date_range_days)
+        cutoff_date = self._cutoff_date(date_range_days)
 
         # Build audience tag filters
-        audience_filters = []
-
-        # Grade tags (e.g., 'grade_5')
-        for grade in grade_list:
-            audience_filters.append(f'grade_{grade}')
+        audience_filters = self._audience_tags(grade_list, activity_list)
 
-        # Activity tags
-        audience_filters.extend(activity_list)
-
-        # Add 'all' tag (applies to everyone)
-        audience_filters.append('all')
-
-        # Query items
-        # Note: PostgreSQL array overlap operator
-        # audience_tags && ARRAY['grade_5', 'Basketball', 'all']
+        # Query items (partial index on approved created_at/date + tag index)
         items = self.db.query(Item).filter(
             and_(
                 Item.status == 'approved',
                 Item.created_at >= cutoff_date,
-                or_(*[
-                    Item.audience_tags.contains([tag])
-                    for tag in audience_filters
-                ])
+                audience_overlap(audience_filters)
             )
         ).order_by(Item.date.asc()).all()
 
         return items
 
+    def _fill_digest(self, template: str, parent: Parent) -> str:
+        """
+        Fill a digest template's per-family fields
+
+        Args:
+            template: Output of _render_digest_template
+            parent: Recipient
+
+        Returns:
+            Digest text for this parent
+        """
+        return template.replace(self.CHILDREN_PLACEHOLDER, self._child_names_text(parent))
+
+    def _child_names_text(self, parent: Parent) -> str:
+        """Children named in the greeting (grade when unnamed)"""
+        return ", ".join(child.name or f"Grade {child.grade}" for child in parent.children)
+
+    def _digest_signature(self, parent: Parent, date_range_days: int) -> Tuple:
+        """
+        Canonical audience signature: parents that share it get the same
+        digest apart from per-family fields
+
+        Args:
+            parent: Parent record (children and subscriptions loaded)
+            date_range_days: Date range in days
+
+        Returns:
+            (grades, activities, language, date_range_days); an empty grade
+            set means the no-children message
+        """
+        return (
+            tuple(sorted({child.grade for child in parent.children})),
+            tuple(sorted({sub.activity for sub in parent.subscriptions})),
+            parent.language or 'en',
+            date_range_days
+        )
+
+    def _cutoff_date(self, date_range_days: int) -> datetime:
+        """Earliest created_at included in a digest"""
+        return datetime.utcnow() - timedelta(days=date_range_days)
+
+    def _audience_tags(
+        self,
+        grade_list: List[int],
+        activity_list: List[str]
+    ) -> List[str]:
+        """
+        Audience tags a parent receives
+
+        Args:
+            grade_list: List of child grades
+            activity_list: List of subscribed activities
+
+        Returns:
+            Grade tags (e.g., 'grade_5'), activity tags and 'all'
+        """
+        tags = [f'grade_{grade}' for grade in grade_list]
+        tags.extend(activity_list)
+        tags.append('all')  # applies to everyone
+        return tags
+
+    def _parent_audience_tags(self, parent: Parent) -> List[str]:
+        """Audience tags from a parent's (loaded) children and subscriptions"""
+        return self._audience_tags(
+            [child.grade for child in parent.children],
+            [sub.activity for sub in parent.subscriptions]
+        )
+
+    def _load_window_items(self, date_range_days: int) -> List[Item]:
+        """
+        Load every approved item in the date window (one query)
+
+        Args:
+            date_range_days: Date range in days
+
+        Returns:
+            Items in digest order (date ascending)
+        """
+        return self.db.query(Item).filter(
+            and_(
+                Item.status == 'approved',
+                Item.created_at >= self._cutoff_date(date_range_days)
+            )
+        ).order_by(Item.date.asc()).all()
+
+    def _iter_parent_chunks(
+        self,
+        parent_ids: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None
+    ):
+        """
+        Yield active parents in keyset-paged chunks with children and
+        subscriptions eager-loaded
+
+        Each chunk is 3 queries (parents, children, subscriptions); the
+        chunk is expunged once the caller moves on, so the session does
+        not grow with the number of families. Explicit parent_ids are
+        paged through in order, chunk_size IDs per IN list (shards pass
+        thousands).
+
+        Args:
+            parent_ids: Optional list of parent IDs (None = all active)
+            chunk_size: Parents per chunk (default PARENT_CHUNK_SIZE)
+
+        Yields:
+            Lists of Parent records
+        """
+        chunk_size = chunk_size or self.PARENT_CHUNK_SIZE
+
+        def active_parents():
+            return self.db.query(Parent).options(
+                selectinload(Parent.children),
+                selectinload(Parent.subscriptions)
+            ).filter(Parent.status == 'active')
+
+        def release(parents):
+            for parent in parents:
+                # Cascades to children and subscriptions
+                self.db.expunge(parent)
+
+        if parent_ids:
+            parent_ids = list(parent_ids)
+            for start in range(0, len(parent_ids), chunk_size):
+                parents = active_parents().filter(
+                    Parent.id.in_(parent_ids[start:start + chunk_size])
+                ).order_by(Parent.id).all()
+                if parents:
+                    yield parents
+                    release(parents)
+            return
+
+        last_id = None
+
+        while True:
+            query = active_parents()
+            if last_id is not None:
+                query = query.filter(Parent.id > last_id)
+
+            parents = query.order_by(Parent.id).limit(chunk_size).all()
+            if not parents:
+                return
+
+            yield parents
+
+            last_id = parents[-1].id
+            release(parents)
+
+            if len(parents) < chunk_size:
+                return
+
     def _group_items_by_type(
         self,
         items: List[Item]
@@ -197,7 +628,10 @@ class BatchAnalyzer:
         self,
         parent: Parent,
         grouped_items: Dict[str, List[Item]],
-        date_range_days: int
+        date_range_days: int,
+        children_text: Optional[str] = None,
+        fragments: Optional[Dict[Any, str]] = None,
+        labels: Optional[Dict[str, str]] = None
     ) -> str:
         """
         Format digest with emojis for WhatsApp
@@ -208,47 +642,48 @@ class BatchAnalyzer:
             parent: Parent record
             grouped_items: Items grouped by type
             date_range_days: Date range in days
+            children_text: Greeting names (default from parent.children;
+                CHILDREN_PLACEHOLDER for templates)
+            fragments: Rendered item text by item id (default _format_item)
+            labels: Digest labels (default English DIGEST_LABELS)
 
         Returns:
             Formatted digest text
         """
+        labels = labels or self.DIGEST_LABELS
         lines = []
 
         # Header
-        lines.append(f"📬 *Weekly Digest*")
+        lines.append(f"📬 *{labels['title']}*")
         lines.append(f"_{datetime.now().strftime('%B %d, %Y')}_")
         lines.append("")
 
         # Greeting
-        child_names = [child.name or f"Grade {child.grade}" for child in parent.children]
-        if len(child_names) == 1:
-            greeting = f"Updates for {child_names[0]}:"
-        else:
-            greeting = f"Updates for {', '.join(child_names)}:"
+        if children_text is None:
+            children_text = self._child_names_text(parent)
 
-        lines.append(greeting)
+        lines.append(labels['greeting'].replace(self.CHILDREN_PLACEHOLDER, children_text))
         lines.append("")
 
         # Items by type
-        type_order = ['Event', 'PermissionSlip', 'Fundraiser', 'HotLunch', 'Announcement']
-
-        for item_type in type_order:
+        for item_type in self.TYPE_ORDER:
             if item_type not in grouped_items:
                 continue
 
             items = grouped_items[item_type]
             emoji = self.TYPE_EMOJIS.get(item_type, self.TYPE_EMOJIS['default'])
 
-            lines.append(f"*{emoji} {item_type}s ({len(items)})*")
+            lines.append(f"*{emoji} {labels[item_type]} ({len(items)})*")
             lines.append("")
 
             for item in items:
-                lines.append(self._format_item(item))
+                lines.append(fragments[item.id] if fragments else self._format_item(item))
                 lines.append("")
 
         # Footer
+        total = sum(len(items) for items in grouped_items.values())
         lines.append("---")
-        lines.append(f"📊 Total: {sum(len(items) for items in grouped_items.values())} items")
+        lines.append(f"📊 {labels['total'].replace('{count}', str(total))}")
 
         return "\n".join(lines)
 
@@ -341,44 +776,55 @@ class BatchAnalyzer:
             f"Check back soon!"
         )
 
-    async def _translate_digest(
-        self,
-        digest: str,
-        target_language: str
-    ) -> str:
-        """
-        Translate digest to parent's language
-
-        Pattern: Placeholder for future Gemini integration
-
-        Args:
-            digest: English digest text
-            target_language: ISO 639-1 language code
-
-        Returns:
-            Translated digest (or original if translation unavailable)
-        """
-        # TODO: Integrate with gemini_service.py for translation
-        # For now, return original
-        return digest
-
     async def generate_batch_digests(
         self,
         parent_ids: Optional[List[str]] = None,
-        date_range_days: int = 7
+        date_range_days: int = 7,
+        set_based: bool = True,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        items: Optional[List[Item]] = None,
+        delta: bool = False
     ) -> Dict[str, str]:
         """
         Generate digests for multiple parents (batch processing)
 
         Pattern: Adapted from chai/batch_analyzer.py:162-211
 
+        Parents are fanned out as concurrent tasks, at most `concurrency`
+        in flight, so translation waits overlap instead of adding up. A
+        parent that fails or exceeds `timeout` gets the error message and
+        is logged; the rest of the batch is unaffected.
+
         Args:
             parent_ids: Optional list of parent IDs (None = all active)
             date_range_days: Date range in days
+            set_based: Load items once and parents in eager-loaded chunks
+                (False = one item query + lazy loads per parent)
+            concurrency: Digests in flight (default settings.digest_concurrency;
+                1 = one after another)
+            timeout: Seconds per parent (default settings.digest_timeout_seconds;
+                0 = no limit)
+            items: Window items already loaded (set-based mode; sharded
+                runs share one snapshot), queried when None
+            delta: Only items each parent has not received (or that changed
+                since delivery); parents with nothing new are left out
+                (set-based mode)
 
         Returns:
             Dictionary mapping parent_id -> digest_text
         """
+        if set_based or delta:
+            digests = {}
+            async for parent_id, digest in self.stream_batch_digests(
+                parent_ids, date_range_days, concurrency, timeout, items, delta
+            ):
+                digests[parent_id] = digest
+            return digests
+
+        semaphore, concurrency, timeout = self._start_run(concurrency, timeout)
+        start = time.perf_counter()
+
         # Query parents
         query = self.db.query(Parent).filter(Parent.status == 'active')
 
@@ -389,18 +835,220 @@ class BatchAnalyzer:
 
         # Generate digests
         digests = {}
+        await self._fan_out(
+            parents,
+            lambda parent: self.generate_digest(parent, date_range_days),
+            digests,
+            semaphore,
+            timeout
+        )
+        self.stats["rendered"] = len(parents)
 
-        for parent in parents:
-            try:
-                digest = await self.generate_digest(parent, date_range_days)
-                digests[str(parent.id)] = digest
-            except Exception as e:
-                # Log error, continue with other parents
-                print(f"Error generating digest for parent {parent.id}: {e}")
-                digests[str(parent.id)] = self._format_error_message()
-
+        self._finish_run(len(digests), start, concurrency)
         return digests
 
+    async def stream_batch_digests(
+        self,
+        parent_ids: Optional[List[str]] = None,
+        date_range_days: int = 7,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        items: Optional[List[Item]] = None,
+        delta: bool = False,
+        with_items: bool = False
+    ) -> AsyncIterator[Tuple]:
+        """
+        Set-based batch digests as a stream of (parent_id, digest_text)
+
+        1 + 3 * chunks queries in total, one render (format + translate) per
+        distinct audience signature. Parents are read one chunk at a time
+        and a chunk's digests are yielded before the next chunk is loaded,
+        so a slow consumer (sending, persistence) holds generation back and
+        memory stays at one chunk of parents + digests whatever the
+        number of families.
+
+        Renders are shared tasks: parents of a signature that is still
+        rendering wait on it (shielded, so one parent's timeout does not
+        cancel it for the others) instead of starting a second render.
+
+        Delta mode: one extra query per chunk returns the chunk's pending
+        (parent, item) pairs, anti-joined against delivered cards in SQL
+        (_pending_deliveries); matched items are filtered by them. Each
+        parent gets a short
+        "what changed" message with new and changed items only, rendered
+        once per (language, new, changed) set; parents with nothing new
+        are skipped (stats["unchanged"]).
+
+        Args:
+            parent_ids: Optional list of parent IDs (None = all active)
+            date_range_days: Date range in days
+            concurrency: Digests in flight (see generate_batch_digests)
+            timeout: Seconds per parent (see generate_batch_digests)
+            items: Window items already loaded (None = query them)
+            delta: Only undelivered / changed items (see above)
+            with_items: Also yield the IDs of the items in each digest (for
+                Card materialization, see card_writer.py)
+
+        Yields:
+            (parent_id, digest_text), or (parent_id, digest_text, item_ids)
+            with with_items, in parent ID order within each chunk
+        """
+        semaphore, concurrency, timeout = self._start_run(concurrency, timeout)
+        start = time.perf_counter()
+        served = 0
+
+        if items is None:
+            items = self._load_window_items(date_range_days)
+        index = AudienceIndex(items)
+
+        templates: Dict[Tuple, asyncio.Task] = {}
+        pending: Dict[Tuple[str, str], bool] = {}
+        # Items in each digest of the current chunk (with_items)
+        digest_items: Dict[str, Tuple] = {}
+
+        async def digest_for(parent: Parent) -> str:
+            signature = self._digest_signature(parent, date_range_days)
+            matched = None
+            if signature not in templates or (with_items and parent.children):
+                matched = index.match(self._parent_audience_tags(parent))
+
+            if signature not in templates:
+                templates[signature] = asyncio.ensure_future(
+                    self._render_digest_template(parent, date_range_days, items=matched)
+                )
+
+            template = await asyncio.shield(templates[signature])
+            if with_items and parent.children:
+                digest_items[str(parent.id)] = tuple(item.id for item in matched)
+            return self._fill_digest(template, parent)
+
+        async def delta_for(parent: Parent) -> Optional[str]:
+            if not parent.children:
+                return None
+
+            new, changed = self._delta_items(
+                parent, index.match(self._parent_audience_tags(parent)), pending
+            )
+            if not new and not changed:
+                self.stats["unchanged"] += 1
+                return None
+
+            signature = (
+                parent.language or 'en',
+                tuple(item.id for item in new),
+                tuple(item.id for item in changed)
+            )
+            if signature not in templates:
+                templates[signature] = asyncio.ensure_future(
+                    self._render_delta_template(parent, new, changed)
+                )
+
+            template = await asyncio.shield(templates[signature])
+            if with_items:
+                digest_items[str(parent.id)] = signature[1] + signature[2]
+            return self._fill_digest(template, parent)
+
+        try:
+            for parents in self._iter_parent_chunks(parent_ids):
+                if delta:
+                    pending = self._pending_deliveries(parents, items)
+
+                chunk: Dict[str, Optional[str]] = {}
+                digest_items.clear()
+                await self._fan_out(
+                    parents, delta_for if delta else digest_for, chunk, semaphore, timeout
+                )
+
+                for parent in parents:
+                    digest = chunk[str(parent.id)]
+                    if digest is None:
+                        continue
+                    served += 1
+                    if with_items:
+                        yield str(parent.id), digest, digest_items.get(str(parent.id), ())
+                    else:
+                        yield str(parent.id), digest
+        finally:
+            # Renders abandoned by timed-out parents (or a closed stream)
+            for task in templates.values():
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark retrieved (already logged per parent)
+
+            self.stats["rendered"] = len(templates)
+            self._finish_run(served, start, concurrency)
+
+    def _start_run(
+        self,
+        concurrency: Optional[int],
+        timeout: Optional[float]
+    ) -> Tuple[asyncio.Semaphore, int, Optional[float]]:
+        """
+        Reset stats and resolve run limits
+
+        Args:
+            concurrency: Digests in flight (None = settings.digest_concurrency)
+            timeout: Seconds per parent (None = settings.digest_timeout_seconds)
+
+        Returns:
+            (semaphore, concurrency, timeout or None for no limit)
+        """
+        concurrency = max(1, concurrency or settings.digest_concurrency)
+        if timeout is None:
+            timeout = settings.digest_timeout_seconds
+
+        self.stats = {"parents": 0, "rendered": 0, "failed": 0, "timed_out": 0, "unchanged": 0}
+        return asyncio.Semaphore(concurrency), concurrency, timeout or None
+
+    def _finish_run(self, parents: int, start: float, concurrency: int) -> None:
+        """Record and log throughput of a batch run"""
+        elapsed = time.perf_counter() - start
+        self.stats["parents"] = parents
+        self.stats["seconds"] = elapsed
+        self.stats["parents_per_second"] = parents / elapsed if elapsed > 0 else 0.0
+
+        logger.info(
+            f"Generated {parents} digests ({self.stats['rendered']} rendered, "
+            f"{self.stats['failed']} failed, {self.stats['timed_out']} timed out) "
+            f"in {elapsed:.1f}s: {self.stats['parents_per_second']:.1f} parents/s "
+            f"at concurrency {concurrency}"
+        )
+
+    async def _fan_out(
+        self,
+        parents: List[Parent],
+        digest_for: Callable[[Parent], Awaitable[str]],
+        digests: Dict[str, str],
+        semaphore: asyncio.Semaphore,
+        timeout: Optional[float]
+    ) -> None:
+        """
+        Run digest_for for each parent as a bounded task, with isolated errors
+
+        Args:
+            parents: Parents to serve
+            digest_for: Coroutine function producing one parent's digest
+            digests: Output, parent_id -> digest_text (filled in place)
+            semaphore: Shared concurrency limit
+            timeout: Seconds per parent (None = no limit)
+        """
+        async def run(parent: Parent) -> None:
+            async with semaphore:
+                try:
+                    digests[str(parent.id)] = await asyncio.wait_for(digest_for(parent), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Digest for parent {parent.id} timed out after {timeout}s")
+                    self.stats["timed_out"] += 1
+                    digests[str(parent.id)] = self._format_error_message()
+                except Exception as e:
+                    # Log error, continue with other parents
+                    logger.error(f"Error generating digest for parent {parent.id}: {e}", exc_info=True)
+                    self.stats["failed"] += 1
+                    digests[str(parent.id)] = self._format_error_message()
+
+        await asyncio.gather(*(run(parent) for parent in parents))
+
     def _format_error_message(self) -> str:
         """
         Format error message when digest generation fails
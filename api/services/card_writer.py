@@ -0,0 +1,191 @@
+"""
+ParentPath Card Writer - Bulk Card materialization for delivered digests
+
+Purpose: Record every (parent, item) a digest delivered as a Card row
+(delivery/completion tracking, delta digests) without one ORM insert per
+card
+
+Architecture:
+    CardWriter(db)
+      ├─ add(parent_id, item_ids, delivered_at)   - buffer rows
+      └─ flush()                                  - every batch_size rows
+           ├─ PostgreSQL, small flush: INSERT ... ON CONFLICT ON CONSTRAINT
+           │  uix_parent_item (multi-row VALUES batches)
+           ├─ PostgreSQL, large flush: COPY into a temp staging table, then
+           │  one INSERT ... SELECT ... ON CONFLICT
+           └─ SQLite: executemany INSERT ... ON CONFLICT (parent_id, item_id)
+
+Existing cards are left alone (DO NOTHING) so status and completion are
+never reset; update_delivered=True instead moves delivered_at forward
+(sent digests re-deliver edited items; deliver_digests sets it).
+
+Integration:
+- api/services/digest_delivery.py (cards for sent digests)
+- api/models/card.py (Card, uix_parent_item)
+"""
+
+import csv
+import io
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from api.models.card import Card
+
+logger = logging.getLogger(__name__)
+
+CARD_CONSTRAINT = "uix_parent_item"
+STAGING_TABLE = "card_staging"
+
+
+class CardWriter:
+    """
+    Buffered bulk upsert of Card rows
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 20000,
+        copy_threshold: int = 10000,
+        update_delivered: bool = False
+    ):
+        """
+        Initialize card writer
+
+        Args:
+            db: SQLAlchemy session (sync)
+            batch_size: Buffered rows that trigger a flush
+            copy_threshold: PostgreSQL flushes this large go through COPY
+            update_delivered: On conflict set delivered_at instead of skipping
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.copy_threshold = copy_threshold
+        self.update_delivered = update_delivered
+
+        self.dialect = db.get_bind().dialect.name
+        self._rows: List[Dict[str, Any]] = []
+
+        self.stats = {"rows": 0, "inserted": 0, "flushes": 0}
+
+    def add(
+        self,
+        parent_id: Any,
+        item_ids: Iterable[Any],
+        delivered_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Buffer the cards of one delivered digest
+
+        Args:
+            parent_id: Recipient
+            item_ids: Items in the digest
+            delivered_at: Delivery time (default now)
+        """
+        delivered_at = delivered_at or datetime.utcnow()
+        for item_id in item_ids:
+            self._rows.append({
+                "id": self._new_id(),
+                "parent_id": parent_id,
+                "item_id": item_id,
+                "status": "pending",
+                "delivered_at": delivered_at,
+                "reminder_sent_count": 0,
+                "created_at": delivered_at,
+            })
+
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write buffered cards and commit
+
+        Returns:
+            Rows inserted or updated (as reported by the driver)
+        """
+        if not self._rows:
+            return 0
+
+        rows, self._rows = self._rows, []
+
+        if self.dialect == "postgresql" and len(rows) >= self.copy_threshold:
+            written = self._copy_postgres(rows)
+        else:
+            written = self._insert(rows)
+
+        self.db.commit()
+
+        self.stats["rows"] += len(rows)
+        self.stats["inserted"] += max(written, 0)
+        self.stats["flushes"] += 1
+        logger.info(f"Wrote {len(rows)} cards ({written} new or updated)")
+        return written
+
+    def _new_id(self) -> Any:
+        """Card primary key in the column's storage type"""
+        return uuid.uuid4() if self.dialect == "postgresql" else str(uuid.uuid4())
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        """INSERT ... ON CONFLICT through executemany (multi-row VALUES on PostgreSQL)"""
+        if self.dialect == "postgresql":
+            stmt = pg_insert(Card.__table__)
+            conflict = {"constraint": CARD_CONSTRAINT}
+        elif self.dialect == "sqlite":
+            stmt = sqlite_insert(Card.__table__)
+            conflict = {"index_elements": ["parent_id", "item_id"]}
+        else:
+            raise ValueError(f"Bulk card upsert not supported on {self.dialect}")
+
+        if self.update_delivered:
+            stmt = stmt.on_conflict_do_update(
+                set_={"delivered_at": stmt.excluded.delivered_at}, **conflict
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(**conflict)
+
+        result = self.db.execute(stmt, rows)
+        return result.rowcount
+
+    def _copy_postgres(self, rows: List[Dict[str, Any]]) -> int:
+        """COPY rows into a temp staging table, then one INSERT ... SELECT"""
+        columns = list(rows[0])
+        column_list = ", ".join(columns)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (row[column] for column in columns)
+            ])
+        buffer.seek(0)
+
+        if self.update_delivered:
+            conflict = "DO UPDATE SET delivered_at = EXCLUDED.delivered_at"
+        else:
+            conflict = "DO NOTHING"
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+                f"(LIKE cards INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            cursor.execute(
+                f"INSERT INTO cards ({column_list}) "
+                f"SELECT {column_list} FROM {STAGING_TABLE} "
+                f"ON CONFLICT ON CONSTRAINT {CARD_CONSTRAINT} {conflict}"
+            )
+            return cursor.rowcount
+        finally:
+            cursor.close()
@@ -0,0 +1,708 @@
+"""
+ParentPath Delivery Scheduler - Send digests at each family's local time
+
+Purpose: Spread a digest run over the day in provider-sized slots instead
+of sending everything at once, honouring Parent.timezone and quiet hours
+
+Architecture:
+    DeliveryScheduler.plan(parents) / plan_active_parents(db)
+      ├─ next_send_time(parent)  - preferred local send time, moved out of
+      │                            quiet hours, in UTC
+      ├─ slot = send epoch // slot_seconds; a full slot (provider rate x
+      │  slot length, counting parents already in the schedule) spills to
+      │  the next slot the family may receive in
+      └─ schedule.add_many({parent_id: slot start}) - re-planning a parent
+                                                     moves it (like ZADD)
+    DeliveryScheduler.due(now)   - lease parents whose slot has started
+                                   (at most one slot's capacity per pull)
+    DeliveryScheduler.ack(ids)   - drop leased parents once sent
+    DeliveryScheduler.retry(ids) - failed sends back in the schedule after
+                                   an exponential backoff (out of quiet
+                                   hours), up to max_retries
+    deliver_due(db, send)        - due parents -> stream -> send (paced at
+                                   rate_per_second) -> cards -> ack sent,
+                                   retry failed
+    run_delivery_loop(...)       - worker: deliver_due every slot
+
+Due parents move to a processing set with a lease deadline instead of
+being deleted; a worker that dies mid-slot leaves them there and the next
+pull after the lease expires puts them back in the schedule (delivery is
+at least once, never silently dropped). A send that fails is not
+acknowledged as delivered: the parent is scheduled again retry_seconds
+later, doubling per failure; the failure count is kept with the schedule
+and cleared on ack.
+
+Schedules:
+    RedisSchedule    sorted set, score = slot start epoch, plus a
+                     processing sorted set scored by lease deadline and a
+                     hash of failure counts; pops and re-queues are atomic
+                     (Lua), so several workers can pull
+    MemorySchedule   time-bucket index: slot -> parent IDs plus a heap of
+                     slot numbers (single process, tests)
+
+Integration:
+- api/models/parent.py (timezone, quiet_hours_start, quiet_hours_end)
+- api/services/batch_analyzer.py (stream_batch_digests for due parents)
+- api/services/digest_delivery.py + card_writer.py (send, log, cards)
+"""
+
+import asyncio
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import redis
+from sqlalchemy.orm import Session, load_only
+
+from api.config import settings
+from api.models.parent import Parent
+from api.services.batch_analyzer import BatchAnalyzer
+from api.services.card_writer import CardWriter
+from api.services.digest_delivery import DigestSender, deliver_digests
+
+logger = logging.getLogger(__name__)
+
+# Redis key of the delivery sorted set
+SCHEDULE_KEY = "parentpath:digest_schedule"
+
+# Move up to ARGV[2] members with score <= ARGV[1] from the schedule
+# (KEYS[1]) to the processing set (KEYS[2]) with lease deadline ARGV[3]
+_POP_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('ZADD', KEYS[2], ARGV[3], id)
+end
+return ids
+"""
+
+# Move members whose lease expired (score <= ARGV[1]) from processing
+# (KEYS[2]) back to the schedule (KEYS[1]), due at ARGV[1]; a parent that
+# was re-planned meanwhile keeps its new slot
+_REQUEUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('ZADD', KEYS[1], 'NX', ARGV[1], id)
+end
+return #ids
+"""
+
+
+def _utc(moment: Optional[datetime] = None) -> datetime:
+    """Aware UTC datetime (naive input is UTC, as everywhere in the models)"""
+    if moment is None:
+        return datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _zone(name: Optional[str]) -> ZoneInfo:
+    """Parent's time zone (default zone for missing or unknown names)"""
+    try:
+        return ZoneInfo(name or settings.delivery_default_timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown time zone {name!r}, using {settings.delivery_default_timezone}")
+        return ZoneInfo(settings.delivery_default_timezone)
+
+
+def in_quiet_hours(local: time, start: Optional[time], end: Optional[time]) -> bool:
+    """
+    Whether a local time falls in quiet hours
+
+    Args:
+        local: Local wall-clock time
+        start: Quiet hours start (e.g., 22:00)
+        end: Quiet hours end (e.g., 08:00; may be past midnight)
+
+    Returns:
+        True when no message should be sent
+    """
+    if start is None or end is None or start == end:
+        return False
+    if start < end:
+        return start <= local < end
+    return local >= start or local < end
+
+
+def _quiet_end_after(local: datetime, end: time) -> datetime:
+    """First local datetime at the end of quiet hours after `local`"""
+    candidate = datetime.combine(local.date(), end, tzinfo=local.tzinfo)
+    if candidate <= local:
+        candidate = datetime.combine(local.date() + timedelta(days=1), end, tzinfo=local.tzinfo)
+    return candidate
+
+
+def allowed_at(parent: Parent, moment: datetime) -> datetime:
+    """
+    `moment`, or the end of the parent's quiet hours if it falls inside them
+
+    Args:
+        parent: Parent record
+        moment: Aware datetime
+
+    Returns:
+        Aware UTC datetime
+    """
+    local = moment.astimezone(_zone(parent.timezone))
+    if in_quiet_hours(local.time(), parent.quiet_hours_start, parent.quiet_hours_end):
+        local = _quiet_end_after(local, parent.quiet_hours_end)
+    return local.astimezone(timezone.utc)
+
+
+def next_send_time(
+    parent: Parent,
+    now: Optional[datetime] = None,
+    send_time: Optional[time] = None
+) -> datetime:
+    """
+    When a parent's digest should go out
+
+    The preferred local send time today; if that has passed, as soon as
+    possible. Either way moved to the end of quiet hours when inside them.
+
+    Args:
+        parent: Parent record
+        now: Reference time (default now, UTC)
+        send_time: Preferred local time (default settings.delivery_send_time)
+
+    Returns:
+        Aware UTC datetime
+    """
+    now = _utc(now)
+    send_time = send_time or time.fromisoformat(settings.delivery_send_time)
+
+    local_now = now.astimezone(_zone(parent.timezone))
+    preferred = datetime.combine(local_now.date(), send_time, tzinfo=local_now.tzinfo)
+
+    return allowed_at(parent, max(preferred, local_now))
+
+
+class MemorySchedule:
+    """
+    Time-bucket index: slot number -> parent IDs, heap of pending slots
+    """
+
+    def __init__(self, slot_seconds: int):
+        """
+        Initialize schedule
+
+        Args:
+            slot_seconds: Slot length (slot = epoch // slot_seconds)
+        """
+        self.slot_seconds = slot_seconds
+        # Buckets are insertion-ordered sets (dict keys) so a re-planned
+        # parent can be moved in O(1)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._slot_of: Dict[str, int] = {}
+        # May hold slots whose bucket has since emptied (skipped when popped)
+        self._slots: List[int] = []
+        # Leased parent ID -> lease deadline epoch
+        self._processing: Dict[str, float] = {}
+        # Parent ID -> failed sends since the last ack
+        self._attempts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Parents still scheduled"""
+        return len(self._slot_of)
+
+    def _add(self, parent_id: str, slot: int) -> None:
+        """Put a parent in a slot, moving it out of its current one"""
+        current = self._slot_of.get(parent_id)
+        if current == slot:
+            return
+        if current is not None:
+            bucket = self._buckets[current]
+            del bucket[parent_id]
+            if not bucket:
+                del self._buckets[current]
+
+        if slot not in self._buckets:
+            self._buckets[slot] = {}
+            heapq.heappush(self._slots, slot)
+        self._buckets[slot][parent_id] = None
+        self._slot_of[parent_id] = slot
+
+    def add_many(self, entries: Dict[str, float]) -> None:
+        """Schedule parents at slot start epochs (an already scheduled parent moves)"""
+        for parent_id, score in entries.items():
+            self._add(parent_id, int(score // self.slot_seconds))
+
+    def count(self, start: float, end: float) -> int:
+        """Parents scheduled in slots starting in [start, end)"""
+        first, last = int(start // self.slot_seconds), int(-(-end // self.slot_seconds))
+        return sum(len(self._buckets.get(slot, ())) for slot in range(first, last))
+
+    def pop_due(self, now: float, limit: int, lease_until: float) -> List[str]:
+        """
+        Lease up to `limit` parents whose slot starts at or before `now`
+
+        Only due buckets are touched; earliest slots first. Leased parents
+        stay in processing until ack() or requeue_expired().
+        """
+        due: List[str] = []
+        now_slot = int(now // self.slot_seconds)
+
+        while self._slots and self._slots[0] <= now_slot and len(due) < limit:
+            bucket = self._buckets.get(self._slots[0])
+            if not bucket:
+                heapq.heappop(self._slots)
+                continue
+
+            for parent_id in list(bucket)[:limit - len(due)]:
+                del bucket[parent_id]
+                del self._slot_of[parent_id]
+                self._processing[parent_id] = lease_until
+                due.append(parent_id)
+            if not bucket:
+                del self._buckets[heapq.heappop(self._slots)]
+
+        return due
+
+    def ack(self, parent_ids: Iterable[str]) -> None:
+        """Drop leased parents (delivered)"""
+        for parent_id in parent_ids:
+            self._processing.pop(parent_id, None)
+            self._attempts.pop(parent_id, None)
+
+    def retry(
+        self,
+        parent_ids: Iterable[str],
+        retry_at: Callable[[str, int], Optional[float]]
+    ) -> int:
+        """
+        Release leased parents whose send failed and schedule them again
+
+        retry_at(parent_id, attempt) gives the epoch to retry at, where
+        attempt counts failed sends including this one, or None to give up
+        (dropped like ack).
+
+        Returns:
+            Parents re-scheduled
+        """
+        requeued = 0
+        for parent_id in parent_ids:
+            self._processing.pop(parent_id, None)
+            attempt = self._attempts.get(parent_id, 0) + 1
+            score = retry_at(parent_id, attempt)
+            if score is None:
+                self._attempts.pop(parent_id, None)
+                continue
+            self._attempts[parent_id] = attempt
+            self._add(parent_id, int(score // self.slot_seconds))
+            requeued += 1
+        return requeued
+
+    def requeue_expired(self, now: float) -> int:
+        """Put parents whose lease expired back in the schedule, due now"""
+        expired = [pid for pid, deadline in self._processing.items() if deadline <= now]
+        for parent_id in expired:
+            del self._processing[parent_id]
+            if parent_id not in self._slot_of:
+                self._add(parent_id, int(now // self.slot_seconds))
+        return len(expired)
+
+
+class RedisSchedule:
+    """
+    Redis sorted set: member = parent ID, score = slot start epoch
+    """
+
+    def __init__(self, client: Any = None, key: str = SCHEDULE_KEY):
+        """
+        Initialize schedule
+
+        Args:
+            client: redis.Redis (default from settings.redis_url)
+            key: Sorted set key
+        """
+        if client is None:
+            client = redis.from_url(settings.redis_url, decode_responses=True)
+
+        self.client = client
+        self.key = key
+        self.processing_key = f"{key}:processing"
+        self.attempts_key = f"{key}:attempts"
+        self._pop_due = client.register_script(_POP_DUE_SCRIPT)
+        self._requeue = client.register_script(_REQUEUE_SCRIPT)
+
+    def __len__(self) -> int:
+        """Parents still scheduled"""
+        return self.client.zcard(self.key)
+
+    def add_many(self, entries: Dict[str, float]) -> None:
+        """Schedule parents at slot start epochs (an already scheduled parent moves)"""
+        if entries:
+            self.client.zadd(self.key, entries)
+
+    def count(self, start: float, end: float) -> int:
+        """Parents scheduled in slots starting in [start, end)"""
+        return self.client.zcount(self.key, start, f"({end}")
+
+    def pop_due(self, now: float, limit: int, lease_until: float) -> List[str]:
+        """Atomically lease up to `limit` due parents (moved to the processing set)"""
+        return list(self._pop_due(
+            keys=[self.key, self.processing_key], args=[now, limit, lease_until]
+        ))
+
+    def ack(self, parent_ids: Iterable[str]) -> None:
+        """Drop leased parents (delivered)"""
+        parent_ids = list(parent_ids)
+        if parent_ids:
+            pipe = self.client.pipeline()
+            pipe.zrem(self.processing_key, *parent_ids)
+            pipe.hdel(self.attempts_key, *parent_ids)
+            pipe.execute()
+
+    def retry(
+        self,
+        parent_ids: Iterable[str],
+        retry_at: Callable[[str, int], Optional[float]]
+    ) -> int:
+        """Release leased parents whose send failed and schedule them again (see MemorySchedule.retry)"""
+        parent_ids = list(parent_ids)
+        if not parent_ids:
+            return 0
+
+        # Only the leaseholder touches a leased parent, so no Lua needed
+        pipe = self.client.pipeline()
+        for parent_id in parent_ids:
+            pipe.hincrby(self.attempts_key, parent_id, 1)
+        attempts = pipe.execute()
+
+        entries: Dict[str, float] = {}
+        given_up: List[str] = []
+        for parent_id, attempt in zip(parent_ids, attempts):
+            score = retry_at(parent_id, int(attempt))
+            if score is None:
+                given_up.append(parent_id)
+            else:
+                entries[parent_id] = score
+
+        pipe = self.client.pipeline()
+        pipe.zrem(self.processing_key, *parent_ids)
+        if entries:
+            pipe.zadd(self.key, entries)
+        if given_up:
+            pipe.hdel(self.attempts_key, *given_up)
+        pipe.execute()
+
+        return len(entries)
+
+    def requeue_expired(self, now: float) -> int:
+        """Atomically put parents whose lease expired back in the schedule, due now"""
+        return int(self._requeue(keys=[self.key, self.processing_key], args=[now]))
+
+
+def create_schedule(slot_seconds: int) -> Any:
+    """Schedule for settings.delivery_schedule_backend (redis, memory)"""
+    if settings.delivery_schedule_backend == "memory":
+        return MemorySchedule(slot_seconds)
+    return RedisSchedule()
+
+
+class DeliveryScheduler:
+    """
+    Assign parents to delivery slots and hand out due slots to workers
+    """
+
+    def __init__(
+        self,
+        schedule: Any = None,
+        slot_seconds: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        send_time: Optional[time] = None,
+        lease_seconds: Optional[float] = None,
+        retry_seconds: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            schedule: MemorySchedule / RedisSchedule (default per settings)
+            slot_seconds: Slot length (default settings.delivery_slot_seconds)
+            rate_per_second: Provider throughput (default
+                settings.delivery_rate_per_second)
+            send_time: Preferred local send time (default settings.delivery_send_time)
+            lease_seconds: How long a pulled slot may take before its
+                unacknowledged parents are re-queued (default 2 slots)
+            retry_seconds: Delay before the first retry of a failed send,
+                doubled per failure (default settings.delivery_retry_seconds)
+            max_retries: Failed sends retried per parent before giving up
+                until the next plan (default settings.delivery_max_retries)
+        """
+        self.slot_seconds = slot_seconds or settings.delivery_slot_seconds
+        self.rate_per_second = rate_per_second or settings.delivery_rate_per_second
+        self.send_time = send_time or time.fromisoformat(settings.delivery_send_time)
+        self.lease_seconds = lease_seconds or 2 * self.slot_seconds
+        self.retry_seconds = retry_seconds or settings.delivery_retry_seconds
+        self.max_retries = settings.delivery_max_retries if max_retries is None else max_retries
+        self.schedule = schedule if schedule is not None else create_schedule(self.slot_seconds)
+
+        # Messages per slot the provider can take
+        self.slot_capacity = max(1, int(self.rate_per_second * self.slot_seconds))
+
+    def plan(
+        self,
+        parents: Iterable[Parent],
+        now: Optional[datetime] = None
+    ) -> Dict[int, int]:
+        """
+        Schedule each parent in the first slot at or after their send time
+        that still has capacity and is outside their quiet hours
+
+        Slot load includes parents already in the schedule (earlier plan
+        calls, other workers), not just this call's.
+
+        Args:
+            parents: Parents to schedule (timezone + quiet hours loaded)
+            now: Reference time (default now, UTC)
+
+        Returns:
+            Parents added per slot start epoch
+        """
+        now = _utc(now)
+        load: Dict[int, int] = {}
+        added: Dict[int, int] = defaultdict(int)
+        entries: Dict[str, float] = {}
+
+        def slot_load(slot: int) -> int:
+            if slot not in load:
+                start = slot * self.slot_seconds
+                load[slot] = self.schedule.count(start, start + self.slot_seconds)
+            return load[slot]
+
+        for parent in parents:
+            moment = next_send_time(parent, now, self.send_time)
+            slot = int(moment.timestamp() // self.slot_seconds)
+
+            # Full slot: spill forward, skipping the family's quiet hours
+            while slot_load(slot) >= self.slot_capacity:
+                slot += 1
+                start = datetime.fromtimestamp(slot * self.slot_seconds, timezone.utc)
+                allowed = allowed_at(parent, start)
+                if allowed > start:
+                    slot = int(allowed.timestamp() // self.slot_seconds)
+
+            load[slot] += 1
+            added[slot] += 1
+            entries[str(parent.id)] = slot * self.slot_seconds
+
+        self.schedule.add_many(entries)
+
+        slots = {slot * self.slot_seconds: count for slot, count in sorted(added.items())}
+        logger.info(
+            f"Scheduled {len(entries)} digests over {len(slots)} slots "
+            f"of {self.slot_seconds}s (capacity {self.slot_capacity})"
+        )
+        return slots
+
+    def plan_active_parents(
+        self,
+        db: Session,
+        parent_ids: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[int, int]:
+        """
+        plan() every active parent (or the given ones), streamed from the DB
+
+        Only the scheduling columns are loaded.
+
+        Args:
+            db: SQLAlchemy session (sync)
+            parent_ids: Optional list of parent IDs (None = all active)
+            now: Reference time (default now, UTC)
+
+        Returns:
+            Parents per slot start epoch
+        """
+        query = db.query(Parent).options(
+            load_only(Parent.id, Parent.timezone, Parent.quiet_hours_start, Parent.quiet_hours_end)
+        ).filter(Parent.status == 'active')
+
+        if parent_ids:
+            query = query.filter(Parent.id.in_(parent_ids))
+
+        return self.plan(query.yield_per(BatchAnalyzer.PARENT_CHUNK_SIZE), now)
+
+    def due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Lease parents whose slot has started (ack() them once sent)
+
+        Parents whose earlier lease expired unacknowledged (worker crash)
+        are re-queued first, so they are handed out again.
+
+        Args:
+            now: Reference time (default now, UTC)
+            limit: Maximum parents (default one slot's capacity)
+
+        Returns:
+            Parent IDs, earliest slot first
+        """
+        now_epoch = _utc(now).timestamp()
+
+        requeued = self.schedule.requeue_expired(now_epoch)
+        if requeued:
+            logger.warning(f"Re-queued {requeued} digests whose delivery lease expired")
+
+        return self.schedule.pop_due(
+            now_epoch, limit or self.slot_capacity, now_epoch + self.lease_seconds
+        )
+
+    def ack(self, parent_ids: Iterable[str]) -> None:
+        """
+        Release leased parents after their digest was handled
+
+        Args:
+            parent_ids: IDs returned by due()
+        """
+        self.schedule.ack(parent_ids)
+
+    def retry(
+        self,
+        db: Session,
+        parent_ids: Iterable[str],
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Schedule leased parents whose send failed again, with backoff
+
+        Failure n is retried retry_seconds * 2 ** (n - 1) later, moved out
+        of the family's quiet hours; after max_retries failures (or if the
+        parent is gone) it is dropped until the next plan.
+
+        Args:
+            db: SQLAlchemy session (sync), for timezone and quiet hours
+            parent_ids: IDs returned by due() whose send failed
+            now: Reference time (default now, UTC)
+
+        Returns:
+            Parents re-scheduled
+        """
+        parent_ids = list(parent_ids)
+        if not parent_ids:
+            return 0
+
+        now = _utc(now)
+        parents = {
+            str(parent.id): parent
+            for parent in db.query(Parent).options(
+                load_only(Parent.id, Parent.timezone, Parent.quiet_hours_start, Parent.quiet_hours_end)
+            ).filter(Parent.id.in_(parent_ids))
+        }
+
+        def retry_at(parent_id: str, attempt: int) -> Optional[float]:
+            parent = parents.get(parent_id)
+            if parent is None or attempt > self.max_retries:
+                return None
+            moment = now + timedelta(seconds=self.retry_seconds * 2 ** (attempt - 1))
+            return allowed_at(parent, moment).timestamp()
+
+        requeued = self.schedule.retry(parent_ids, retry_at)
+        if requeued < len(parent_ids):
+            logger.warning(
+                f"Gave up on {len(parent_ids) - requeued} digests after "
+                f"{self.max_retries} retries; they wait for the next plan"
+            )
+        return requeued
+
+
+async def deliver_due(
+    db: Session,
+    send: DigestSender,
+    scheduler: DeliveryScheduler,
+    now: Optional[datetime] = None,
+    delta: bool = False
+) -> Dict[str, Any]:
+    """
+    Generate and send digests for the parents that are due
+
+    Sends are paced at scheduler.rate_per_second, so a full slot takes
+    about one slot length. The due parents are acknowledged only after the
+    run; if the worker dies first they are re-queued when the lease expires.
+    Parents whose send failed are not acknowledged but re-scheduled with
+    backoff (DeliveryScheduler.retry).
+
+    Args:
+        db: SQLAlchemy session (sync)
+        send: Coroutine function delivering one digest
+        scheduler: Scheduler holding the plan
+        now: Reference time (default now, UTC)
+        delta: Delta digests (see BatchAnalyzer.stream_batch_digests)
+
+    Returns:
+        deliver_digests stats plus "due" and "retried"
+    """
+    parent_ids = scheduler.due(now)
+    if not parent_ids:
+        return {"due": 0, "sent": 0, "failed": 0, "logged": 0, "failed_parent_ids": [], "retried": 0}
+
+    analyzer = BatchAnalyzer(db)
+    stats = await deliver_digests(
+        analyzer.stream_batch_digests(parent_ids=parent_ids, delta=delta, with_items=True),
+        send,
+        db,
+        cards=CardWriter(db),
+        rate_per_second=scheduler.rate_per_second
+    )
+    # Parents with nothing to send count as handled; failed sends go back
+    failed = set(stats["failed_parent_ids"])
+    scheduler.ack([parent_id for parent_id in parent_ids if parent_id not in failed])
+    stats["retried"] = scheduler.retry(
+        db, [parent_id for parent_id in parent_ids if parent_id in failed], now
+    )
+
+    stats["due"] = len(parent_ids)
+    return stats
+
+
+async def run_delivery_loop(
+    session_factory: Callable[[], Session],
+    send: DigestSender,
+    stop_event: asyncio.Event,
+    scheduler: Optional[DeliveryScheduler] = None,
+    delta: bool = False
+) -> None:
+    """
+    Delivery worker: send due digests, then sleep until the next slot
+
+    A full pull (backlog) is followed by the next one right away; pacing
+    in deliver_digests keeps the send rate at the provider limit.
+
+    Args:
+        session_factory: Returns a new sync session per pull
+        send: Coroutine function delivering one digest
+        stop_event: Set on shutdown to exit
+        scheduler: Scheduler (default from settings)
+        delta: Delta digests
+    """
+    scheduler = scheduler or DeliveryScheduler()
+
+    while not stop_event.is_set():
+        backlog = False
+        try:
+            db = session_factory()
+            try:
+                stats = await deliver_due(db, send, scheduler, delta=delta)
+            finally:
+                db.close()
+            if stats["due"]:
+                logger.info(f"Delivery slot: {stats['due']} due, {stats['sent']} sent")
+            backlog = stats["due"] >= scheduler.slot_capacity
+        except Exception as e:
+            logger.error(f"Delivery error: {e}")
+
+        if backlog:
+            continue
+
+        now = _utc().timestamp()
+        wait = scheduler.slot_seconds - now % scheduler.slot_seconds
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,184 @@
+"""
+ParentPath Digest Delivery - Send a digest stream and log each message
+
+Purpose: Consume BatchAnalyzer.stream_batch_digests incrementally so a
+weekly run never holds every family's digest in memory
+
+Architecture:
+    deliver_digests(stream, send, db)
+      ├─ producer: stream -> bounded asyncio.Queue (blocks when full, so
+      │  the stream stops loading parents until senders catch up)
+      ├─ senders (N tasks): send(parent_id, digest) -> (channel, message_sid),
+      │  paced by a shared token bucket when rate_per_second is given
+      ├─ message log: MessageLog rows added and committed every
+      │  log_batch_size messages
+      └─ cards (optional): a CardWriter gets (parent, items) of each sent
+         digest; the stream must be stream_batch_digests(with_items=True).
+         The writer moves delivered_at forward on existing cards (full and
+         delta runs alike), so items sent again with their edits are not
+         re-sent by the next delta run
+
+Peak memory is the queue plus one log batch (and one chunk inside the
+stream), independent of the number of families. A failed send is logged
+and counted; the run continues and the parent is reported back for retry.
+
+Integration:
+- api/services/batch_analyzer.py (stream_batch_digests)
+- api/models/message.py (MessageLog)
+- api/services/card_writer.py (bulk Card upsert)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.models.message import MessageLog
+from api.services.card_writer import CardWriter
+
+logger = logging.getLogger(__name__)
+
+# send(parent_id, digest_text) -> (channel, provider message ID)
+DigestSender = Callable[[str, str], Awaitable[Tuple[str, Optional[str]]]]
+
+# Queue sentinel
+_STOP = object()
+
+
+class RateLimiter:
+    """
+    Token bucket shared by the sender tasks: at most `rate` sends per
+    second on average, at most `burst` back to back
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        """
+        Initialize rate limiter
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket size (1 = evenly spaced sends)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for and take one token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def deliver_digests(
+    digests: AsyncIterator[Tuple],
+    send: DigestSender,
+    db: Session,
+    senders: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    log_batch_size: int = 500,
+    cards: Optional[CardWriter] = None,
+    rate_per_second: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Send every digest in a stream and persist a MessageLog per sent message
+
+    Args:
+        digests: (parent_id, digest_text[, item_ids]) stream, e.g.
+            BatchAnalyzer(db).stream_batch_digests()
+        send: Coroutine function delivering one digest
+        db: SQLAlchemy session for the message log
+        senders: Concurrent sends (default settings.digest_senders)
+        queue_size: Digests buffered ahead of the senders (default 2 x senders)
+        log_batch_size: MessageLog rows per commit
+        cards: Writer for the Card rows of sent digests (flushed at the end)
+        rate_per_second: Provider limit across all senders (None = unpaced)
+
+    Returns:
+        Stats: sent, failed, logged, and failed_parent_ids for retry
+    """
+    # Every sent digest carries the items' current version (full or delta)
+    if cards is not None:
+        cards.update_delivered = True
+
+    senders = max(1, senders or settings.digest_senders)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or 2 * senders)
+    limiter = RateLimiter(rate_per_second) if rate_per_second else None
+
+    stats: Dict[str, Any] = {"sent": 0, "failed": 0, "logged": 0, "failed_parent_ids": []}
+    # SQLite stores UUID columns as strings
+    sqlite = db.get_bind().dialect.name == "sqlite"
+    pending: List[MessageLog] = []
+
+    def flush_log() -> None:
+        if not pending:
+            return
+        db.add_all(pending)
+        db.commit()
+        stats["logged"] += len(pending)
+        pending.clear()
+
+    async def sender() -> None:
+        while True:
+            entry = await queue.get()
+            if entry is _STOP:
+                return
+
+            parent_id, digest = entry[0], entry[1]
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                channel, message_sid = await send(parent_id, digest)
+            except Exception as e:
+                logger.error(f"Error sending digest to parent {parent_id}: {e}")
+                stats["failed"] += 1
+                stats["failed_parent_ids"].append(parent_id)
+                continue
+
+            sent_at = datetime.utcnow()
+            stats["sent"] += 1
+            pending.append(MessageLog(
+                id=str(uuid.uuid4()) if sqlite else uuid.uuid4(),
+                parent_id=parent_id,
+                message_type="digest",
+                channel=channel,
+                message_sid=message_sid,
+                status="sent",
+                sent_at=sent_at
+            ))
+            if cards is not None and len(entry) > 2:
+                cards.add(parent_id, entry[2], delivered_at=sent_at)
+            if len(pending) >= log_batch_size:
+                flush_log()
+
+    workers = [asyncio.create_task(sender()) for _ in range(senders)]
+
+    try:
+        async for entry in digests:
+            await queue.put(entry)
+    finally:
+        for _ in workers:
+            await queue.put(_STOP)
+        await asyncio.gather(*workers)
+        flush_log()
+        if cards is not None:
+            cards.flush()
+
+    logger.info(
+        f"Delivered {stats['sent']} digests ({stats['failed']} failed), "
+        f"{stats['logged']} messages logged"
+    )
+    return stats
@@ -0,0 +1,235 @@
+"""
+ParentPath Digest Shards - Multi-process weekly digest generation
+
+Purpose: Spread digest formatting, targeting and string building (CPU-bound
+Python) over all cores for district-sized runs; one BatchAnalyzer process
+tops out at one core
+
+Architecture:
+    run_sharded_digests(shards=K)
+      ├─ parent process: window items (1 query) -> plain-dict snapshot,
+      │  active parent IDs (1 query) -> K shards by shard_of(parent_id)
+      ├─ ProcessPoolExecutor(K), initializer gets the snapshot once per
+      │  worker and opens the worker's own DB engine
+      ├─ worker: BatchAnalyzer(own session).generate_batch_digests(
+      │      shard IDs, items=snapshot)   (set-based, async fan-out)
+      └─ parent process: merge digests, sum stats, log throughput
+
+shard_of is a CRC32 of the parent ID, stable across processes and runs (a
+family always lands in the same shard, unlike hash()). Workers only read
+parents, children and subscriptions for their shard; items are never
+re-queried.
+
+Integration:
+- api/services/batch_analyzer.py (per-shard digest engine)
+- scripts/benchmark_digest_shards.py (scaling benchmark)
+"""
+
+import asyncio
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.config import settings
+from api.models.item import Item
+from api.models.parent import Parent
+from api.services.batch_analyzer import BatchAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state (set by _init_worker in each pool process)
+_worker_items: Optional[List[Item]] = None
+_worker_sessions: Optional[sessionmaker] = None
+
+
+def shard_of(parent_id: Any, shards: int) -> int:
+    """
+    Shard of a parent (stable across processes and runs)
+
+    Args:
+        parent_id: Parent ID (UUID or string)
+        shards: Number of shards
+
+    Returns:
+        Shard number in [0, shards)
+    """
+    return zlib.crc32(str(parent_id).encode("utf-8")) % shards
+
+
+def sync_database_url(database_url: str) -> str:
+    """Synchronous driver URL (postgresql+asyncpg -> psycopg2)"""
+    return database_url.replace("+asyncpg", "")
+
+
+def create_session_factory(database_url: Optional[str] = None) -> sessionmaker:
+    """
+    Synchronous session factory on a new engine
+
+    Args:
+        database_url: Database URL (default settings.database_url)
+
+    Returns:
+        sessionmaker bound to the engine
+    """
+    url = sync_database_url(database_url or settings.database_url)
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def item_snapshot(items: List[Item]) -> List[Dict[str, Any]]:
+    """
+    Column values of items, picklable and session-free
+
+    Args:
+        items: Loaded Item records
+
+    Returns:
+        One dict of column values per item, same order
+    """
+    columns = [column.key for column in Item.__table__.columns]
+    return [{key: getattr(item, key) for key in columns} for item in items]
+
+
+def _init_worker(snapshot: List[Dict[str, Any]], database_url: Optional[str]) -> None:
+    """Pool initializer: rebuild the item snapshot, open this worker's engine"""
+    global _worker_items, _worker_sessions
+    _worker_items = [Item(**row) for row in snapshot]
+    _worker_sessions = create_session_factory(database_url)
+
+
+def _run_shard(
+    parent_ids: List[Any],
+    date_range_days: int,
+    concurrency: Optional[int],
+    timeout: Optional[float]
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Generate one shard's digests in a worker process
+
+    Args:
+        parent_ids: Parents in this shard
+        date_range_days: Date range in days
+        concurrency: Digests in flight within the shard
+        timeout: Seconds per parent
+
+    Returns:
+        (parent_id -> digest_text, BatchAnalyzer stats)
+    """
+    db = _worker_sessions()
+    try:
+        analyzer = BatchAnalyzer(db)
+        digests = asyncio.run(analyzer.generate_batch_digests(
+            parent_ids=parent_ids,
+            date_range_days=date_range_days,
+            concurrency=concurrency,
+            timeout=timeout,
+            items=_worker_items
+        ))
+        return digests, analyzer.stats
+    finally:
+        db.close()
+
+
+def partition_parents(parent_ids: List[Any], shards: int) -> List[List[Any]]:
+    """
+    Split parent IDs into shards by shard_of
+
+    Args:
+        parent_ids: Parent IDs
+        shards: Number of shards
+
+    Returns:
+        One ID list per shard (may be empty)
+    """
+    partitions: List[List[Any]] = [[] for _ in range(shards)]
+    for parent_id in parent_ids:
+        partitions[shard_of(parent_id, shards)].append(parent_id)
+    return partitions
+
+
+def run_sharded_digests(
+    shards: Optional[int] = None,
+    parent_ids: Optional[List[str]] = None,
+    date_range_days: int = 7,
+    database_url: Optional[str] = None,
+    db: Optional[Session] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Generate digests for all (or the given) active parents across K processes
+
+    Args:
+        shards: Worker processes (default settings.digest_shards, 0 = one per core)
+        parent_ids: Optional list of parent IDs (None = all active)
+        date_range_days: Date range in days
+        database_url: Database URL for the workers (default settings.database_url)
+        db: Session for the snapshot + ID queries (default a new one)
+        concurrency: Digests in flight per shard (see generate_batch_digests)
+        timeout: Seconds per parent (see generate_batch_digests)
+
+    Returns:
+        (parent_id -> digest_text, aggregated stats)
+    """
+    shards = shards or settings.digest_shards or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    own_session = db is None
+    if own_session:
+        db = create_session_factory(database_url)()
+
+    try:
+        analyzer = BatchAnalyzer(db)
+        snapshot = item_snapshot(analyzer._load_window_items(date_range_days))
+
+        query = db.query(Parent.id).filter(Parent.status == 'active')
+        if parent_ids:
+            query = query.filter(Parent.id.in_(parent_ids))
+        ids = [row[0] for row in query.all()]
+    finally:
+        if own_session:
+            db.close()
+
+    partitions = [part for part in partition_parents(ids, shards) if part]
+
+    digests: Dict[str, str] = {}
+    stats: Dict[str, Any] = {"parents": 0, "rendered": 0, "failed": 0, "timed_out": 0}
+
+    if partitions:
+        with ProcessPoolExecutor(
+            max_workers=len(partitions),
+            initializer=_init_worker,
+            initargs=(snapshot, database_url)
+        ) as pool:
+            futures = [
+                pool.submit(_run_shard, part, date_range_days, concurrency, timeout)
+                for part in partitions
+            ]
+            for future in futures:
+                shard_digests, shard_stats = future.result()
+                digests.update(shard_digests)
+                for key in ("rendered", "failed", "timed_out"):
+                    stats[key] += shard_stats.get(key, 0)
+
+    elapsed = time.perf_counter() - start
+    stats.update({
+        "parents": len(digests),
+        "items": len(snapshot),
+        "shards": len(partitions),
+        "seconds": elapsed,
+        "parents_per_second": len(digests) / elapsed if elapsed > 0 else 0.0,
+    })
+
+    logger.info(
+        f"Generated {len(digests)} digests in {len(partitions)} shards "
+        f"({stats['failed']} failed, {stats['timed_out']} timed out) in "
+        f"{elapsed:.1f}s: {stats['parents_per_second']:.1f} parents/s"
+    )
+    return digests, stats
@@ -0,0 +1,138 @@
+"""
+ParentPath Fragment Cache - Rendered digest fragments per item and language
+
+Purpose: Format and translate each item once per language instead of once
+per parent digest; digests are assembled from cached fragments
+
+Architecture:
+    FragmentCache (bounded LRU)
+      ├─ key: (item_id, updated_at, language)
+      ├─ get_many / set_many  - batch lookups for one digest render
+      └─ invalidate(item_id)  - drop every fragment of an edited item
+
+updated_at is part of the key, so an edited item never serves a stale
+fragment even without explicit invalidation; invalidate() just frees the
+old entries early.
+
+Integration:
+- api/services/batch_analyzer.py (digest rendering)
+- api/routers/admin.py (invalidate on item edits)
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+FragmentKey = Tuple[Hashable, Optional[datetime], str]
+
+
+class FragmentCache:
+    """
+    Bounded LRU cache of rendered text keyed by (item_id, updated_at, language)
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        """
+        Initialize fragment cache
+
+        Args:
+            max_entries: Entries kept before least recently used are evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[FragmentKey, str]" = OrderedDict()
+        self._keys_by_item: Dict[Hashable, Set[FragmentKey]] = {}
+
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        """Number of cached fragments"""
+        return len(self._entries)
+
+    def get(self, key: FragmentKey) -> Optional[str]:
+        """
+        Cached fragment, or None
+
+        Args:
+            key: (item_id, updated_at, language)
+
+        Returns:
+            Fragment text or None
+        """
+        text = self._entries.get(key)
+        if text is None:
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return text
+
+    def get_many(self, keys: List[FragmentKey]) -> Dict[FragmentKey, str]:
+        """
+        Cached fragments for several keys (misses omitted)
+
+        Args:
+            keys: Fragment keys
+
+        Returns:
+            Dictionary mapping key -> fragment text
+        """
+        found = {}
+        for key in keys:
+            text = self.get(key)
+            if text is not None:
+                found[key] = text
+        return found
+
+    def set(self, key: FragmentKey, text: str) -> None:
+        """
+        Store a fragment
+
+        Args:
+            key: (item_id, updated_at, language)
+            text: Rendered fragment
+        """
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        self._keys_by_item.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._forget(evicted)
+
+    def set_many(self, fragments: Dict[FragmentKey, str]) -> None:
+        """Store several fragments"""
+        for key, text in fragments.items():
+            self.set(key, text)
+
+    def invalidate(self, item_id: Hashable) -> int:
+        """
+        Drop every fragment of one item (all versions and languages)
+
+        Args:
+            item_id: Item ID
+
+        Returns:
+            Number of fragments dropped
+        """
+        keys = self._keys_by_item.pop(item_id, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop everything"""
+        self._entries.clear()
+        self._keys_by_item.clear()
+
+    def _forget(self, key: FragmentKey) -> None:
+        """Remove an evicted key from the per-item index"""
+        keys = self._keys_by_item.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_item[key[0]]
+
+
+# Shared cache (digest batches in this process reuse each other's work)
+fragment_cache = FragmentCache()
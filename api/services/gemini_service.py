@@ -354,6 +354,81 @@ async def generate_embedding(text: str) -> List[float]:
         raise
 
 
+async def generate_embeddings(texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    """
+    Generate 768-dimensional embeddings for many texts in batched requests
+
+    Args:
+        texts: Texts to embed
+        batch_size: Texts per request (Gemini batch limit is 100)
+
+    Returns:
+        List of 768-dim vectors, in input order
+    """
+    embeddings = []
+
+    try:
+        for offset in range(0, len(texts), batch_size):
+            chunk = texts[offset:offset + batch_size]
+
+            if USE_CLI:
+                # Use REST API batch endpoint
+                request_body = {
+                    "requests": [
+                        {
+                            "model": "models/text-embedding-004",
+                            "content": {"parts": [{"text": text}]},
+                            "taskType": "RETRIEVAL_DOCUMENT"
+                        }
+                        for text in chunk
+                    ]
+                }
+
+                cmd = [
+                    "curl", "-X", "POST",
+                    f"https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:batchEmbedContents?key={settings.gemini_api_key}",
+                    "-H", "Content-Type: application/json",
+                    "-d", json.dumps(request_body)
+                ]
+
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+
+                if result.returncode != 0:
+                    raise RuntimeError(f"Curl command failed: {result.stderr}")
+
+                response_data = json.loads(result.stdout)
+
+                if "embeddings" not in response_data:
+                    raise RuntimeError(f"Unexpected batch embedding response: {response_data}")
+
+                embeddings.extend(e["values"] for e in response_data["embeddings"])
+
+            else:
+                # Use API mode (list content returns one embedding per text)
+                result = genai.embed_content(
+                    model="models/text-embedding-004",
+                    content=chunk,
+                    task_type="retrieval_document"
+                )
+
+                embeddings.extend(result['embedding'])
+
+        return embeddings
+
+    except Exception as e:
+        logger.error(f"Error generating batch embeddings: {e}")
+        raise
+
+
+LANGUAGE_MAP = {
+    "en": "English",
+    "pa": "Punjabi (Gurmukhi script)",
+    "tl": "Tagalog",
+    "zh": "Simplified Chinese",
+    "es": "Spanish"
+}
+
+
 async def translate_text(text: str, target_language: str) -> str:
     """
     Translate text to target language
@@ -365,14 +440,6 @@ async def translate_text(text: str, target_language: str) -> str:
     Returns:
         Translated text
     """
-    LANGUAGE_MAP = {
-        "en": "English",
-        "pa": "Punjabi (Gurmukhi script)",
-        "tl": "Tagalog",
-        "zh": "Simplified Chinese",
-        "es": "Spanish"
-    }
-
     if target_language == "en":
         return text  # No translation needed
 
@@ -411,6 +478,79 @@ Return ONLY the translated text, nothing else.
         return text  # Fallback to original text
 
 
+async def translate_texts(
+    texts: List[str],
+    target_language: str,
+    batch_size: int = 40
+) -> List[str]:
+    """
+    Translate many short texts (digest fragments) with one call per batch
+
+    Args:
+        texts: Texts to translate
+        target_language: ISO 639-1 code (en, pa, tl, zh, es)
+        batch_size: Texts per request
+
+    Returns:
+        Translated texts in input order (originals for any batch that fails)
+    """
+    if target_language == "en" or not texts:
+        return list(texts)
+
+    target_lang_name = LANGUAGE_MAP.get(target_language, target_language)
+    translated = []
+
+    for offset in range(0, len(texts), batch_size):
+        chunk = texts[offset:offset + batch_size]
+
+        prompt = f"""
+Translate each string in this JSON array of school digest fragments to {target_lang_name}.
+
+Preserve:
+- Emoji and formatting (*bold*, _italic_, line breaks)
+- URLs (don't translate)
+- Placeholders in braces, e.g. {{children}} or {{count}} (copy exactly)
+- Dates and times (adapt format to locale if appropriate)
+- Grade numbers (e.g., "Grade 5" → appropriate in target language)
+- Activity names (keep in English or translate if natural)
+
+Tone: Friendly, clear, concise - appropriate for parents.
+
+Input ({len(chunk)} strings):
+{json.dumps(chunk, ensure_ascii=False)}
+
+Return ONLY a JSON array of {len(chunk)} translated strings, in the same order.
+"""
+
+        try:
+            # Execute via CLI or API
+            if USE_CLI:
+                response_text = await _execute_via_cli(prompt)
+            else:
+                response = model.generate_content(prompt)
+                response_text = response.text.strip()
+
+            # Parse JSON - remove markdown code blocks if present
+            if response_text.startswith("```"):
+                response_text = response_text.split("```")[1]
+                if response_text.startswith("json"):
+                    response_text = response_text[4:]
+                response_text = response_text.strip()
+
+            result = json.loads(response_text)
+
+            if not isinstance(result, list) or len(result) != len(chunk):
+                raise ValueError(f"expected {len(chunk)} strings, got {len(result)}")
+
+            translated.extend(str(text) for text in result)
+
+        except Exception as e:
+            logger.error(f"Error batch translating {len(chunk)} texts to {target_language}: {e}")
+            translated.extend(chunk)  # Fallback to original text
+
+    return translated
+
+
 async def generate_answer(query: str, context_items: List[Dict[str, Any]]) -> str:
     """
     Generate natural language answer based on query and context
@@ -0,0 +1,184 @@
+"""
+ParentPath Message Indexer - Write-behind buffer for parent message history
+
+Purpose: Take Qdrant message indexing off the reply path; messages are
+acknowledged immediately and flushed in batches (one batch embedding call
++ one upsert) by size or time
+
+Architecture:
+    MessageIndexBuffer
+      ├─ submit()  - enqueue, returns immediately (awaits only when full)
+      ├─ _run()    - background flusher (batch_size or flush_interval)
+      └─ stop()    - flush everything still pending (called from lifespan)
+
+Memory is bounded by max_pending; when the buffer is full, submit()
+waits for the flusher (backpressure) instead of growing without limit.
+
+Integration:
+- api/services/qdrant_service.py (index_messages, index_message)
+- api/main.py (lifespan start/stop)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Any, Optional
+
+from api.config import settings
+from api.services.qdrant_service import index_message, index_messages
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel: flush and exit
+_STOP = object()
+
+
+class MessageIndexBuffer:
+    """
+    Bounded write-behind buffer in front of qdrant_service.index_messages
+
+    Falls back to synchronous index_message when the flusher is not
+    running (scripts, tests, after shutdown).
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize message index buffer
+
+        Args:
+            batch_size: Max messages per flush
+            flush_interval: Max seconds a message waits before flushing
+                (0 flushes whatever is queued right away)
+            max_pending: Max buffered messages before submit() blocks
+                (0 = unbounded)
+
+        None takes the value from settings.
+        """
+        if batch_size is None:
+            batch_size = settings.message_index_batch_size
+        if flush_interval is None:
+            flush_interval = settings.message_index_flush_seconds
+        if max_pending is None:
+            max_pending = settings.message_index_max_pending
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"submitted": 0, "indexed": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is running"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher (must be called inside the event loop)"""
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending messages and stop the flusher"""
+        if not self.running:
+            return
+
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(
+        self,
+        message_id: str,
+        parent_id: str,
+        message_text: str,
+        intent: str,
+        matched_item_id: Optional[str] = None,
+        school_id: Optional[str] = None,
+        timestamp: Optional[int] = None
+    ) -> None:
+        """
+        Queue a message for indexing (same arguments as index_message)
+
+        Returns as soon as the message is buffered; waits only when the
+        buffer holds max_pending messages.
+        """
+        message = {
+            "message_id": message_id,
+            "parent_id": parent_id,
+            "message_text": message_text,
+            "intent": intent,
+            "matched_item_id": matched_item_id,
+            "school_id": school_id,
+            # Stamp at receipt, not at flush
+            "timestamp": timestamp or int(time.time())
+        }
+
+        if not self.running:
+            self.stats["submitted"] += 1
+            await self._flush([message])
+            return
+
+        # Counted once buffered: a submit cancelled while waiting for room
+        # never reaches the queue
+        await self._queue.put(message)
+        self.stats["submitted"] += 1
+
+    async def _run(self) -> None:
+        """Collect batches by size or age and flush them"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is _STOP:
+                    stopping = True
+                    break
+                batch.append(message)
+
+            await self._flush(batch)
+
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Index one batch; failures are logged, not raised (history is best-effort)"""
+        try:
+            if len(batch) == 1 and not self.running:
+                await index_message(**batch[0])
+            else:
+                await index_messages(batch)
+            self.stats["indexed"] += len(batch)
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            logger.error(f"Error flushing {len(batch)} messages to Qdrant: {e}")
+        finally:
+            self.stats["flushes"] += 1
+
+
+# Shared buffer (started/stopped in api.main lifespan)
+message_index_buffer = MessageIndexBuffer()
@@ -0,0 +1,128 @@
+"""
+ParentPath Newsletter Dedupe - Batch duplicate detection for newly extracted items
+
+Purpose: Catch the same event repeated inside one newsletter (page 2 and
+page 9) before review, and match the survivors against indexed items in a
+single Qdrant round trip
+
+Architecture:
+    dedupe_newsletter_items(items)
+      ├─ Batch-embed all extracted items (one Gemini batch call)
+      ├─ Pairwise cosine matrix in NumPy
+      ├─ Cluster near-duplicates (connected components above threshold)
+      └─ One query_batch_points for all cluster representatives
+
+Integration:
+- api/services/gemini_service.py (generate_embeddings)
+- api/services/qdrant_service.py (find_duplicate_vectors, item_embedding_text)
+"""
+
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from api.services.gemini_service import generate_embeddings
+from api.services.qdrant_service import find_duplicate_vectors, item_embedding_text
+
+
+def cluster_near_duplicates(
+    embeddings: np.ndarray,
+    threshold: float = 0.85
+) -> List[List[int]]:
+    """
+    Group vectors whose cosine similarity meets the threshold
+
+    Near-duplicates are transitive (A~B, B~C puts A, B, C together).
+
+    Args:
+        embeddings: (n, dim) array of vectors
+        threshold: Cosine similarity threshold
+
+    Returns:
+        Clusters as lists of row indices, ordered by first member
+    """
+    n = len(embeddings)
+    if n == 0:
+        return []
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.where(norms == 0, 1, norms)
+    similarity = unit @ unit.T
+
+    # Union-find over pairs above threshold (upper triangle only)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in np.argwhere(np.triu(similarity >= threshold, k=1)):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+
+    return list(clusters.values())
+
+
+def _pick_representative(items: List[Dict[str, Any]], indices: List[int]) -> int:
+    """Highest-confidence member of a cluster (earliest on ties)"""
+    return max(
+        indices,
+        key=lambda i: (float(items[i].get("confidence_score") or 0), -i)
+    )
+
+
+async def dedupe_newsletter_items(
+    items: List[Dict[str, Any]],
+    threshold: float = 0.85,
+    school_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate items from one newsletter and match them to the corpus
+
+    Args:
+        items: Items extracted from a single newsletter
+        threshold: Similarity threshold (same as find_duplicate_items)
+        school_id: Only compare against this school's indexed items
+
+    Returns:
+        One entry per distinct item:
+        {
+            "item": representative item dict,
+            "item_index": index of the representative in `items`,
+            "duplicate_indices": indices of in-newsletter copies,
+            "existing_matches": similar items already in Qdrant
+        }
+    """
+    if not items:
+        return []
+
+    embeddings = np.asarray(
+        await generate_embeddings([item_embedding_text(item) for item in items]),
+        dtype=np.float32
+    )
+
+    clusters = cluster_near_duplicates(embeddings, threshold)
+    representatives = [_pick_representative(items, cluster) for cluster in clusters]
+
+    existing = await find_duplicate_vectors(
+        [embeddings[i].tolist() for i in representatives],
+        threshold=threshold,
+        school_id=school_id
+    )
+
+    return [
+        {
+            "item": items[rep],
+            "item_index": rep,
+            "duplicate_indices": [i for i in cluster if i != rep],
+            "existing_matches": matches
+        }
+        for cluster, rep, matches in zip(clusters, representatives, existing)
+    ]
@@ -0,0 +1,317 @@
+"""
+ParentPath Qdrant Backup - Snapshots, vector export/import and warm-up
+
+Purpose: Recover the vector collections without re-embedding everything
+through Gemini, and take the cold-segment latency hit at startup instead
+of on parents' first searches
+
+Architecture:
+    snapshot_collections()            - server-side snapshots (server mode)
+    restore_collections(snapshots)    - recover collections from snapshots
+    export_collection(name, path)     - vectors + payloads to one .npz file
+    import_collection(name, path)     - upsert an export back (any mode)
+    warm_up_collections()             - sample stored points, run searches
+
+Export format (NumPy .npz, one file per collection):
+    ids                     point IDs (unicode array)
+    dense:<name>            float32/float16 matrix, one row per point
+    mask:<name>             rows that have the vector (optional vectors)
+    sparse:<name>:indptr    CSR row pointers
+    sparse:<name>:indices   term indices (uint32)
+    sparse:<name>:values    term weights (float32)
+    payloads                UTF-8 JSON list, as a uint8 array
+
+The default (unnamed) vector is stored as "dense:default".
+
+Integration:
+- api/services/qdrant_service.py (client, collections, search_params)
+- scripts/qdrant_backup.py (CLI)
+- api/main.py (warm-up in lifespan)
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+import numpy as np
+from qdrant_client.models import (
+    PointStruct,
+    SparseVector,
+    SampleQuery,
+    Sample,
+    Filter,
+    FieldCondition,
+    MatchValue,
+)
+
+from api.config import settings
+from api.services import qdrant_service
+from api.services.qdrant_service import (
+    COLLECTION_ITEMS,
+    COLLECTION_MESSAGES,
+    COLLECTION_TICKETS,
+    DENSE_VECTOR_NAME,
+    TENANT_KEY,
+    init_qdrant_collections,
+    search_params,
+)
+
+logger = logging.getLogger(__name__)
+
+ALL_COLLECTIONS = [COLLECTION_ITEMS, COLLECTION_MESSAGES, COLLECTION_TICKETS]
+
+# File key for the unnamed default vector
+DEFAULT_VECTOR_KEY = "default"
+
+
+def _vector_key(name: str) -> str:
+    """File key for a vector name"""
+    return name or DEFAULT_VECTOR_KEY
+
+
+def _vector_name(key: str) -> str:
+    """Vector name for a file key"""
+    return DENSE_VECTOR_NAME if key == DEFAULT_VECTOR_KEY else key
+
+
+def snapshot_collections(collections: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Create a server-side snapshot of each collection
+
+    Args:
+        collections: Collection names (default all three)
+
+    Returns:
+        Snapshot name per collection
+    """
+    snapshots = {}
+
+    for collection_name in collections or ALL_COLLECTIONS:
+        description = qdrant_service.client.create_snapshot(collection_name=collection_name)
+        snapshots[collection_name] = description.name
+        logger.info(f"Snapshot {description.name} created for {collection_name}")
+
+    return snapshots
+
+
+def snapshot_location(collection_name: str, snapshot_name: str) -> str:
+    """URL of a snapshot on the configured Qdrant server"""
+    return f"{settings.qdrant_url.rstrip('/')}/collections/{collection_name}/snapshots/{snapshot_name}"
+
+
+def restore_collections(snapshots: Dict[str, str]) -> None:
+    """
+    Recover collections from snapshots
+
+    Args:
+        snapshots: Collection name -> snapshot name on this server, or a
+            full location (http(s):// or file:// URI)
+    """
+    for collection_name, snapshot in snapshots.items():
+        location = snapshot if "://" in snapshot else snapshot_location(collection_name, snapshot)
+        qdrant_service.client.recover_snapshot(collection_name=collection_name, location=location)
+        logger.info(f"Collection {collection_name} restored from {location}")
+
+
+def export_collection(
+    collection_name: str,
+    path: Union[str, Path],
+    half_precision: bool = False,
+    page_size: int = 1000
+) -> int:
+    """
+    Export every point (all vectors + payload) to a compact .npz file
+
+    Args:
+        collection_name: Collection to export
+        path: Output file
+        half_precision: Store dense vectors as float16 (half the size;
+            cosine rankings are unaffected in practice)
+        page_size: Points per scroll call
+
+    Returns:
+        Number of points exported
+    """
+    params = qdrant_service.client.get_collection(collection_name).config.params
+    dense_names = list(params.vectors) if isinstance(params.vectors, dict) else [DENSE_VECTOR_NAME]
+    dense_sizes = (
+        {name: vp.size for name, vp in params.vectors.items()}
+        if isinstance(params.vectors, dict) else {DENSE_VECTOR_NAME: params.vectors.size}
+    )
+    sparse_names = list(params.sparse_vectors or {})
+
+    ids: List[str] = []
+    payloads: List[Dict[str, Any]] = []
+    dense: Dict[str, List] = {name: [] for name in dense_names}
+    sparse: Dict[str, List[SparseVector]] = {name: [] for name in sparse_names}
+
+    offset = None
+    while True:
+        points, offset = qdrant_service.client.scroll(
+            collection_name=collection_name,
+            limit=page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+
+        for point in points:
+            vectors = point.vector if isinstance(point.vector, dict) else {DENSE_VECTOR_NAME: point.vector}
+            ids.append(str(point.id))
+            payloads.append(point.payload or {})
+            for name in dense_names:
+                dense[name].append(vectors.get(name))
+            for name in sparse_names:
+                sparse[name].append(vectors.get(name) or SparseVector(indices=[], values=[]))
+
+        if offset is None:
+            break
+
+    dtype = np.float16 if half_precision else np.float32
+    arrays = {
+        "ids": np.array(ids, dtype=str),
+        "payloads": np.frombuffer(json.dumps(payloads).encode("utf-8"), dtype=np.uint8),
+    }
+
+    for name, rows in dense.items():
+        key = _vector_key(name)
+        mask = np.array([row is not None for row in rows], dtype=bool)
+        matrix = np.zeros((len(rows), dense_sizes[name]), dtype=dtype)
+        for i, row in enumerate(rows):
+            if row is not None:
+                matrix[i] = row
+        arrays[f"dense:{key}"] = matrix
+        arrays[f"mask:{key}"] = mask
+
+    for name, rows in sparse.items():
+        arrays[f"sparse:{name}:indptr"] = np.cumsum([0] + [len(row.indices) for row in rows], dtype=np.int64)
+        arrays[f"sparse:{name}:indices"] = np.array(
+            [i for row in rows for i in row.indices], dtype=np.uint32
+        )
+        arrays[f"sparse:{name}:values"] = np.array(
+            [v for row in rows for v in row.values], dtype=np.float32
+        )
+
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+    logger.info(f"Exported {len(ids)} points from {collection_name} to {path}")
+    return len(ids)
+
+
+async def import_collection(
+    collection_name: str,
+    path: Union[str, Path],
+    batch_size: int = 256
+) -> int:
+    """
+    Upsert an export_collection() file (no re-embedding)
+
+    Missing collections are created first with the normal schema.
+
+    Args:
+        collection_name: Target collection
+        path: File written by export_collection
+        batch_size: Points per upsert
+
+    Returns:
+        Number of points imported
+    """
+    if not qdrant_service.client.collection_exists(collection_name):
+        await init_qdrant_collections()
+
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    ids = arrays["ids"].tolist()
+    payloads = json.loads(arrays["payloads"].tobytes().decode("utf-8"))
+
+    dense_keys = [key.split(":", 1)[1] for key in arrays if key.startswith("dense:")]
+    sparse_names = sorted({key.split(":")[1] for key in arrays if key.startswith("sparse:")})
+
+    def point_vectors(i: int):
+        """Vectors of row i in upsert form"""
+        vectors = {}
+        for key in dense_keys:
+            if arrays[f"mask:{key}"][i]:
+                vectors[_vector_name(key)] = arrays[f"dense:{key}"][i].astype(np.float32).tolist()
+        for name in sparse_names:
+            start, end = arrays[f"sparse:{name}:indptr"][i:i + 2]
+            vectors[name] = SparseVector(
+                indices=arrays[f"sparse:{name}:indices"][start:end].tolist(),
+                values=arrays[f"sparse:{name}:values"][start:end].tolist()
+            )
+        # Single unnamed vector collections take a plain list
+        if set(vectors) == {DENSE_VECTOR_NAME}:
+            return vectors[DENSE_VECTOR_NAME]
+        return vectors
+
+    for start in range(0, len(ids), batch_size):
+        qdrant_service.client.upsert(
+            collection_name=collection_name,
+            points=[
+                PointStruct(id=ids[i], vector=point_vectors(i), payload=payloads[i])
+                for i in range(start, min(start + batch_size, len(ids)))
+            ]
+        )
+
+    logger.info(f"Imported {len(ids)} points into {collection_name} from {path}")
+    return len(ids)
+
+
+def warm_up_collections(
+    queries_per_collection: Optional[int] = None,
+    collections: Optional[List[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Pre-touch vector, graph and payload storage with representative searches
+
+    Samples stored points and searches with their own vectors, scoped to
+    their school like production queries, so the per-tenant graphs and
+    segments parents will hit are paged in.
+
+    Args:
+        queries_per_collection: Searches per collection (default settings.qdrant_warmup_queries)
+        collections: Collection names (default all three)
+
+    Returns:
+        Per collection: queries run and total milliseconds
+    """
+    n_queries = queries_per_collection or settings.qdrant_warmup_queries
+    stats = {}
+
+    for collection_name in collections or ALL_COLLECTIONS:
+        start = time.perf_counter()
+
+        sample = qdrant_service.client.query_points(
+            collection_name=collection_name,
+            query=SampleQuery(sample=Sample.RANDOM),
+            limit=n_queries,
+            with_payload=[TENANT_KEY],
+            with_vectors=True
+        ).points
+
+        for point in sample:
+            vector = point.vector.get(DENSE_VECTOR_NAME) if isinstance(point.vector, dict) else point.vector
+            if vector is None:
+                continue
+
+            school_id = (point.payload or {}).get(TENANT_KEY)
+            qdrant_service.client.query_points(
+                collection_name=collection_name,
+                query=vector,
+                query_filter=Filter(
+                    must=[FieldCondition(key=TENANT_KEY, match=MatchValue(value=school_id))]
+                ) if school_id else None,
+                search_params=search_params(),
+                limit=10,
+                with_payload=True
+            )
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats[collection_name] = {"queries": len(sample), "ms": elapsed_ms}
+        logger.info(f"Warmed up {collection_name}: {len(sample)} queries in {elapsed_ms:.0f} ms")
+
+    return stats
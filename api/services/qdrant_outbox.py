@@ -0,0 +1,321 @@
+"""
+ParentPath Qdrant Outbox - Keep Postgres items and Qdrant points in sync
+
+Purpose: Item changes (approve edits, rejections, ticket corrections) are
+recorded as outbox rows in the same transaction as the change; a relay
+worker applies them to Qdrant in batches with retries, so request handlers
+never do slow dual writes
+
+Architecture:
+    enqueue_item_sync(db, item)     - called by handlers before commit
+    relay_outbox_batch(db)          - batch upsert/delete pending entries
+    reconcile_qdrant_items(db)      - compare Item.qdrant_id with collection
+    run_outbox_relay(stop_event)    - background loop started in lifespan
+                                      (async session on PostgreSQL, sync
+                                      session on SQLite)
+
+The relay syncs each item's *current* database state (approved -> upsert,
+anything else or missing -> delete), so repeated or out-of-order outbox
+entries for the same item converge.
+
+Integration:
+- api/models/outbox.py (QdrantOutbox)
+- api/services/qdrant_service.py (index_items, delete_items, list_item_point_ids)
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Union
+
+from sqlalchemy import select, update, cast, Text
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import settings
+from api.database import IS_POSTGRES, IS_SQLITE
+from api.models.item import Item
+from api.models.outbox import QdrantOutbox
+from api.services.qdrant_service import index_items, delete_items, list_item_point_ids
+
+logger = logging.getLogger(__name__)
+
+# Relay and reconciliation run on either database mode
+AnySession = Union[AsyncSession, Session]
+
+
+async def _execute(db: AnySession, stmt):
+    """Execute a statement on an async (PostgreSQL) or sync (SQLite) session"""
+    result = db.execute(stmt)
+    return await result if isinstance(db, AsyncSession) else result
+
+
+async def _commit(db: AnySession) -> None:
+    """Commit an async (PostgreSQL) or sync (SQLite) session"""
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
+
+
+def _outbox_entry(entity_id: Any, operation: str) -> QdrantOutbox:
+    """Outbox row with IDs in the column storage type (strings on SQLite)"""
+    if IS_SQLITE:
+        return QdrantOutbox(
+            id=str(uuid.uuid4()), entity_type="item", entity_id=str(entity_id), operation=operation
+        )
+    return QdrantOutbox(
+        entity_type="item", entity_id=uuid.UUID(str(entity_id)), operation=operation
+    )
+
+
+def item_index_data(item: Item) -> Dict[str, Any]:
+    """
+    Item fields stored in the Qdrant payload
+
+    Args:
+        item: Item record (newsletter loaded, for photo flyers)
+
+    Returns:
+        item_data dict for qdrant_service indexing
+    """
+    school_id = item.school_id
+    if school_id is None and item.newsletter is not None:
+        school_id = item.newsletter.school_id
+
+    return {
+        "school_id": school_id,
+        "type": item.type,
+        "title": item.title,
+        "description": item.description,
+        "date": item.date,
+        "end_date": item.end_date,
+        "time": item.time,
+        "location": item.location,
+        "audience_tags": item.audience_tags or [],
+        "confidence_score": item.confidence_score,
+        "created_at": item.created_at,
+        "status": item.status,
+        "source_newsletter_id": item.source_newsletter_id,
+        "image_path": (
+            item.newsletter.file_path
+            if item.newsletter and (item.newsletter.file_type or "").startswith("image/") else None
+        )
+    }
+
+
+def enqueue_item_sync(
+    db: AnySession,
+    item: Item,
+    operation: Optional[str] = None
+) -> QdrantOutbox:
+    """
+    Record a pending Qdrant sync for an item (commits with the caller's transaction)
+
+    Args:
+        db: Session holding the item change
+        item: Changed item
+        operation: upsert or delete (default: from item.status)
+
+    Returns:
+        Outbox entry (added to the session)
+    """
+    entry = _outbox_entry(
+        item.id, operation or ("upsert" if item.status == "approved" else "delete")
+    )
+    db.add(entry)
+    return entry
+
+
+async def relay_outbox_batch(
+    db: AnySession,
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Apply one batch of pending outbox entries to Qdrant
+
+    Args:
+        db: Database session
+        batch_size: Max entries (default settings.outbox_batch_size)
+
+    Returns:
+        Counts: entries, upserted, deleted, failed
+    """
+    now = datetime.utcnow()
+    stats = {"entries": 0, "upserted": 0, "deleted": 0, "failed": 0}
+
+    stmt = (
+        select(QdrantOutbox)
+        .where(QdrantOutbox.status == "pending", QdrantOutbox.available_at <= now)
+        .order_by(QdrantOutbox.created_at)
+        .limit(batch_size or settings.outbox_batch_size)
+    )
+    if IS_POSTGRES:
+        # Several relays can run side by side without double-processing
+        stmt = stmt.with_for_update(skip_locked=True)
+
+    entries = (await _execute(db, stmt)).scalars().all()
+    if not entries:
+        return stats
+
+    stats["entries"] = len(entries)
+    entity_ids = {entry.entity_id for entry in entries}
+
+    items = (await _execute(
+        db,
+        select(Item).options(selectinload(Item.newsletter)).where(Item.id.in_(entity_ids))
+    )).scalars().all()
+    approved = [item for item in items if item.status == "approved"]
+    approved_ids = {item.id for item in approved}
+    delete_ids = [entity_id for entity_id in entity_ids if entity_id not in approved_ids]
+
+    try:
+        await index_items([(str(item.id), item_index_data(item)) for item in approved])
+        await delete_items([str(entity_id) for entity_id in delete_ids])
+
+    except Exception as e:
+        logger.error(f"Outbox relay failed for {len(entries)} entries: {e}")
+
+        for entry in entries:
+            entry.attempts = (entry.attempts or 0) + 1
+            entry.last_error = str(e)
+            if entry.attempts >= settings.outbox_max_attempts:
+                entry.status = "failed"
+                stats["failed"] += 1
+            else:
+                # Exponential backoff: 2, 4, 8, ... seconds
+                entry.available_at = now + timedelta(seconds=2 ** entry.attempts)
+
+        await _commit(db)
+        return stats
+
+    # Record Qdrant state on the items. Keep updated_at: sync bookkeeping
+    # is not a content change (digests key off updated_at).
+    if approved_ids:
+        await _execute(
+            db,
+            update(Item)
+            .where(Item.id.in_(approved_ids))
+            .values(qdrant_id=cast(Item.id, Text), updated_at=Item.updated_at)
+        )
+    if delete_ids:
+        await _execute(
+            db,
+            update(Item)
+            .where(Item.id.in_(delete_ids))
+            .values(qdrant_id=None, updated_at=Item.updated_at)
+        )
+
+    for entry in entries:
+        entry.status = "done"
+        entry.processed_at = now
+
+    await _commit(db)
+
+    stats["upserted"] = len(approved_ids)
+    stats["deleted"] = len(delete_ids)
+    return stats
+
+
+async def reconcile_qdrant_items(db: AnySession) -> Dict[str, int]:
+    """
+    Compare approved items with the Qdrant collection and enqueue fixes
+
+    - Approved items without a point (or without qdrant_id) -> upsert
+    - Points with no approved item (rejected, archived, deleted) -> delete
+
+    Items that already have a pending outbox entry are left to the relay
+    (their point is only behind, not lost).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Counts: missing, orphaned
+    """
+    rows = (await _execute(
+        db,
+        select(Item.id, Item.qdrant_id).where(Item.status == "approved")
+    )).all()
+    pending_ids = {
+        str(entity_id) for entity_id in (await _execute(
+            db,
+            select(QdrantOutbox.entity_id).where(QdrantOutbox.status == "pending")
+        )).scalars()
+    }
+
+    indexed_ids = set(list_item_point_ids())
+    approved_ids = {str(row.id) for row in rows}
+
+    missing = [
+        row.id for row in rows
+        if (str(row.id) not in indexed_ids or not row.qdrant_id) and str(row.id) not in pending_ids
+    ]
+    orphaned = indexed_ids - approved_ids - pending_ids
+
+    for entity_id in missing:
+        db.add(_outbox_entry(entity_id, "upsert"))
+
+    for point_id in orphaned:
+        db.add(_outbox_entry(point_id, "delete"))
+
+    await _commit(db)
+
+    if missing or orphaned:
+        logger.warning(
+            f"Qdrant reconciliation: {len(missing)} missing, {len(orphaned)} orphaned items enqueued"
+        )
+
+    return {"missing": len(missing), "orphaned": len(orphaned)}
+
+
+@asynccontextmanager
+async def _relay_session():
+    """Session for one relay pass: async on PostgreSQL, sync on SQLite"""
+    if IS_SQLITE:
+        from api.database import SessionLocal
+
+        with SessionLocal() as db:
+            yield db
+    else:
+        from api.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            yield db
+
+
+async def run_outbox_relay(stop_event: asyncio.Event) -> None:
+    """
+    Relay loop: drain pending entries, reconcile periodically, sleep
+
+    Args:
+        stop_event: Set on shutdown to exit after the current batch
+    """
+    last_reconcile = None
+
+    while not stop_event.is_set():
+        try:
+            async with _relay_session() as db:
+                # Drain everything that is due
+                while (await relay_outbox_batch(db))["entries"] and not stop_event.is_set():
+                    pass
+
+                now = datetime.utcnow()
+                if last_reconcile is None or (
+                    now - last_reconcile
+                ).total_seconds() >= settings.qdrant_reconcile_interval_seconds:
+                    await reconcile_qdrant_items(db)
+                    last_reconcile = now
+
+        except Exception as e:
+            logger.error(f"Outbox relay error: {e}")
+
+        try:
+            await asyncio.wait_for(
+                stop_event.wait(),
+                timeout=settings.outbox_relay_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,416 @@
+"""
+ParentPath Qdrant Retention - Bound parent_messages and correction_tickets
+
+Purpose: Message history and correction tickets are only useful for a
+while; delete points older than the configured retention so collection
+size (RAM, search latency) stays bounded
+
+Architecture:
+    backfill_timestamps(collection)      - integer epoch "timestamp" for points
+                                           written before it existed
+    prune_collection(collection, days)   - scroll expired IDs, delete in batches
+    compact_parent_history(days)         - fold expired messages into one
+                                           summary vector per parent, page by page
+    run_retention()                      - backfill + compaction (optional) + pruning
+    run_retention_loop(stop_event)       - background loop started in lifespan
+
+Expiry uses the integer epoch "timestamp" payload (indexed). Older points
+carry a string uuid1 time (messages) or no timestamp (tickets), which a
+range filter never matches; backfill_timestamps converts them first. Client
+calls (scroll, retrieve, upsert, delete) run in a worker thread so a long
+prune does not stall the event loop. Summary
+points (summary=True) are never pruned; they are updated in place with a
+message-count weighted mean, so each parent keeps at most one.
+
+Integration:
+- api/services/qdrant_service.py (client, collections, payload indexes)
+- api/main.py (lifespan start/stop)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    MatchValue,
+    Range,
+    PointStruct,
+    PointIdsList,
+    SetPayload,
+    SetPayloadOperation,
+)
+
+from api.config import settings
+from api.services import qdrant_service
+from api.services.qdrant_service import (
+    COLLECTION_MESSAGES,
+    COLLECTION_TICKETS,
+    TENANT_KEY,
+    _epoch_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+# Namespace for deterministic per-parent summary point IDs
+SUMMARY_NAMESPACE = uuid.UUID("4f1c6d0e-5b1a-4c39-9a57-6d2a51f0c8e3")
+
+# uuid1 time (100 ns intervals since 1582-10-15) of the Unix epoch
+UUID1_EPOCH = 0x01B21DD213814000
+
+
+def _cutoff(retention_days: int, now: Optional[float] = None) -> int:
+    """Epoch seconds before which points are expired"""
+    return int((now if now is not None else time.time()) - retention_days * 86400)
+
+
+def _expired_filter(cutoff: int) -> Filter:
+    """Points older than cutoff, excluding summary points"""
+    return Filter(
+        must=[FieldCondition(key="timestamp", range=Range(lt=cutoff))],
+        must_not=[FieldCondition(key="summary", match=MatchValue(value=True))]
+    )
+
+
+def summary_point_id(parent_id: str) -> str:
+    """Deterministic summary point ID for a parent"""
+    return str(uuid.uuid5(SUMMARY_NAMESPACE, str(parent_id)))
+
+
+def _legacy_epoch_seconds(value: Any, default: int) -> int:
+    """
+    Epoch seconds for a pre-integer "timestamp" payload
+
+    Messages stored str(uuid.uuid1().time); other strings are tried as
+    numbers, then ISO datetimes. Missing or unreadable values get default.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return default
+    try:
+        number = int(value)
+        return (number - UUID1_EPOCH) // 10_000_000 if number > UUID1_EPOCH else number
+    except ValueError:
+        pass
+    try:
+        return _epoch_seconds(datetime.fromisoformat(value))
+    except ValueError:
+        return default
+
+
+async def backfill_timestamps(
+    collection_name: str,
+    batch_size: Optional[int] = None,
+    now: Optional[float] = None
+) -> int:
+    """
+    Give points without an integer epoch "timestamp" one
+
+    Points with nothing to convert (legacy tickets) are stamped with now,
+    so their retention period starts at the backfill.
+
+    Args:
+        collection_name: Qdrant collection (messages or tickets)
+        batch_size: Points per scroll/update call
+        now: Reference epoch seconds (default current time)
+
+    Returns:
+        Number of points updated
+    """
+    # Range never matches a string or missing value
+    query_filter = Filter(must_not=[FieldCondition(key="timestamp", range=Range(gte=0))])
+    batch_size = batch_size or settings.retention_batch_size
+    default = _epoch_seconds(now)
+    updated = 0
+
+    try:
+        offset = None
+        while True:
+            points, offset = await asyncio.to_thread(
+                qdrant_service.client.scroll,
+                collection_name=collection_name,
+                scroll_filter=query_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["timestamp"],
+                with_vectors=False
+            )
+            if points:
+                await asyncio.to_thread(
+                    qdrant_service.client.batch_update_points,
+                    collection_name=collection_name,
+                    update_operations=[
+                        SetPayloadOperation(set_payload=SetPayload(
+                            payload={"timestamp": _legacy_epoch_seconds(point.payload.get("timestamp"), default)},
+                            points=[point.id]
+                        ))
+                        for point in points
+                    ]
+                )
+                updated += len(points)
+
+            if offset is None:
+                break
+
+    except Exception as e:
+        logger.error(f"Error backfilling timestamps in {collection_name}: {e}")
+        raise
+
+    if updated:
+        logger.info(f"Backfilled epoch timestamps on {updated} points in {collection_name}")
+
+    return updated
+
+
+async def prune_collection(
+    collection_name: str,
+    retention_days: int,
+    batch_size: Optional[int] = None,
+    now: Optional[float] = None
+) -> int:
+    """
+    Delete points older than retention_days in batches
+
+    Args:
+        collection_name: Qdrant collection (messages or tickets)
+        retention_days: Keep points newer than this many days
+        batch_size: IDs per delete call (default settings.retention_batch_size)
+        now: Reference epoch seconds (default current time)
+
+    Returns:
+        Number of points deleted
+    """
+    query_filter = _expired_filter(_cutoff(retention_days, now))
+    batch_size = batch_size or settings.retention_batch_size
+    deleted = 0
+
+    try:
+        while True:
+            # Always read the first page: the previous page is gone
+            points, _ = await asyncio.to_thread(
+                qdrant_service.client.scroll,
+                collection_name=collection_name,
+                scroll_filter=query_filter,
+                limit=batch_size,
+                with_payload=False,
+                with_vectors=False
+            )
+            if not points:
+                break
+
+            await asyncio.to_thread(
+                qdrant_service.client.delete,
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=[point.id for point in points])
+            )
+            deleted += len(points)
+
+            if len(points) < batch_size:
+                break
+
+    except Exception as e:
+        logger.error(f"Error pruning {collection_name}: {e}")
+        raise
+
+    if deleted:
+        logger.info(f"Pruned {deleted} points older than {retention_days} days from {collection_name}")
+
+    return deleted
+
+
+async def compact_parent_history(
+    retention_days: int,
+    batch_size: Optional[int] = None,
+    now: Optional[float] = None
+) -> Dict[str, int]:
+    """
+    Fold expired parent messages into one summary vector per parent
+
+    The summary vector is the mean of the folded message vectors, merged
+    with any existing summary weighted by its message_count. Each scroll
+    page is folded and deleted before the next is read, so memory stays at
+    one page and an interrupted run keeps the pages it finished.
+
+    Args:
+        retention_days: Messages older than this many days are folded
+        batch_size: Points per scroll/delete call
+        now: Reference epoch seconds (default current time)
+
+    Returns:
+        Counts: messages, parents
+    """
+    query_filter = _expired_filter(_cutoff(retention_days, now))
+    batch_size = batch_size or settings.retention_batch_size
+
+    messages = 0
+    parents: Set[str] = set()
+
+    try:
+        offset = None
+        while True:
+            points, offset = await asyncio.to_thread(
+                qdrant_service.client.scroll,
+                collection_name=COLLECTION_MESSAGES,
+                scroll_filter=query_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=[TENANT_KEY, "parent_id", "timestamp"],
+                with_vectors=True
+            )
+
+            folded = await _fold_into_summaries(points)
+            messages += sum(folded.values())
+            parents.update(folded)
+
+            if offset is None:
+                break
+
+    except Exception as e:
+        logger.error(f"Error compacting parent message history: {e}")
+        raise
+
+    if messages:
+        logger.info(f"Compacted {messages} messages into {len(parents)} parent summaries")
+    return {"messages": messages, "parents": len(parents)}
+
+
+async def _fold_into_summaries(points: List) -> Dict[str, int]:
+    """
+    Merge one page of expired messages into their parents' summaries
+
+    Summaries are written before the messages they replace are deleted.
+
+    Args:
+        points: Scrolled message points (with vectors)
+
+    Returns:
+        Dict of parent ID -> messages folded
+    """
+    sums: Dict[str, np.ndarray] = {}
+    counts: Dict[str, int] = {}
+    latest: Dict[str, int] = {}
+    schools: Dict[str, Optional[str]] = {}
+    expired_ids: List = []
+
+    for point in points:
+        parent_id = point.payload.get("parent_id")
+        if not parent_id:
+            continue
+        vector = np.asarray(point.vector, dtype=np.float32)
+        if parent_id in sums:
+            sums[parent_id] += vector
+        else:
+            sums[parent_id] = vector.copy()
+        counts[parent_id] = counts.get(parent_id, 0) + 1
+        latest[parent_id] = max(latest.get(parent_id, 0), point.payload.get("timestamp") or 0)
+        schools[parent_id] = point.payload.get(TENANT_KEY)
+        expired_ids.append(point.id)
+
+    if not sums:
+        return {}
+
+    existing = {
+        point.payload.get("parent_id"): point
+        for point in await asyncio.to_thread(
+            qdrant_service.client.retrieve,
+            collection_name=COLLECTION_MESSAGES,
+            ids=[summary_point_id(p) for p in sums],
+            with_payload=True,
+            with_vectors=True
+        )
+    }
+
+    summaries = []
+    for parent_id, total in sums.items():
+        count = counts[parent_id]
+        timestamp = latest[parent_id]
+
+        # Pages are in ID order, not time order: keep the newest timestamp
+        previous = existing.get(parent_id)
+        if previous:
+            previous_count = previous.payload.get("message_count", 1)
+            total = total + np.asarray(previous.vector, dtype=np.float32) * previous_count
+            count += previous_count
+            timestamp = max(timestamp, previous.payload.get("timestamp") or 0)
+
+        summaries.append(PointStruct(
+            id=summary_point_id(parent_id),
+            vector=(total / count).tolist(),
+            payload={
+                TENANT_KEY: schools[parent_id],
+                "parent_id": parent_id,
+                "summary": True,
+                "message_count": count,
+                "timestamp": timestamp
+            }
+        ))
+
+    await asyncio.to_thread(
+        qdrant_service.client.upsert, collection_name=COLLECTION_MESSAGES, points=summaries
+    )
+    await asyncio.to_thread(
+        qdrant_service.client.delete,
+        collection_name=COLLECTION_MESSAGES,
+        points_selector=PointIdsList(points=expired_ids)
+    )
+
+    return counts
+
+
+async def run_retention(now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Apply retention to messages and tickets once
+
+    Args:
+        now: Reference epoch seconds (default current time)
+
+    Returns:
+        Counts: backfilled, compacted, messages_pruned, tickets_pruned
+    """
+    stats = {"backfilled": 0, "compacted": 0, "messages_pruned": 0, "tickets_pruned": 0}
+
+    # Legacy points never match the expiry range filter until converted
+    for collection_name in (COLLECTION_MESSAGES, COLLECTION_TICKETS):
+        stats["backfilled"] += await backfill_timestamps(collection_name, now=now)
+
+    if settings.compact_message_history:
+        result = await compact_parent_history(settings.message_retention_days, now=now)
+        stats["compacted"] = result["messages"]
+    else:
+        stats["messages_pruned"] = await prune_collection(
+            COLLECTION_MESSAGES, settings.message_retention_days, now=now
+        )
+
+    stats["tickets_pruned"] = await prune_collection(
+        COLLECTION_TICKETS, settings.ticket_retention_days, now=now
+    )
+
+    return stats
+
+
+async def run_retention_loop(stop_event: asyncio.Event) -> None:
+    """
+    Retention loop: prune, then sleep for retention_interval_seconds
+
+    Args:
+        stop_event: Set on shutdown to exit
+    """
+    while not stop_event.is_set():
+        try:
+            await run_retention()
+        except Exception as e:
+            logger.error(f"Retention error: {e}")
+
+        try:
+            await asyncio.wait_for(
+                stop_event.wait(),
+                timeout=settings.retention_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
@@ -1,26 +1,182 @@
 """Qdrant vector database service"""
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchAny
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchAny,
+    MatchValue,
+    HasIdCondition,
+    RecommendQuery,
+    RecommendInput,
+    SparseVectorParams,
+    Modifier,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    DatetimeRange,
+    OrderBy,
+    OrderByQuery,
+    Direction,
+    PayloadSchemaType,
+    KeywordIndexParams,
+    HnswConfigDiff,
+    SearchParams,
+    QueryRequest,
+    PointIdsList,
+)
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
-import uuid
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+from datetime import date, datetime, timezone
+import time
 
 from api.config import settings
-from api.services.gemini_service import generate_embedding
+from api.services.gemini_service import generate_embedding, generate_embeddings
+from api.services.sparse_encoder import encode_document, encode_query, tokenize
+from api.services.image_embedding import embed_image, IMAGE_VECTOR_SIZE
 
 logger = logging.getLogger(__name__)
 
+
+def create_client(
+    mode: Optional[str] = None,
+    path: Optional[str] = None
+) -> QdrantClient:
+    """
+    Create a Qdrant client for the configured mode
+
+    Modes:
+    - server: remote Qdrant at settings.qdrant_url
+    - memory: embedded, in-process, nothing persisted (tests)
+    - local: embedded, persisted to settings.qdrant_path (single-node pilots)
+
+    Embedded modes search by brute force and ignore payload indexes, which
+    is fine at pilot sizes (see scripts/benchmark_qdrant_modes.py).
+
+    Args:
+        mode: Override settings.qdrant_mode
+        path: Override settings.qdrant_path (local mode)
+
+    Returns:
+        QdrantClient instance
+    """
+    mode = mode or settings.qdrant_mode
+
+    if mode == "memory":
+        return QdrantClient(location=":memory:")
+
+    if mode == "local":
+        return QdrantClient(path=path or settings.qdrant_path)
+
+    if mode == "server":
+        return QdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key
+        )
+
+    raise ValueError(f"Unknown Qdrant mode: {mode} (expected server, memory or local)")
+
+
 # Initialize Qdrant client
-client = QdrantClient(
-    url=settings.qdrant_url,
-    api_key=settings.qdrant_api_key
-)
+client = create_client()
 
 # Collection names
 COLLECTION_ITEMS = "newsletter_items"
 COLLECTION_MESSAGES = "parent_messages"
 COLLECTION_TICKETS = "correction_tickets"
 
+# Named sparse vector (BM25-style term weights) on the items collection.
+# The dense Gemini embedding stays the unnamed default vector.
+DENSE_VECTOR_NAME = ""
+SPARSE_VECTOR_NAME = "text-sparse"
+
+# Named visual vector of the source flyer photo (image items only), used to
+# recognize re-sent flyers before parsing them again
+IMAGE_VECTOR_NAME = "flyer-image"
+
+# Optional item vectors the existing items collection lacks (created before
+# hybrid search / flyer matching; Qdrant cannot add vectors to a collection).
+# Set by init_qdrant_collections; points and queries then leave them out.
+_missing_item_vectors: Set[str] = set()
+
+# Multi-tenancy: every point carries school_id, indexed as a tenant key so
+# Qdrant builds one HNSW graph per school (payload_m) and scoped queries only
+# touch that school's graph. The global graph (m) is kept as well: unscoped
+# queries and points without a school_id still need it, so dropping it
+# (m=0) would turn them into full scans.
+TENANT_KEY = "school_id"
+TENANT_INDEX = KeywordIndexParams(type="keyword", is_tenant=True)
+
+# HNSW index profiles (settings.qdrant_hnsw_profile). m / ef_construct
+# shape both the global graph (m) and the per-tenant graphs (payload_m);
+# hnsw_ef is the search-time beam width passed with every dense query.
+# Measure with scripts/benchmark_hnsw_profiles.py before switching.
+HNSW_PROFILES = {
+    "low-latency": {"m": 8, "ef_construct": 64, "hnsw_ef": 32},
+    "balanced": {"m": 16, "ef_construct": 100, "hnsw_ef": 64},
+    "high-recall": {"m": 32, "ef_construct": 256, "hnsw_ef": 256},
+}
+
+
+def _hnsw_profile(profile: Optional[str] = None) -> Dict[str, int]:
+    """Look up an HNSW profile (default settings.qdrant_hnsw_profile)"""
+    name = profile or settings.qdrant_hnsw_profile
+    if name not in HNSW_PROFILES:
+        raise ValueError(f"Unknown HNSW profile: {name} (expected one of {', '.join(HNSW_PROFILES)})")
+    return HNSW_PROFILES[name]
+
+
+def hnsw_config(profile: Optional[str] = None) -> HnswConfigDiff:
+    """
+    Collection HNSW config for a profile (global and per-tenant graphs)
+
+    Args:
+        profile: Profile name (default settings.qdrant_hnsw_profile)
+
+    Returns:
+        HnswConfigDiff for create_collection / update_collection
+    """
+    params = _hnsw_profile(profile)
+    return HnswConfigDiff(m=params["m"], payload_m=params["m"], ef_construct=params["ef_construct"])
+
+
+def search_params(profile: Optional[str] = None) -> SearchParams:
+    """
+    Search-time HNSW params for a profile
+
+    Args:
+        profile: Profile name (default settings.qdrant_hnsw_profile)
+
+    Returns:
+        SearchParams for dense queries
+    """
+    return SearchParams(hnsw_ef=_hnsw_profile(profile)["hnsw_ef"])
+
+
+# Payload indexes per collection (tenant scoping, filtered search, date ordering)
+PAYLOAD_INDEXES = {
+    COLLECTION_ITEMS: {
+        TENANT_KEY: TENANT_INDEX,
+        "audience_tags": PayloadSchemaType.KEYWORD,
+        "date": PayloadSchemaType.DATETIME,
+        "end_date": PayloadSchemaType.DATETIME,
+        "event_key": PayloadSchemaType.KEYWORD,
+        "source_newsletter_id": PayloadSchemaType.KEYWORD,
+    },
+    COLLECTION_MESSAGES: {
+        TENANT_KEY: TENANT_INDEX,
+        "parent_id": PayloadSchemaType.KEYWORD,
+        "timestamp": PayloadSchemaType.INTEGER,  # epoch seconds (retention)
+    },
+    COLLECTION_TICKETS: {
+        TENANT_KEY: TENANT_INDEX,
+        "timestamp": PayloadSchemaType.INTEGER,  # epoch seconds (retention)
+    },
+}
+
 
 async def init_qdrant_collections():
     """Initialize Qdrant collections on startup"""
@@ -34,59 +190,446 @@ async def init_qdrant_collections():
         try:
             if not client.collection_exists(collection_name):
                 logger.info(f"Creating Qdrant collection: {collection_name}")
+                vectors_config = VectorParams(
+                    size=768,  # Gemini embedding dimension
+                    distance=Distance.COSINE
+                )
+
+                # Items also carry a sparse vector for hybrid search
+                # (Qdrant applies the IDF half of BM25 server-side) and
+                # an optional flyer image vector
+                sparse_vectors_config = None
+                if collection_name == COLLECTION_ITEMS:
+                    vectors_config = {
+                        DENSE_VECTOR_NAME: vectors_config,
+                        IMAGE_VECTOR_NAME: VectorParams(
+                            size=IMAGE_VECTOR_SIZE,
+                            distance=Distance.COSINE
+                        )
+                    }
+                    sparse_vectors_config = {
+                        SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                    }
+
                 client.create_collection(
                     collection_name=collection_name,
-                    vectors_config=VectorParams(
-                        size=768,  # Gemini embedding dimension
-                        distance=Distance.COSINE
-                    )
+                    vectors_config=vectors_config,
+                    sparse_vectors_config=sparse_vectors_config,
+                    hnsw_config=hnsw_config()
                 )
+                if collection_name == COLLECTION_ITEMS:
+                    _missing_item_vectors.clear()
                 logger.info(f"Collection {collection_name} created successfully")
             else:
                 logger.info(f"Collection {collection_name} already exists")
+
+                # Apply profile changes (Qdrant rebuilds the graphs in the background)
+                wanted = hnsw_config()
+                current = client.get_collection(collection_name).config.hnsw_config
+                if (current.m, current.payload_m, current.ef_construct) != (
+                    wanted.m, wanted.payload_m, wanted.ef_construct
+                ):
+                    logger.info(
+                        f"Updating {collection_name} HNSW config to profile "
+                        f"'{settings.qdrant_hnsw_profile}'"
+                    )
+                    client.update_collection(collection_name=collection_name, hnsw_config=wanted)
+
+                if collection_name == COLLECTION_ITEMS:
+                    params = client.get_collection(collection_name).config.params
+                    missing = set()
+                    if SPARSE_VECTOR_NAME not in (params.sparse_vectors or {}):
+                        missing.add(SPARSE_VECTOR_NAME)
+                        logger.warning(
+                            f"Collection {collection_name} has no '{SPARSE_VECTOR_NAME}' "
+                            f"vector; searching dense-only (recreate and re-index it to "
+                            f"enable hybrid search)"
+                        )
+                    if not isinstance(params.vectors, dict) or IMAGE_VECTOR_NAME not in params.vectors:
+                        missing.add(IMAGE_VECTOR_NAME)
+                        logger.warning(
+                            f"Collection {collection_name} has no '{IMAGE_VECTOR_NAME}' "
+                            f"vector; flyer photo matching disabled (recreate and re-index "
+                            f"it to enable it)"
+                        )
+                    _missing_item_vectors.clear()
+                    _missing_item_vectors.update(missing)
+
+            for field_name, field_schema in PAYLOAD_INDEXES[collection_name].items():
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
         except Exception as e:
             logger.error(f"Error creating collection {collection_name}: {e}")
             raise
 
 
+def _format_date(value: Optional[Union[date, datetime, str]]) -> Optional[str]:
+    """
+    Normalize a date to YYYY-MM-DD for Qdrant's datetime payload index
+
+    Args:
+        value: date, datetime or ISO string
+
+    Returns:
+        ISO date string, or None
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+def _date_conditions(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> List[FieldCondition]:
+    """
+    Build date window conditions (AND-ed via Filter.must)
+
+    Multi-day events match while they overlap the window: they start on or
+    before date_to and end on or after date_from.
+
+    Args:
+        date_from: First day of the window (inclusive)
+        date_to: Last day of the window (inclusive)
+
+    Returns:
+        List of field conditions (empty if no bounds)
+    """
+    conditions = []
+
+    if date_to:
+        conditions.append(
+            FieldCondition(key="date", range=DatetimeRange(lte=date_to))
+        )
+
+    if date_from:
+        conditions.append(
+            FieldCondition(key="end_date", range=DatetimeRange(gte=date_from))
+        )
+
+    return conditions
+
+
+def _tenant_conditions(school_id: Optional[str] = None) -> List[FieldCondition]:
+    """
+    Build school scoping condition (AND-ed via Filter.must)
+
+    Args:
+        school_id: UUID of the school (None = unscoped, searches all schools)
+
+    Returns:
+        List with the tenant condition (empty if unscoped)
+    """
+    if not school_id:
+        return []
+
+    return [FieldCondition(key=TENANT_KEY, match=MatchValue(value=str(school_id)))]
+
+
+def _audience_conditions(
+    parent_grades: Optional[List[int]] = None,
+    parent_activities: Optional[List[str]] = None
+) -> List[FieldCondition]:
+    """
+    Build audience tag conditions for a parent (OR-ed via Filter.should)
+
+    Args:
+        parent_grades: List of grades (e.g., [5, 7])
+        parent_activities: List of activities (e.g., ["Basketball"])
+
+    Returns:
+        List of field conditions, always including the "all" tag
+    """
+    conditions = []
+
+    if parent_grades:
+        grade_tags = [f"grade_{g}" for g in parent_grades]
+        conditions.append(
+            FieldCondition(
+                key="audience_tags",
+                match=MatchAny(any=grade_tags)
+            )
+        )
+
+    if parent_activities:
+        conditions.append(
+            FieldCondition(
+                key="audience_tags",
+                match=MatchAny(any=parent_activities)
+            )
+        )
+
+    # Always include "all" items
+    conditions.append(
+        FieldCondition(
+            key="audience_tags",
+            match=MatchAny(any=["all"])
+        )
+    )
+
+    return conditions
+
+
+def _item_filter(
+    parent_grades: Optional[List[int]] = None,
+    parent_activities: Optional[List[str]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    school_id: Optional[str] = None
+) -> Filter:
+    """Audience (should) + school and date window (must) filter for item search"""
+    return Filter(
+        should=_audience_conditions(parent_grades, parent_activities),
+        must=_tenant_conditions(school_id) + _date_conditions(date_from, date_to) or None
+    )
+
+
+def _item_search_request(
+    query: str,
+    query_embedding: List[float],
+    query_filter: Filter,
+    limit: int,
+    score_threshold: float,
+    hybrid: bool
+) -> QueryRequest:
+    """
+    Build one item search request (shared by search_items and search_items_batch)
+
+    Args:
+        query: Search query text (for the sparse branch)
+        query_embedding: Dense query vector
+        query_filter: Item filter
+        limit: Number of results
+        score_threshold: Minimum dense similarity score
+        hybrid: Fuse dense + sparse results (False = dense-only)
+
+    Returns:
+        QueryRequest for query_points / query_batch_points
+    """
+    if not hybrid or SPARSE_VECTOR_NAME in _missing_item_vectors:
+        return QueryRequest(
+            query=query_embedding,
+            filter=query_filter,
+            params=search_params(),
+            score_threshold=score_threshold,
+            limit=limit,
+            with_payload=True
+        )
+
+    # Over-fetch each branch so fusion has candidates to re-rank
+    prefetch_limit = limit * 4
+    return QueryRequest(
+        prefetch=[
+            Prefetch(
+                query=query_embedding,
+                filter=query_filter,
+                params=search_params(),
+                score_threshold=score_threshold,
+                limit=prefetch_limit
+            ),
+            Prefetch(
+                query=encode_query(query),
+                using=SPARSE_VECTOR_NAME,
+                filter=query_filter,
+                limit=prefetch_limit
+            )
+        ],
+        query=FusionQuery(fusion=Fusion.RRF),
+        limit=limit,
+        with_payload=True
+    )
+
+
+def _format_hits(points: list, order_by_date: bool = False) -> List[Dict[str, Any]]:
+    """
+    Flatten scored points into result dicts
+
+    Args:
+        points: Scored points from Qdrant
+        order_by_date: Re-sort by payload date (undated items last)
+
+    Returns:
+        List of {"id", "score", **payload}
+    """
+    results = [
+        {
+            "id": hit.id,
+            "score": hit.score,
+            **hit.payload
+        }
+        for hit in points
+    ]
+
+    if order_by_date:
+        results.sort(key=lambda r: (r.get("date") is None, r.get("date") or ""))
+
+    return results
+
+
+def _query_batch(collection_name: str, requests: List[QueryRequest]) -> List[List[Dict[str, Any]]]:
+    """
+    Run several queries in one query_batch_points round trip
+
+    Args:
+        collection_name: Collection to query
+        requests: Query requests
+
+    Returns:
+        One list of results per request, in request order
+    """
+    if not requests:
+        return []
+
+    # Embedded mode does arithmetic on offset, so it must not be None
+    for request in requests:
+        if request.offset is None:
+            request.offset = 0
+
+    responses = client.query_batch_points(
+        collection_name=collection_name,
+        requests=requests
+    )
+
+    return [_format_hits(response.points) for response in responses]
+
+
+# Grouping keys for search_items(group_by=...): the same event repeated
+# across weekly newsletters shares an event_key
+EVENT_KEY = "event_key"
+NEWSLETTER_KEY = "source_newsletter_id"
+
+
+def event_key(item_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Canonical key for an event, stable across newsletters
+
+    Built from type, the title's terms (lowercased, stopwords dropped,
+    order-insensitive) and the date, so "Basketball Practice!" and
+    "Practice - basketball" on the same day share a key.
+
+    Args:
+        item_data: Item data dict
+
+    Returns:
+        Hex key, or None if the title has no terms
+    """
+    terms = sorted(set(tokenize(item_data.get("title"))))
+    if not terms:
+        return None
+
+    basis = "|".join([
+        (item_data.get("type") or "").lower(),
+        " ".join(terms),
+        _format_date(item_data.get("date")) or ""
+    ])
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def item_embedding_text(item_data: Dict[str, Any]) -> str:
+    """
+    Text embedded for an item (title + description + location)
+
+    Args:
+        item_data: Item data dict
+
+    Returns:
+        Text used for both dense and sparse vectors
+    """
+    return f"{item_data.get('title', '')} {item_data.get('description', '')} {item_data.get('location', '')}"
+
+
+def _item_image_vector(item_data: Dict[str, Any]) -> Optional[List[float]]:
+    """Flyer image vector from item_data (image_vector, or image_path to embed)"""
+    if item_data.get("image_vector"):
+        return item_data["image_vector"]
+
+    if not item_data.get("image_path"):
+        return None
+
+    try:
+        return embed_image(item_data["image_path"])
+    except Exception as e:
+        # Text search still works without it
+        logger.warning(f"Could not embed flyer image {item_data['image_path']}: {e}")
+        return None
+
+
+def _item_point(item_id: str, item_data: Dict[str, Any], embedding: List[float]) -> PointStruct:
+    """
+    Build an item point (dense embedding + BM25 sparse vector + payload,
+    plus the flyer image vector for items parsed from a photo)
+
+    Args:
+        item_id: UUID of the item
+        item_data: Item data including title, description, school_id, etc.
+            (image_vector or image_path for photo flyers)
+        embedding: Dense embedding of item_embedding_text(item_data)
+
+    Returns:
+        PointStruct ready for upsert
+    """
+    vectors = {DENSE_VECTOR_NAME: embedding}
+
+    if SPARSE_VECTOR_NAME not in _missing_item_vectors:
+        vectors[SPARSE_VECTOR_NAME] = encode_document(item_embedding_text(item_data))
+
+    if IMAGE_VECTOR_NAME not in _missing_item_vectors:
+        image_vector = _item_image_vector(item_data)
+        if image_vector:
+            vectors[IMAGE_VECTOR_NAME] = image_vector
+
+    return PointStruct(
+        id=str(item_id),
+        vector=vectors,
+        payload={
+            TENANT_KEY: str(item_data["school_id"]) if item_data.get("school_id") else None,
+            "type": item_data.get("type"),
+            "title": item_data.get("title"),
+            "description": item_data.get("description"),
+            "date": _format_date(item_data.get("date")),
+            "end_date": _format_date(item_data.get("end_date") or item_data.get("date")),
+            "time": str(item_data.get("time")) if item_data.get("time") else None,
+            "location": item_data.get("location"),
+            "audience_tags": item_data.get("audience_tags", []),
+            "confidence_score": float(item_data.get("confidence_score") or 0),
+            "created_at": str(item_data.get("created_at")),
+            "status": item_data.get("status", "approved"),
+            # Every point needs a group key or grouped search drops it
+            EVENT_KEY: event_key(item_data) or str(item_id),
+            NEWSLETTER_KEY: (
+                str(item_data["source_newsletter_id"])
+                if item_data.get("source_newsletter_id") else None
+            )
+        }
+    )
+
+
 async def index_item(item_id: str, item_data: Dict[str, Any]) -> str:
     """
     Index an approved item in Qdrant
 
     Args:
         item_id: UUID of the item
-        item_data: Item data including title, description, etc.
+        item_data: Item data including title, description, school_id, etc.
 
     Returns:
         Qdrant point ID
     """
     try:
         # Generate embedding
-        text = f"{item_data.get('title', '')} {item_data.get('description', '')} {item_data.get('location', '')}"
-        embedding = await generate_embedding(text)
-
-        # Create point
-        point = PointStruct(
-            id=str(item_id),
-            vector=embedding,
-            payload={
-                "type": item_data.get("type"),
-                "title": item_data.get("title"),
-                "description": item_data.get("description"),
-                "date": str(item_data.get("date")) if item_data.get("date") else None,
-                "time": str(item_data.get("time")) if item_data.get("time") else None,
-                "location": item_data.get("location"),
-                "audience_tags": item_data.get("audience_tags", []),
-                "confidence_score": float(item_data.get("confidence_score", 0)),
-                "created_at": str(item_data.get("created_at")),
-                "status": item_data.get("status", "approved")
-            }
-        )
+        embedding = await generate_embedding(item_embedding_text(item_data))
 
         # Upsert to Qdrant
         client.upsert(
             collection_name=COLLECTION_ITEMS,
-            points=[point]
+            points=[_item_point(item_id, item_data, embedding)]
         )
 
         logger.info(f"Indexed item {item_id} in Qdrant")
@@ -98,89 +641,309 @@ async def index_item(item_id: str, item_data: Dict[str, Any]) -> str:
         raise
 
 
+async def index_items(items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """
+    Index many items with one batch embedding call and one upsert
+
+    Args:
+        items: (item_id, item_data) pairs
+
+    Returns:
+        Qdrant point IDs
+    """
+    if not items:
+        return []
+
+    try:
+        embeddings = await generate_embeddings(
+            [item_embedding_text(item_data) for _, item_data in items]
+        )
+
+        client.upsert(
+            collection_name=COLLECTION_ITEMS,
+            points=[
+                _item_point(item_id, item_data, embedding)
+                for (item_id, item_data), embedding in zip(items, embeddings)
+            ]
+        )
+
+        logger.info(f"Indexed {len(items)} items in Qdrant")
+
+        return [str(item_id) for item_id, _ in items]
+
+    except Exception as e:
+        logger.error(f"Error batch indexing items in Qdrant: {e}")
+        raise
+
+
+async def delete_items(item_ids: List[str]) -> None:
+    """
+    Delete item points from Qdrant (missing IDs are ignored)
+
+    Args:
+        item_ids: UUIDs of items to remove
+    """
+    if not item_ids:
+        return
+
+    try:
+        client.delete(
+            collection_name=COLLECTION_ITEMS,
+            points_selector=PointIdsList(points=[str(item_id) for item_id in item_ids])
+        )
+
+        logger.info(f"Deleted {len(item_ids)} items from Qdrant")
+
+    except Exception as e:
+        logger.error(f"Error deleting items from Qdrant: {e}")
+        raise
+
+
+def list_item_point_ids(page_size: int = 1000) -> List[str]:
+    """
+    List every point ID in the items collection (no payloads or vectors)
+
+    Args:
+        page_size: Points per scroll page
+
+    Returns:
+        Point IDs as strings
+    """
+    point_ids = []
+    offset = None
+
+    while True:
+        points, offset = client.scroll(
+            collection_name=COLLECTION_ITEMS,
+            limit=page_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        point_ids.extend(str(point.id) for point in points)
+
+        if offset is None:
+            return point_ids
+
+
 async def search_items(
     query: str,
     parent_grades: Optional[List[int]] = None,
     parent_activities: Optional[List[str]] = None,
     limit: int = 5,
-    score_threshold: float = 0.7
+    score_threshold: float = 0.7,
+    hybrid: bool = True,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    order_by_date: bool = False,
+    school_id: Optional[str] = None,
+    group_by: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Semantic search for items
 
+    Hybrid mode runs dense (Gemini) and sparse (BM25) prefetches in one
+    request and fuses them with reciprocal rank fusion, so exact terms
+    like "hot lunch" or a teacher's name are found even when the dense
+    score is below threshold.
+
     Args:
         query: Search query
         parent_grades: List of grades to filter (e.g., [5, 7])
         parent_activities: List of activities to filter (e.g., ["Basketball"])
         limit: Number of results
-        score_threshold: Minimum similarity score
+        score_threshold: Minimum dense similarity score
+        hybrid: Fuse dense + sparse results (False = dense-only)
+        date_from: Only items on or after this date
+        date_to: Only items on or before this date
+        order_by_date: Return the top matches in date order instead of score order
+        school_id: Restrict to one school's items
+        group_by: Payload key to group on (EVENT_KEY, NEWSLETTER_KEY); returns
+            the best hit per group, so repeats of one event don't fill the
+            results (use for Q&A context)
 
     Returns:
-        List of matching items with scores
+        List of matching items with scores (RRF scores in hybrid mode)
     """
     try:
         # Generate query embedding
         query_embedding = await generate_embedding(query)
 
         # Build filter
-        should_conditions = []
-
-        if parent_grades:
-            grade_tags = [f"grade_{g}" for g in parent_grades]
-            should_conditions.append(
-                FieldCondition(
-                    key="audience_tags",
-                    match=MatchAny(any=grade_tags)
-                )
-            )
+        query_filter = _item_filter(
+            parent_grades, parent_activities, date_from, date_to, school_id
+        )
 
-        if parent_activities:
-            should_conditions.append(
-                FieldCondition(
-                    key="audience_tags",
-                    match=MatchAny(any=parent_activities)
-                )
-            )
+        # Search
+        request = _item_search_request(
+            query, query_embedding, query_filter, limit, score_threshold, hybrid
+        )
+        search_kwargs = dict(
+            collection_name=COLLECTION_ITEMS,
+            prefetch=request.prefetch,
+            query=request.query,
+            query_filter=request.filter,
+            search_params=request.params,
+            score_threshold=request.score_threshold,
+            limit=request.limit,
+            with_payload=True
+        )
 
-        # Always include "all" items
-        should_conditions.append(
-            FieldCondition(
-                key="audience_tags",
-                match=MatchAny(any=["all"])
+        if group_by:
+            # One best hit per group; limit counts groups
+            response = client.query_points_groups(
+                group_by=group_by, group_size=1, **search_kwargs
             )
+            points = [group.hits[0] for group in response.groups if group.hits]
+        else:
+            points = client.query_points(**search_kwargs).points
+
+        # Format results (undated items sort last when ordering by date)
+        return _format_hits(points, order_by_date)
+
+    except Exception as e:
+        logger.error(f"Error searching items in Qdrant: {e}")
+        return []
+
+
+async def search_items_batch(
+    queries: List[str],
+    parent_grades: Optional[List[int]] = None,
+    parent_activities: Optional[List[str]] = None,
+    limit: int = 5,
+    score_threshold: float = 0.7,
+    hybrid: bool = True,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    school_id: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Search for several queries in one embedding call and one Qdrant round trip
+
+    Args:
+        queries: Search queries
+        (remaining args as in search_items, shared by all queries)
+
+    Returns:
+        One result list per query, in query order
+    """
+    if not queries:
+        return []
+
+    try:
+        embeddings = await generate_embeddings(queries)
+        query_filter = _item_filter(
+            parent_grades, parent_activities, date_from, date_to, school_id
         )
 
-        query_filter = Filter(should=should_conditions) if should_conditions else None
+        return _query_batch(
+            COLLECTION_ITEMS,
+            [
+                _item_search_request(query, embedding, query_filter, limit, score_threshold, hybrid)
+                for query, embedding in zip(queries, embeddings)
+            ]
+        )
 
-        # Search
-        results = client.search(
+    except Exception as e:
+        logger.error(f"Error batch searching items in Qdrant: {e}")
+        return [[] for _ in queries]
+
+
+async def find_item_by_image(
+    image_vector: List[float],
+    threshold: Optional[float] = None,
+    school_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Find an indexed item whose source flyer photo matches an image
+
+    Args:
+        image_vector: embed_image() vector of the incoming photo
+        threshold: Minimum cosine similarity (default settings.flyer_image_match_threshold)
+        school_id: Restrict to one school's items
+
+    Returns:
+        Best matching item with score, or None
+    """
+    if IMAGE_VECTOR_NAME in _missing_item_vectors:
+        return None
+
+    try:
+        response = client.query_points(
             collection_name=COLLECTION_ITEMS,
-            query_vector=query_embedding,
-            query_filter=query_filter,
+            query=image_vector,
+            using=IMAGE_VECTOR_NAME,
+            query_filter=Filter(must=_tenant_conditions(school_id)) if school_id else None,
+            search_params=search_params(),
+            score_threshold=threshold or settings.flyer_image_match_threshold,
+            limit=1,
+            with_payload=True
+        )
+
+        hits = _format_hits(response.points)
+        return hits[0] if hits else None
+
+    except Exception as e:
+        logger.error(f"Error matching flyer image in Qdrant: {e}")
+        return None
+
+
+async def list_upcoming_items(
+    date_from: date,
+    date_to: date,
+    parent_grades: Optional[List[int]] = None,
+    parent_activities: Optional[List[str]] = None,
+    limit: int = 20,
+    school_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List items in a date window, in date order ("what's coming up this week")
+
+    Pure payload query: no embedding call and no semantic ranking.
+
+    Args:
+        date_from: First day of the window (inclusive)
+        date_to: Last day of the window (inclusive)
+        parent_grades: List of grades to filter (e.g., [5, 7])
+        parent_activities: List of activities to filter (e.g., ["Basketball"])
+        limit: Max results
+        school_id: Restrict to one school's items
+
+    Returns:
+        List of items ordered by date
+    """
+    try:
+        response = client.query_points(
+            collection_name=COLLECTION_ITEMS,
+            query=OrderByQuery(
+                order_by=OrderBy(key="date", direction=Direction.ASC)
+            ),
+            query_filter=Filter(
+                should=_audience_conditions(parent_grades, parent_activities),
+                must=_tenant_conditions(school_id) + _date_conditions(date_from, date_to)
+            ),
             limit=limit,
-            score_threshold=score_threshold,
             with_payload=True
         )
 
-        # Format results
         return [
             {
                 "id": hit.id,
-                "score": hit.score,
                 **hit.payload
             }
-            for hit in results
+            for hit in response.points
         ]
 
     except Exception as e:
-        logger.error(f"Error searching items in Qdrant: {e}")
+        logger.error(f"Error listing upcoming items from Qdrant: {e}")
         return []
 
 
 async def find_duplicate_items(
     item_text: str,
     threshold: float = 0.85,
-    exclude_id: Optional[str] = None
+    exclude_id: Optional[str] = None,
+    school_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Find duplicate/similar items
@@ -189,6 +952,7 @@ async def find_duplicate_items(
         item_text: Title + description to check
         threshold: Similarity threshold
         exclude_id: ID to exclude from results (e.g., the item itself)
+        school_id: Only compare against this school's items
 
     Returns:
         List of similar items
@@ -201,6 +965,8 @@ async def find_duplicate_items(
         results = client.search(
             collection_name=COLLECTION_ITEMS,
             query_vector=embedding,
+            query_filter=Filter(must=_tenant_conditions(school_id)) if school_id else None,
+            search_params=search_params(),
             limit=10,
             score_threshold=threshold
         )
@@ -223,18 +989,109 @@ async def find_duplicate_items(
         return []
 
 
+async def find_duplicate_items_batch(
+    item_texts: List[str],
+    threshold: float = 0.85,
+    exclude_ids: Optional[List[Optional[str]]] = None,
+    school_id: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Find duplicates for several items in one embedding call and one Qdrant round trip
+
+    Args:
+        item_texts: Title + description for each item
+        threshold: Similarity threshold
+        exclude_ids: Per-item ID to exclude (e.g., the item itself), aligned with item_texts
+        school_id: Only compare against this school's items
+
+    Returns:
+        One list of similar items per input, in input order
+    """
+    if not item_texts:
+        return []
+
+    try:
+        embeddings = await generate_embeddings(item_texts)
+    except Exception as e:
+        logger.error(f"Error finding duplicates in Qdrant: {e}")
+        return [[] for _ in item_texts]
+
+    results = await find_duplicate_vectors(embeddings, threshold=threshold, school_id=school_id)
+    exclude_ids = exclude_ids or [None] * len(item_texts)
+
+    return [
+        [hit for hit in hits if hit["id"] != exclude_id]
+        for hits, exclude_id in zip(results, exclude_ids)
+    ]
+
+
+async def find_duplicate_vectors(
+    embeddings: List[List[float]],
+    threshold: float = 0.85,
+    limit: int = 10,
+    school_id: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Find existing items similar to each of several embeddings in one round trip
+
+    Args:
+        embeddings: Query vectors (e.g., one per duplicate-cluster representative)
+        threshold: Similarity threshold
+        limit: Max matches per vector
+        school_id: Only compare against this school's items
+
+    Returns:
+        One list of similar items per input vector, in input order
+    """
+    if not embeddings:
+        return []
+
+    try:
+        query_filter = Filter(must=_tenant_conditions(school_id)) if school_id else None
+
+        return _query_batch(
+            COLLECTION_ITEMS,
+            [
+                QueryRequest(
+                    query=list(embedding),
+                    filter=query_filter,
+                    params=search_params(),
+                    score_threshold=threshold,
+                    limit=limit,
+                    with_payload=True
+                )
+                for embedding in embeddings
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Error finding duplicate vectors in Qdrant: {e}")
+        return [[] for _ in embeddings]
+
+
 async def get_recommendations(
     engaged_item_ids: List[str],
     delivered_item_ids: List[str],
-    limit: int = 5
+    limit: int = 5,
+    dismissed_item_ids: Optional[List[str]] = None,
+    parent_grades: Optional[List[int]] = None,
+    parent_activities: Optional[List[str]] = None,
+    school_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Get recommended items based on engagement history
 
+    Uses Qdrant's recommend query so example vectors, exclusions and
+    audience filtering are all resolved server-side in one round trip.
+
     Args:
-        engaged_item_ids: IDs of items parent engaged with
+        engaged_item_ids: IDs of items parent engaged with (positive examples)
         delivered_item_ids: IDs of items already delivered (to exclude)
         limit: Number of recommendations
+        dismissed_item_ids: IDs of dismissed cards' items (negative examples)
+        parent_grades: List of grades to filter (e.g., [5, 7])
+        parent_activities: List of activities to filter (e.g., ["Basketball"])
+        school_id: Restrict to one school's items
 
     Returns:
         List of recommended items
@@ -243,50 +1100,91 @@ async def get_recommendations(
         if not engaged_item_ids:
             return []
 
-        # Retrieve engaged item vectors
-        points = client.retrieve(
-            collection_name=COLLECTION_ITEMS,
-            ids=[str(id) for id in engaged_item_ids]
-        )
-
-        if not points:
-            return []
+        # Exclude already delivered items
+        must_not = []
+        if delivered_item_ids:
+            must_not.append(
+                HasIdCondition(has_id=[str(id) for id in delivered_item_ids])
+            )
 
-        # Average vectors (simple recommendation approach)
-        import numpy as np
-        avg_vector = np.mean([p.vector for p in points], axis=0).tolist()
+        query_filter = Filter(
+            should=_audience_conditions(parent_grades, parent_activities),
+            must=_tenant_conditions(school_id) or None,
+            must_not=must_not or None
+        )
 
-        # Search for similar items
-        results = client.search(
+        response = client.query_points(
             collection_name=COLLECTION_ITEMS,
-            query_vector=avg_vector,
-            limit=limit * 2  # Over-fetch to filter
+            query=RecommendQuery(
+                recommend=RecommendInput(
+                    positive=[str(id) for id in engaged_item_ids],
+                    negative=[str(id) for id in dismissed_item_ids or []]
+                )
+            ),
+            query_filter=query_filter,
+            search_params=search_params(),
+            limit=limit,
+            with_payload=True
         )
 
-        # Filter out already delivered items
-        recommendations = [
+        return [
             {
                 "id": hit.id,
                 "score": hit.score,
                 **hit.payload
             }
-            for hit in results
-            if hit.id not in [str(id) for id in delivered_item_ids]
-        ][:limit]
-
-        return recommendations
+            for hit in response.points
+        ]
 
     except Exception as e:
         logger.error(f"Error getting recommendations from Qdrant: {e}")
         return []
 
 
+def _epoch_seconds(value: Optional[Union[datetime, int, float]] = None) -> int:
+    """Epoch seconds for a datetime (naive = UTC) or number; now if None"""
+    if value is None:
+        return int(time.time())
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _message_point(
+    message_id: str,
+    parent_id: str,
+    message_text: str,
+    intent: str,
+    embedding: List[float],
+    matched_item_id: Optional[str] = None,
+    school_id: Optional[str] = None,
+    timestamp: Optional[Union[datetime, int]] = None
+) -> PointStruct:
+    """Build a parent message point"""
+    return PointStruct(
+        id=str(message_id),
+        vector=embedding,
+        payload={
+            TENANT_KEY: str(school_id) if school_id else None,
+            "parent_id": str(parent_id),
+            "message": message_text,
+            "intent": intent,
+            "matched_item_id": str(matched_item_id) if matched_item_id else None,
+            "timestamp": _epoch_seconds(timestamp)
+        }
+    )
+
+
 async def index_message(
     message_id: str,
     parent_id: str,
     message_text: str,
     intent: str,
-    matched_item_id: Optional[str] = None
+    matched_item_id: Optional[str] = None,
+    school_id: Optional[str] = None,
+    timestamp: Optional[Union[datetime, int]] = None
 ) -> str:
     """
     Index a parent message for conversation history search
@@ -297,6 +1195,8 @@ async def index_message(
         message_text: Message content
         intent: Detected intent
         matched_item_id: Item ID if query was matched
+        school_id: UUID of the parent's school
+        timestamp: When the message was received (default now)
 
     Returns:
         Qdrant point ID
@@ -304,21 +1204,15 @@ async def index_message(
     try:
         embedding = await generate_embedding(message_text)
 
-        point = PointStruct(
-            id=str(message_id),
-            vector=embedding,
-            payload={
-                "parent_id": str(parent_id),
-                "message": message_text,
-                "intent": intent,
-                "matched_item_id": str(matched_item_id) if matched_item_id else None,
-                "timestamp": str(uuid.uuid1().time)
-            }
-        )
-
         client.upsert(
             collection_name=COLLECTION_MESSAGES,
-            points=[point]
+            points=[
+                _message_point(
+                    message_id, parent_id, message_text, intent, embedding,
+                    matched_item_id=matched_item_id, school_id=school_id,
+                    timestamp=timestamp
+                )
+            ]
         )
 
         return str(message_id)
@@ -328,12 +1222,51 @@ async def index_message(
         raise
 
 
+async def index_messages(messages: List[Dict[str, Any]]) -> List[str]:
+    """
+    Index many parent messages with one batch embedding call and one upsert
+
+    Args:
+        messages: Dicts with index_message's arguments as keys
+            (message_id, parent_id, message_text, intent, matched_item_id,
+            school_id, timestamp)
+
+    Returns:
+        Qdrant point IDs
+    """
+    if not messages:
+        return []
+
+    try:
+        embeddings = await generate_embeddings([m["message_text"] for m in messages])
+
+        client.upsert(
+            collection_name=COLLECTION_MESSAGES,
+            points=[
+                _message_point(
+                    m["message_id"], m["parent_id"], m["message_text"], m["intent"], embedding,
+                    matched_item_id=m.get("matched_item_id"), school_id=m.get("school_id"),
+                    timestamp=m.get("timestamp")
+                )
+                for m, embedding in zip(messages, embeddings)
+            ]
+        )
+
+        return [str(m["message_id"]) for m in messages]
+
+    except Exception as e:
+        logger.error(f"Error batch indexing messages: {e}")
+        raise
+
+
 async def index_ticket(
     ticket_id: str,
     parent_id: str,
     description: str,
     ticket_type: str,
-    status: str = "pending"
+    status: str = "pending",
+    school_id: Optional[str] = None,
+    created_at: Optional[datetime] = None
 ) -> str:
     """
     Index a correction ticket for similarity matching
@@ -344,6 +1277,8 @@ async def index_ticket(
         description: Ticket description
         ticket_type: Type of ticket
         status: Ticket status
+        school_id: UUID of the parent's school
+        created_at: When the ticket was filed (default now)
 
     Returns:
         Qdrant point ID
@@ -355,10 +1290,12 @@ async def index_ticket(
             id=str(ticket_id),
             vector=embedding,
             payload={
+                TENANT_KEY: str(school_id) if school_id else None,
                 "parent_id": str(parent_id),
                 "description": description,
                 "type": ticket_type,
-                "status": status
+                "status": status,
+                "timestamp": _epoch_seconds(created_at)
             }
         )
 
@@ -377,7 +1314,8 @@ async def index_ticket(
 async def find_similar_tickets(
     description: str,
     threshold: float = 0.85,
-    limit: int = 5
+    limit: int = 5,
+    school_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Find similar tickets (for auto-validation)
@@ -386,6 +1324,7 @@ async def find_similar_tickets(
         description: Ticket description
         threshold: Similarity threshold
         limit: Max results
+        school_id: Only compare against this school's tickets
 
     Returns:
         List of similar tickets
@@ -396,6 +1335,8 @@ async def find_similar_tickets(
         results = client.search(
             collection_name=COLLECTION_TICKETS,
             query_vector=embedding,
+            query_filter=Filter(must=_tenant_conditions(school_id)) if school_id else None,
+            search_params=search_params(),
             limit=limit,
             score_threshold=threshold
         )
@@ -412,3 +1353,48 @@ async def find_similar_tickets(
     except Exception as e:
         logger.error(f"Error finding similar tickets: {e}")
         return []
+
+
+async def find_similar_tickets_batch(
+    descriptions: List[str],
+    threshold: float = 0.85,
+    limit: int = 5,
+    school_id: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Find similar tickets for several descriptions in one Qdrant round trip
+
+    Args:
+        descriptions: Ticket descriptions
+        threshold: Similarity threshold
+        limit: Max results per description
+        school_id: Only compare against this school's tickets
+
+    Returns:
+        One list of similar tickets per description, in input order
+    """
+    if not descriptions:
+        return []
+
+    try:
+        embeddings = await generate_embeddings(descriptions)
+        query_filter = Filter(must=_tenant_conditions(school_id)) if school_id else None
+
+        return _query_batch(
+            COLLECTION_TICKETS,
+            [
+                QueryRequest(
+                    query=embedding,
+                    filter=query_filter,
+                    params=search_params(),
+                    score_threshold=threshold,
+                    limit=limit,
+                    with_payload=True
+                )
+                for embedding in embeddings
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Error finding similar tickets: {e}")
+        return [[] for _ in descriptions]
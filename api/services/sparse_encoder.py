@@ -0,0 +1,102 @@
+"""
+ParentPath Sparse Encoder - BM25-style term weights for hybrid search
+
+Purpose: Exact-term matching ("hot lunch", "Grade 5 band", teacher names)
+alongside dense Gemini embeddings
+
+Architecture:
+    encode_document(text) -> SparseVector  (BM25 term-frequency saturation)
+    encode_query(text)    -> SparseVector  (unique terms, weight 1.0)
+
+The IDF half of BM25 is applied server-side by Qdrant (Modifier.IDF on the
+sparse vector config), so documents only carry the TF component and no
+corpus statistics need to be kept in the API process.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List
+
+from qdrant_client.models import SparseVector
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Newsletter items are short (title + description + location)
+AVG_DOC_LENGTH = 40.0
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "the", "this", "to", "with", "will",
+    "what", "when", "where", "who", "how", "our", "your", "we", "you",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase and split text into terms, dropping stopwords
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of terms (numbers kept, e.g. "grade", "5")
+    """
+    return [
+        token
+        for token in TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOPWORDS
+    ]
+
+
+def _term_index(term: str) -> int:
+    """Stable uint32 index for a term (same across processes and restarts)"""
+    return zlib.crc32(term.encode("utf-8"))
+
+
+def _to_sparse(weights: Dict[int, float]) -> SparseVector:
+    """Convert index -> weight mapping to a Qdrant SparseVector"""
+    indices = sorted(weights)
+    return SparseVector(
+        indices=indices,
+        values=[weights[i] for i in indices]
+    )
+
+
+def encode_document(text: str) -> SparseVector:
+    """
+    Encode document text with BM25 term-frequency weights
+
+    Args:
+        text: Item title + description + location
+
+    Returns:
+        Sparse vector of saturated term frequencies
+    """
+    tokens = tokenize(text)
+    doc_length = len(tokens)
+    norm = K1 * (1 - B + B * doc_length / AVG_DOC_LENGTH)
+
+    weights: Dict[int, float] = {}
+    for term, tf in Counter(tokens).items():
+        index = _term_index(term)
+        weights[index] = weights.get(index, 0.0) + tf * (K1 + 1) / (tf + norm)
+
+    return _to_sparse(weights)
+
+
+def encode_query(text: str) -> SparseVector:
+    """
+    Encode query text (each unique term weighted 1.0)
+
+    Args:
+        text: Parent's question
+
+    Returns:
+        Sparse vector of query terms
+    """
+    return _to_sparse({_term_index(term): 1.0 for term in set(tokenize(text))})
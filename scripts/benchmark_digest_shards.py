@@ -0,0 +1,127 @@
+"""Measure sharded digest throughput against a single-process run
+
+Builds a synthetic district in a throwaway SQLite file (parents with 1-3
+children across grades K-7, activity subscriptions, a week of approved
+items), then generates every digest with run_sharded_digests at 1, 2, 4 ...
+shards up to the core count. Reports wall time, parents/s and speedup over
+one shard, and checks every run produces the same digests.
+
+Digests are English so the run is CPU-bound (no Gemini calls). Speedup is
+capped by physical cores; process start-up and the snapshot/ID queries
+are included in the timings.
+
+Usage:
+    python scripts/benchmark_digest_shards.py [--parents 50000] [--items 300] [--shards 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+
+from api.database import Base
+from api.models import Parent, Child, Subscription, Item
+from api.services.digest_shards import run_sharded_digests
+
+ITEM_TYPES = ["Event", "PermissionSlip", "Fundraiser", "HotLunch", "Announcement"]
+ACTIVITIES = [f"Activity{i}" for i in range(40)]
+GRADES = list(range(0, 8))
+
+
+def build_district(database_url: str, n_parents: int, n_items: int, seed: int = 7) -> None:
+    """Populate a fresh database with a synthetic district"""
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+
+    now = datetime.utcnow()
+    parents, children, subscriptions, items = [], [], [], []
+
+    for i in range(n_parents):
+        parent_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        parents.append({
+            "id": parent_id, "channel_type": "whatsapp", "channel_id": f"+1604{i:07d}",
+            "language": "en", "status": "active",
+        })
+        for _ in range(rng.choice([1, 1, 2, 2, 3])):
+            child_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            children.append({
+                "id": child_id, "parent_id": parent_id,
+                "name": f"Kid{rng.randrange(10000)}", "grade": rng.choice(GRADES),
+            })
+            for activity in rng.sample(ACTIVITIES, rng.choice([0, 1, 1, 2])):
+                subscriptions.append({
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))), "parent_id": parent_id,
+                    "child_id": child_id, "activity": activity,
+                })
+
+    for i in range(n_items):
+        tags = rng.choice([
+            ["all"],
+            [f"grade_{rng.choice(GRADES)}"],
+            [f"grade_{rng.choice(GRADES)}", f"grade_{rng.choice(GRADES)}"],
+            [rng.choice(ACTIVITIES)],
+        ])
+        items.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "type": rng.choice(ITEM_TYPES),
+            "title": f"Item {i}", "description": "Details " * rng.randrange(2, 30),
+            "date": (now + timedelta(days=rng.randrange(14))).date(),
+            "location": rng.choice([None, "Gym", "Library"]),
+            "audience_tags": tags, "status": "approved",
+            "created_at": now - timedelta(days=rng.randrange(6)), "updated_at": now,
+        })
+
+    with engine.begin() as conn:
+        conn.execute(Parent.__table__.insert(), parents)
+        conn.execute(Child.__table__.insert(), children)
+        if subscriptions:
+            conn.execute(Subscription.__table__.insert(), subscriptions)
+        conn.execute(Item.__table__.insert(), items)
+
+    engine.dispose()
+    print(f"parents={n_parents} children={len(children)} subscriptions={len(subscriptions)} items={n_items}")
+
+
+def main():
+    """Run the benchmark"""
+    cores = os.cpu_count() or 1
+    default_shards = sorted({1, *[2 ** k for k in range(1, cores.bit_length()) if 2 ** k <= cores], cores})
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parents", type=int, default=50000)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--shards", type=int, nargs="+", default=default_shards)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/district.db"
+        build_district(database_url, args.parents, args.items)
+
+        print(f"cores={cores}")
+        print(f"{'shards':>6} {'seconds':>8} {'parents/s':>10} {'rendered':>9} {'speedup':>8}")
+
+        baseline_seconds, baseline_digests = None, None
+        for shards in args.shards:
+            digests, stats = run_sharded_digests(shards=shards, database_url=database_url)
+
+            if baseline_seconds is None:
+                baseline_seconds, baseline_digests = stats["seconds"], digests
+            elif digests != baseline_digests:
+                print(f"❌ {shards} shards produced different digests")
+
+            print(
+                f"{shards:>6} {stats['seconds']:>8.2f} {stats['parents_per_second']:>10.0f} "
+                f"{stats['rendered']:>9} {baseline_seconds / stats['seconds']:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Measure recall@k and latency of each HNSW profile against exact search
+
+Loads a corpus into a throwaway collection once per profile (see
+HNSW_PROFILES in api/services/qdrant_service.py), waits for the index to
+build, and compares Qdrant's top-k with brute-force NumPy cosine search.
+
+The corpus is either a recorded .npy matrix of embeddings (--corpus) or a
+synthetic Gaussian mixture (clustered like real newsletter embeddings, so
+approximate search is not trivially exact).
+
+Embedded modes (memory/local) search by brute force and ignore HNSW
+settings: they report the exact-search baseline (recall 1.0). Use
+--mode server to see the profile tradeoffs.
+
+Usage:
+    python scripts/benchmark_hnsw_profiles.py [--mode server] [--size 20000] [--queries 200] [--k 10]
+    python scripts/benchmark_hnsw_profiles.py --corpus embeddings.npy --mode server
+"""
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    CollectionStatus,
+)
+
+from api.services.qdrant_service import create_client, search_params, HNSW_PROFILES
+
+BENCH_COLLECTION = "benchmark_hnsw"
+DIM = 768
+BATCH_SIZE = 256
+INDEX_TIMEOUT_S = 600
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (cosine = dot product)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def synthetic_corpus(size: int, n_queries: int, rng, clusters: int = 50) -> tuple:
+    """Clustered corpus plus queries drawn near the same centers"""
+    centers = rng.standard_normal((clusters, DIM))
+    corpus = centers[rng.integers(clusters, size=size)] + 0.6 * rng.standard_normal((size, DIM))
+    queries = centers[rng.integers(clusters, size=n_queries)] + 0.6 * rng.standard_normal((n_queries, DIM))
+    return normalize(corpus).astype(np.float32), normalize(queries).astype(np.float32)
+
+
+def recorded_corpus(path: str, n_queries: int, rng) -> tuple:
+    """Recorded embeddings; queries are held out from the corpus"""
+    vectors = normalize(np.load(path)).astype(np.float32)
+    order = rng.permutation(len(vectors))
+    return vectors[order[n_queries:]], vectors[order[:n_queries]]
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Brute-force top-k row indices per query"""
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def wait_for_index(client, timeout_s: float = INDEX_TIMEOUT_S) -> None:
+    """Block until the optimizer has finished building the HNSW graph"""
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        if client.get_collection(BENCH_COLLECTION).status == CollectionStatus.GREEN:
+            return
+        time.sleep(0.2)
+    print(f"⚠️  Index not ready after {timeout_s}s; results include unindexed segments")
+
+
+def bench_profile(client, profile: str, corpus: np.ndarray, queries: np.ndarray,
+                  truth: np.ndarray, k: int) -> dict:
+    """Build the collection with one profile and measure it"""
+    params = HNSW_PROFILES[profile]
+
+    if client.collection_exists(BENCH_COLLECTION):
+        client.delete_collection(BENCH_COLLECTION)
+
+    # One global graph: the same shape as one school's payload_m graph
+    client.create_collection(
+        collection_name=BENCH_COLLECTION,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE),
+        hnsw_config=HnswConfigDiff(m=params["m"], ef_construct=params["ef_construct"]),
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1)
+    )
+
+    # Point IDs are uuid5 of the row index so hits map back to corpus rows
+    ids = [str(uuid.uuid5(uuid.NAMESPACE_OID, str(i))) for i in range(len(corpus))]
+    row_of = {point_id: i for i, point_id in enumerate(ids)}
+
+    start = time.perf_counter()
+    for offset in range(0, len(corpus), BATCH_SIZE):
+        client.upsert(
+            collection_name=BENCH_COLLECTION,
+            points=[
+                PointStruct(id=ids[offset + i], vector=vector.tolist())
+                for i, vector in enumerate(corpus[offset:offset + BATCH_SIZE])
+            ]
+        )
+    wait_for_index(client)
+    build_s = time.perf_counter() - start
+
+    latencies_ms = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        response = client.query_points(
+            collection_name=BENCH_COLLECTION,
+            query=query.tolist(),
+            search_params=search_params(profile),
+            limit=k
+        )
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        hits += len({row_of[point.id] for point in response.points} & set(expected.tolist()))
+
+    client.delete_collection(BENCH_COLLECTION)
+
+    return {
+        "build_s": build_s,
+        "recall": hits / (len(queries) * k),
+        "p50_ms": percentile(latencies_ms, 50),
+        "p99_ms": percentile(latencies_ms, 99),
+    }
+
+
+def main():
+    """Compare HNSW profiles on one corpus"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["memory", "local", "server"], default="memory")
+    parser.add_argument("--path", default=None, help="Storage directory for local mode")
+    parser.add_argument("--corpus", default=None, help="Recorded embeddings (.npy, rows x 768)")
+    parser.add_argument("--size", type=int, default=5000, help="Synthetic corpus size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--profiles", nargs="+", default=list(HNSW_PROFILES))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+
+    if args.corpus:
+        corpus, queries = recorded_corpus(args.corpus, args.queries, rng)
+    else:
+        corpus, queries = synthetic_corpus(args.size, args.queries, rng)
+
+    truth = exact_top_k(corpus, queries, args.k)
+    client = create_client(mode=args.mode, path=args.path)
+
+    if args.mode != "server":
+        print("ℹ️  Embedded mode searches exactly; profiles only differ in server mode")
+
+    print(f"corpus={len(corpus)} queries={len(queries)} k={args.k} mode={args.mode}")
+    print(f"{'profile':<12} {'m':>3} {'ef_c':>5} {'ef':>4} {'build s':>8} "
+          f"{'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for profile in args.profiles:
+        params = HNSW_PROFILES[profile]
+        stats = bench_profile(client, profile, corpus, queries, truth, args.k)
+        print(
+            f"{profile:<12} {params['m']:>3} {params['ef_construct']:>5} {params['hnsw_ef']:>4} "
+            f"{stats['build_s']:>8.2f} {stats['recall']:>9.3f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
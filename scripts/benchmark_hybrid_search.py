@@ -0,0 +1,92 @@
+"""Benchmark hybrid (dense + sparse RRF) vs dense-only item search
+
+Query log format (JSONL, one query per line):
+    {"query": "when is hot lunch", "relevant_ids": ["<item uuid>", ...]}
+
+Usage:
+    python scripts/benchmark_hybrid_search.py query_log.jsonl [--k 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.qdrant_service import search_items
+
+
+def load_query_log(path: str) -> list:
+    """Load labelled queries from a JSONL query log"""
+    queries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                queries.append(json.loads(line))
+    return queries
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(queries: list, k: int, hybrid: bool) -> dict:
+    """Run every query in one search mode and collect recall/latency"""
+    recalls = []
+    latencies_ms = []
+
+    for entry in queries:
+        relevant = {str(i) for i in entry.get("relevant_ids", [])}
+
+        start = time.perf_counter()
+        results = await search_items(entry["query"], limit=k, hybrid=hybrid)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if relevant:
+            found = {str(r["id"]) for r in results}
+            recalls.append(len(found & relevant) / len(relevant))
+
+    return {
+        "recall": statistics.mean(recalls) if recalls else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+    }
+
+
+async def async_main(args):
+    queries = load_query_log(args.query_log)
+    if not queries:
+        print("❌ Query log is empty")
+        sys.exit(1)
+
+    # Note: latencies include query embedding (Gemini) for both modes
+    print(f"Queries: {len(queries)}   k={args.k}")
+    print()
+    print(f"{'mode':<12} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9}")
+
+    for name, hybrid in (("dense", False), ("hybrid", True)):
+        stats = await run_mode(queries, args.k, hybrid)
+        print(
+            f"{name:<12} {stats['recall']:>9.3f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}"
+        )
+
+
+def main():
+    """Compare hybrid and dense-only search on a labelled query log"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query_log", help="JSONL file of labelled queries")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark embedded (memory/local) vs server Qdrant at pilot sizes
+
+Uses random 768-dim vectors, so no Gemini calls are made. Each mode gets
+a throwaway collection that is dropped afterwards. Server mode is skipped
+if settings.qdrant_url is unreachable.
+
+Embedded mode searches by brute force (no HNSW), so its latency grows
+linearly with collection size; use this to find where a pilot outgrows it.
+
+Usage:
+    python scripts/benchmark_qdrant_modes.py [--sizes 500 2000 5000] [--queries 200]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qdrant_client.models import Distance, VectorParams, PointStruct
+
+from api.services.qdrant_service import create_client
+
+BENCH_COLLECTION = "benchmark_modes"
+DIM = 768
+BATCH_SIZE = 256
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_mode(client, size: int, n_queries: int, rng) -> dict:
+    """Load `size` points and time upserts + searches"""
+    if client.collection_exists(BENCH_COLLECTION):
+        client.delete_collection(BENCH_COLLECTION)
+
+    client.create_collection(
+        collection_name=BENCH_COLLECTION,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE)
+    )
+
+    vectors = rng.standard_normal((size, DIM)).astype(np.float32)
+    tags = ["all", "grade_5", "grade_7", "Basketball"]
+
+    start = time.perf_counter()
+    for offset in range(0, size, BATCH_SIZE):
+        chunk = vectors[offset:offset + BATCH_SIZE]
+        client.upsert(
+            collection_name=BENCH_COLLECTION,
+            points=[
+                PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=vector.tolist(),
+                    payload={"audience_tags": [tags[(offset + i) % len(tags)]]}
+                )
+                for i, vector in enumerate(chunk)
+            ]
+        )
+    load_s = time.perf_counter() - start
+
+    queries = rng.standard_normal((n_queries, DIM)).astype(np.float32)
+    latencies_ms = []
+    for query in queries:
+        start = time.perf_counter()
+        client.query_points(
+            collection_name=BENCH_COLLECTION,
+            query=query.tolist(),
+            limit=5
+        )
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    client.delete_collection(BENCH_COLLECTION)
+
+    return {
+        "load_s": load_s,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p99_ms": percentile(latencies_ms, 99),
+        "mean_ms": statistics.mean(latencies_ms),
+    }
+
+
+def main():
+    """Compare Qdrant deployment modes at pilot sizes"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    tmp_dir = tempfile.mkdtemp(prefix="qdrant_bench_")
+
+    clients = {
+        "memory": create_client(mode="memory"),
+        "local": create_client(mode="local", path=tmp_dir),
+    }
+
+    try:
+        server = create_client(mode="server")
+        server.get_collections()
+        clients["server"] = server
+    except Exception as e:
+        print(f"⚠️  Server mode skipped: {e}")
+
+    print(f"{'mode':<8} {'points':>7} {'load s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+
+    for size in args.sizes:
+        for name, client in clients.items():
+            stats = bench_mode(client, size, args.queries, rng)
+            print(
+                f"{name:<8} {size:>7} {stats['load_s']:>8.2f} "
+                f"{stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['mean_ms']:>8.2f}"
+            )
+
+    for client in clients.values():
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
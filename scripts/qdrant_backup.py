@@ -0,0 +1,91 @@
+"""Snapshot, restore, export, import and warm up the Qdrant collections
+
+Snapshots are server-side (full collection state, fastest restore, server
+mode only). Exports are portable .npz files of stored vectors + payloads
+that can be imported into any mode without calling Gemini.
+
+Usage:
+    python scripts/qdrant_backup.py snapshot
+    python scripts/qdrant_backup.py restore newsletter_items=<snapshot name or URL> ...
+    python scripts/qdrant_backup.py export backups/ [--half]
+    python scripts/qdrant_backup.py import backups/
+    python scripts/qdrant_backup.py warmup [--queries 50]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.services.qdrant_backup import (
+    ALL_COLLECTIONS,
+    snapshot_collections,
+    restore_collections,
+    export_collection,
+    import_collection,
+    warm_up_collections,
+)
+
+
+def main():
+    """Run one backup command"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collections", nargs="+", default=ALL_COLLECTIONS)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("snapshot", help="Create server-side snapshots")
+
+    restore = commands.add_parser("restore", help="Recover collections from snapshots")
+    restore.add_argument("snapshots", nargs="+", help="collection=snapshot pairs")
+
+    export = commands.add_parser("export", help="Write vectors + payloads to .npz files")
+    export.add_argument("directory")
+    export.add_argument("--half", action="store_true", help="Store dense vectors as float16")
+
+    load = commands.add_parser("import", help="Upsert .npz exports (no re-embedding)")
+    load.add_argument("directory")
+
+    warmup = commands.add_parser("warmup", help="Run representative searches")
+    warmup.add_argument("--queries", type=int, default=None)
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+
+    if args.command == "snapshot":
+        for collection_name, snapshot in snapshot_collections(args.collections).items():
+            print(f"{collection_name}={snapshot}")
+
+    elif args.command == "restore":
+        restore_collections(dict(pair.split("=", 1) for pair in args.snapshots))
+        print(f"✅ Restored {len(args.snapshots)} collections")
+
+    elif args.command == "export":
+        directory = Path(args.directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for collection_name in args.collections:
+            path = directory / f"{collection_name}.npz"
+            count = export_collection(collection_name, path, half_precision=args.half)
+            print(f"{collection_name}: {count} points, {path.stat().st_size / 1e6:.1f} MB -> {path}")
+
+    elif args.command == "import":
+        directory = Path(args.directory)
+        for collection_name in args.collections:
+            path = directory / f"{collection_name}.npz"
+            if not path.exists():
+                print(f"⚠️  {path} not found, skipping {collection_name}")
+                continue
+            count = asyncio.run(import_collection(collection_name, path))
+            print(f"{collection_name}: {count} points imported")
+
+    elif args.command == "warmup":
+        for collection_name, stats in warm_up_collections(args.queries, args.collections).items():
+            print(f"{collection_name}: {stats['queries']} queries in {stats['ms']:.0f} ms")
+
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
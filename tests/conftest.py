@@ -1,12 +1,14 @@
 """Pytest configuration and fixtures"""
 import pytest
 import pytest_asyncio
+from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 from httpx import AsyncClient
 
 from api.main import app
-from api.database import Base, get_db
+from api.database import Base, get_db, IS_SQLITE
 from api.config import settings
 
 # Test database URL
@@ -40,6 +42,22 @@ async def test_db():
     await engine.dispose()
 
 
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Sync session on a throwaway SQLite database (skipped outside SQLite mode)"""
+    if not IS_SQLITE:
+        pytest.skip("models use SQLite column types only in SQLite mode")
+
+    engine = create_engine(f"sqlite:///{tmp_path}/test.db")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
 @pytest_asyncio.fixture
 async def client(test_db):
     """Create test HTTP client"""
@@ -77,9 +95,37 @@ def mock_gemini(monkeypatch):
     async def mock_embed(*args, **kwargs):
         return [0.1] * 768
 
+    async def mock_embed_batch(texts, *args, **kwargs):
+        return [[0.1] * 768 for _ in texts]
+
     async def mock_translate(*args, **kwargs):
         return args[0]  # Return original text
 
     monkeypatch.setattr("api.services.gemini_service.parse_pdf_newsletter", mock_parse_pdf)
     monkeypatch.setattr("api.services.gemini_service.generate_embedding", mock_embed)
+    monkeypatch.setattr("api.services.qdrant_service.generate_embedding", mock_embed)
+    monkeypatch.setattr("api.services.gemini_service.generate_embeddings", mock_embed_batch)
+    monkeypatch.setattr("api.services.qdrant_service.generate_embeddings", mock_embed_batch)
     monkeypatch.setattr("api.services.gemini_service.translate_text", mock_translate)
+
+
+@pytest.fixture(autouse=True)
+def qdrant_item_layout():
+    """Forget the items collection layout detected by init_qdrant_collections (mocked clients)"""
+    from api.services import qdrant_service
+
+    yield
+    qdrant_service._missing_item_vectors.clear()
+
+
+@pytest.fixture
+def qdrant_memory(monkeypatch):
+    """Embedded in-memory Qdrant behind the qdrant_service API (no container needed)"""
+    from api.services import qdrant_service
+
+    memory_client = qdrant_service.create_client(mode="memory")
+    monkeypatch.setattr(qdrant_service, "client", memory_client)
+
+    yield memory_client
+
+    memory_client.close()
@@ -0,0 +1,57 @@
+"""Tests for the audience-tag inverted index"""
+import random
+import time
+from types import SimpleNamespace
+
+from api.services.audience_index import AudienceIndex
+
+
+def _item(*tags):
+    return SimpleNamespace(audience_tags=list(tags))
+
+
+def test_postings_sorted_and_deduplicated():
+    """Test posting lists hold ascending positions, once per item"""
+    index = AudienceIndex([_item("all"), _item("grade_5", "grade_5"), _item("grade_5", "all")])
+
+    assert index.postings == {"all": (0, 2), "grade_5": (1, 2)}
+    assert sorted(index.tags) == ["all", "grade_5"]
+    assert len(index) == 3
+
+
+def test_union_in_window_order():
+    """Test a parent's items are the union of their tags' lists in item order"""
+    items = [_item("grade_5"), _item("Basketball"), _item("all"), _item("grade_7"), _item("grade_5", "all")]
+    index = AudienceIndex(items)
+
+    assert index.positions(["grade_5", "Basketball", "all"]) == [0, 1, 2, 4]
+    assert index.match(["grade_7"]) == [items[3]]
+    assert index.positions(["grade_12"]) == []
+    assert AudienceIndex([]).match(["all"]) == []
+
+
+def test_matches_brute_force():
+    """Test merged postings equal a linear overlap scan on random data"""
+    rng = random.Random(7)
+    vocabulary = [f"grade_{g}" for g in range(1, 8)] + ["Basketball", "Band", "Choir", "all"]
+    items = [_item(*rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(500)]
+    index = AudienceIndex(items)
+
+    for _ in range(200):
+        tags = rng.sample(vocabulary, rng.randint(1, 4))
+        expected = [i for i, item in enumerate(items) if set(item.audience_tags) & set(tags)]
+        assert index.positions(tags) == expected
+
+
+def test_targeting_is_fast():
+    """Test per-parent targeting on a realistic window stays well under a millisecond"""
+    rng = random.Random(1)
+    vocabulary = [f"grade_{g}" for g in range(1, 8)] + ["Basketball", "Band", "all"]
+    index = AudienceIndex([_item(rng.choice(vocabulary)) for _ in range(200)])
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.match(["grade_5", "grade_3", "Basketball", "all"])
+    per_parent = (time.perf_counter() - start) / 1000
+
+    assert per_parent < 0.001
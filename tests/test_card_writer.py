@@ -0,0 +1,126 @@
+"""Tests for bulk Card materialization"""
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func
+
+
+@pytest.fixture
+def db(sqlite_db):
+    """Session on an empty SQLite database"""
+    return sqlite_db
+
+
+def _district(db, n_parents, n_items):
+    """Active grade 5 parents and approved items everyone matches"""
+    from api.models import Parent, Child, Item
+
+    parents = []
+    for n in range(n_parents):
+        parent = Parent(id=str(uuid.uuid4()), channel_type="whatsapp",
+                        channel_id=f"+1604{n:07d}", status="active")
+        parent.children = [Child(id=str(uuid.uuid4()), name=f"Kid{n}", grade=5)]
+        db.add(parent)
+        parents.append(parent)
+
+    items = []
+    for n in range(n_items):
+        item = Item(id=str(uuid.uuid4()), type="Event", title=f"Item {n}", audience_tags=["all"],
+                    date=date(2024, 11, 20), status="approved", created_at=datetime.utcnow(),
+                    updated_at=datetime(2024, 11, 1))
+        db.add(item)
+        items.append(item)
+
+    db.commit()
+    return [p.id for p in parents], [i.id for i in items]
+
+
+def test_bulk_write_skips_existing_cards(db):
+    """Test tens of thousands of cards in one pass, conflicts left untouched"""
+    from api.models import Card
+    from api.services.card_writer import CardWriter
+
+    parent_ids, item_ids = _district(db, 500, 40)
+
+    writer = CardWriter(db, batch_size=8000)
+    for parent_id in parent_ids:
+        writer.add(parent_id, item_ids, delivered_at=datetime(2024, 11, 2))
+    writer.flush()
+
+    assert db.query(func.count(Card.id)).scalar() == 20000
+    assert writer.stats["flushes"] == 3
+
+    # Completed card keeps its state on re-delivery (DO NOTHING)
+    card = db.query(Card).filter_by(parent_id=parent_ids[0], item_id=item_ids[0]).one()
+    card.status = "done"
+    db.commit()
+
+    again = CardWriter(db)
+    again.add(parent_ids[0], item_ids[:2], delivered_at=datetime(2024, 11, 9))
+    assert again.flush() == 0
+    db.refresh(card)
+    assert (card.status, card.delivered_at) == ("done", datetime(2024, 11, 2))
+
+    # update_delivered moves delivered_at forward, status untouched
+    touch = CardWriter(db, update_delivered=True)
+    touch.add(parent_ids[0], [item_ids[0]], delivered_at=datetime(2024, 11, 9))
+    touch.flush()
+    db.refresh(card)
+    assert (card.status, card.delivered_at) == ("done", datetime(2024, 11, 9))
+    assert db.query(func.count(Card.id)).scalar() == 20000
+
+
+@pytest.mark.asyncio
+async def test_delivered_digests_become_cards_and_delta_goes_quiet(db):
+    """Test stream -> send -> cards, after which a delta run has nothing to send"""
+    from api.models import Card, MessageLog
+    from api.services.batch_analyzer import BatchAnalyzer
+    from api.services.card_writer import CardWriter
+    from api.services.digest_delivery import deliver_digests
+    from api.services.fragment_cache import FragmentCache
+
+    parent_ids, item_ids = _district(db, 30, 3)
+
+    async def send(parent_id, digest):
+        return "whatsapp", f"wamid.{parent_id}"
+
+    analyzer = BatchAnalyzer(db, cache=FragmentCache())
+    stats = await deliver_digests(
+        analyzer.stream_batch_digests(with_items=True), send, db, cards=CardWriter(db)
+    )
+
+    assert stats["sent"] == 30
+    assert db.query(func.count(Card.id)).scalar() == 90
+    assert db.query(func.count(MessageLog.id)).scalar() == 30
+    assert db.query(Card).filter(Card.delivered_at.is_(None)).count() == 0
+
+    delta = await BatchAnalyzer(db, cache=FragmentCache()).generate_batch_digests(delta=True)
+    assert delta == {}
+
+    # An edited item is re-delivered once: the delta run moves delivered_at forward
+    from api.models import Item
+    edited = db.get(Item, item_ids[0])
+    edited.title, edited.updated_flag = "Item 0 (moved)", True
+    db.commit()
+
+    resent = await deliver_digests(
+        BatchAnalyzer(db, cache=FragmentCache()).stream_batch_digests(delta=True, with_items=True),
+        send, db, cards=CardWriter(db)
+    )
+    assert resent["sent"] == 30
+    assert db.query(func.count(Card.id)).scalar() == 90
+
+    delta = await BatchAnalyzer(db, cache=FragmentCache()).generate_batch_digests(delta=True)
+    assert delta == {}
+
+    # A full run also delivers the current version and moves delivered_at
+    edited.title = "Item 0 (moved again)"
+    db.commit()
+    await deliver_digests(
+        BatchAnalyzer(db, cache=FragmentCache()).stream_batch_digests(with_items=True),
+        send, db, cards=CardWriter(db)
+    )
+
+    delta = await BatchAnalyzer(db, cache=FragmentCache()).generate_batch_digests(delta=True)
+    assert delta == {}
@@ -0,0 +1,283 @@
+"""Tests for timezone- and quiet-hours-aware digest delivery scheduling"""
+import uuid
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from api.models.parent import Parent
+
+
+def _parent(tz="America/Vancouver", quiet=(time(22, 0), time(8, 0))):
+    """Transient parent with scheduling fields"""
+    return Parent(id=str(uuid.uuid4()), timezone=tz,
+                  quiet_hours_start=quiet[0], quiet_hours_end=quiet[1])
+
+
+def test_send_time_is_local_and_outside_quiet_hours():
+    """Test preferred local time, quiet hours across midnight, late runs"""
+    from api.services.delivery_scheduler import in_quiet_hours, next_send_time
+
+    assert in_quiet_hours(time(23, 30), time(22, 0), time(8, 0))
+    assert in_quiet_hours(time(7, 59), time(22, 0), time(8, 0))
+    assert not in_quiet_hours(time(8, 0), time(22, 0), time(8, 0))
+    assert not in_quiet_hours(time(12, 0), None, None)
+
+    # 04:00 in Vancouver (PST, UTC-8): today's 18:00 local
+    now = datetime(2024, 11, 18, 12, 0)
+    assert next_send_time(_parent(), now, time(18, 0)) == datetime(2024, 11, 19, 2, 0, tzinfo=timezone.utc)
+    # Same run, Toronto (UTC-5)
+    assert next_send_time(_parent("America/Toronto"), now, time(18, 0)) == \
+        datetime(2024, 11, 18, 23, 0, tzinfo=timezone.utc)
+
+    # Quiet 17:00-20:00 local pushes 18:00 to 20:00
+    evening_quiet = _parent(quiet=(time(17, 0), time(20, 0)))
+    assert next_send_time(evening_quiet, now, time(18, 0)) == datetime(2024, 11, 19, 4, 0, tzinfo=timezone.utc)
+
+    # Run at 23:00 local (past send time, in quiet hours): 08:00 next morning
+    late = datetime(2024, 11, 19, 7, 0)
+    assert next_send_time(_parent(), late, time(18, 0)) == datetime(2024, 11, 19, 16, 0, tzinfo=timezone.utc)
+
+    # Unknown zone falls back to the default instead of failing the run
+    assert next_send_time(_parent("Mars/Olympus"), now, time(18, 0)) == next_send_time(_parent(), now, time(18, 0))
+
+
+def test_slots_capped_by_provider_rate_and_pulled_when_due():
+    """Test full slots spill forward (skipping quiet hours) and due() pops only started slots"""
+    from api.services.delivery_scheduler import DeliveryScheduler, MemorySchedule
+
+    now = datetime(2024, 11, 18, 12, 0)
+    scheduler = DeliveryScheduler(MemorySchedule(600), slot_seconds=600, rate_per_second=1 / 60,
+                                  send_time=time(21, 40))
+    assert scheduler.slot_capacity == 10
+
+    # 21:40 local, quiet from 22:00: 10 fit at 21:40, 10 at 21:50, the rest wait until 08:00
+    parents = [_parent() for _ in range(25)]
+    slots = scheduler.plan(parents, now)
+
+    start = datetime(2024, 11, 19, 5, 40, tzinfo=timezone.utc).timestamp()
+    morning = datetime(2024, 11, 19, 16, 0, tzinfo=timezone.utc).timestamp()
+    assert slots == {start: 10, start + 600: 10, morning: 5}
+
+    assert scheduler.due(datetime(2024, 11, 19, 5, 39)) == []
+    first = scheduler.due(datetime(2024, 11, 19, 5, 45))
+    assert first == [str(p.id) for p in parents[:10]]
+    scheduler.ack(first)
+
+    # A late worker drains at most one slot's capacity per pull
+    late = datetime(2024, 11, 19, 17, 0)
+    for expected in (10, 5):
+        pulled = scheduler.due(late)
+        assert len(pulled) == expected
+        scheduler.ack(pulled)
+    assert len(scheduler.schedule) == 0
+
+    # Re-planning counts what is already scheduled: 21:40 and 21:50 are
+    # full from an earlier run, so late additions go to the morning
+    replanned = DeliveryScheduler(MemorySchedule(600), slot_seconds=600, rate_per_second=1 / 60,
+                                  send_time=time(21, 40))
+    replanned.plan(parents[:20], now)
+    assert replanned.plan([_parent() for _ in range(3)], now) == {morning: 3}
+
+
+def test_memory_schedule_moves_replanned_parent_and_requeues_expired_leases():
+    """Test add_many behaves like ZADD and unacknowledged parents come back after the lease"""
+    from api.services.delivery_scheduler import MemorySchedule
+
+    schedule = MemorySchedule(100)
+    schedule.add_many({"a": 100, "b": 100})
+    schedule.add_many({"a": 300})  # moved, not duplicated
+    assert len(schedule) == 2
+    assert schedule.count(100, 200) == 1
+    assert schedule.pop_due(250, 10, lease_until=400) == ["b"]
+    schedule.ack(["b"])
+
+    # Worker leased "a" and died before ack
+    assert schedule.pop_due(350, 10, lease_until=500) == ["a"]
+    assert schedule.requeue_expired(450) == 0
+    assert schedule.requeue_expired(500) == 1
+    assert schedule.pop_due(500, 10, lease_until=700) == ["a"]
+
+    schedule.ack(["a"])
+    assert schedule.requeue_expired(10_000) == 0
+    assert len(schedule) == 0
+
+
+def test_memory_schedule_retry_counts_failures_until_ack():
+    """Test retry re-schedules a leased parent, counts attempts and gives up on None"""
+    from api.services.delivery_scheduler import MemorySchedule
+
+    schedule = MemorySchedule(100)
+    schedule.add_many({"a": 100, "b": 100})
+    assert schedule.pop_due(100, 10, lease_until=300) == ["a", "b"]
+
+    attempts = []
+
+    def retry_at(parent_id, attempt):
+        attempts.append((parent_id, attempt))
+        return None if parent_id == "b" else 100 + 100 * attempt
+
+    assert schedule.retry(["a", "b"], retry_at) == 1
+    assert schedule.requeue_expired(300) == 0  # leases released
+    assert schedule.pop_due(150, 10, lease_until=400) == []
+    assert schedule.pop_due(200, 10, lease_until=400) == ["a"]
+
+    schedule.retry(["a"], retry_at)
+    assert attempts[-1] == ("a", 2)
+    assert schedule.pop_due(300, 10, lease_until=500) == ["a"]
+
+    # Delivered: the count starts over
+    schedule.ack(["a"])
+    schedule.add_many({"a": 400})
+    assert schedule.pop_due(400, 10, lease_until=600) == ["a"]
+    schedule.retry(["a"], retry_at)
+    assert attempts[-1] == ("a", 1)
+
+
+def test_redis_schedule_pops_due_atomically():
+    """Test the sorted-set schedule against a local Redis (skipped without one)"""
+    import redis
+    from api.config import settings
+    from api.services.delivery_scheduler import RedisSchedule
+
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        client.ping()
+    except redis.exceptions.ConnectionError:
+        pytest.skip("Redis not available")
+
+    schedule = RedisSchedule(client, key=f"test:schedule:{uuid.uuid4()}")
+    try:
+        schedule.add_many({"a": 100, "b": 200, "c": 300})
+        assert schedule.count(100, 300) == 2
+        assert schedule.pop_due(250, 10, lease_until=400) == ["a", "b"]
+        assert schedule.pop_due(250, 10, lease_until=400) == []
+        assert len(schedule) == 1
+
+        schedule.ack(["a"])
+        assert schedule.requeue_expired(400) == 1  # "b" was never acknowledged
+        assert schedule.pop_due(400, 10, lease_until=600) == ["b", "c"]
+
+        assert schedule.retry(["b", "c"], lambda pid, attempt: None if pid == "c" else 700) == 1
+        assert schedule.requeue_expired(600) == 0
+        assert schedule.pop_due(700, 10, lease_until=900) == ["b"]
+        assert schedule.retry(["b"], lambda pid, attempt: 800 * attempt) == 1
+        assert schedule.pop_due(1600, 10, lease_until=1800) == ["b"]  # second attempt
+    finally:
+        client.delete(schedule.key, schedule.processing_key, schedule.attempts_key)
+
+
+@pytest.mark.asyncio
+async def test_deliver_due_sends_only_due_parents(sqlite_db):
+    """Test plan from the DB, then each pull sends just the due slot"""
+    from api.models import Child, Item, Card
+    from api.services.delivery_scheduler import DeliveryScheduler, MemorySchedule, deliver_due
+
+    db = sqlite_db
+
+    zones = ["America/Toronto", "America/Vancouver"]
+    for n, tz in enumerate(zones):
+        parent = _parent(tz)
+        parent.channel_type, parent.channel_id, parent.status = "whatsapp", f"+1{n}", "active"
+        parent.children = [Child(id=str(uuid.uuid4()), name=f"Kid{n}", grade=5)]
+        db.add(parent)
+    db.add(Item(id=str(uuid.uuid4()), type="Event", title="Pizza day", audience_tags=["all"],
+                date=date(2024, 11, 20), status="approved", created_at=datetime.utcnow()))
+    db.commit()
+
+    sent = []
+
+    async def send(parent_id, digest):
+        sent.append(parent_id)
+        return "whatsapp", None
+
+    scheduler = DeliveryScheduler(MemorySchedule(300), slot_seconds=300, rate_per_second=10,
+                                  send_time=time(18, 0))
+    scheduler.plan_active_parents(db, now=datetime(2024, 11, 18, 12, 0))
+
+    toronto = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 1))
+    assert (toronto["due"], toronto["sent"]) == (1, 1)
+    assert db.query(Card).count() == 1
+
+    vancouver = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 19, 2, 1))
+    assert (vancouver["due"], vancouver["sent"]) == (1, 1)
+    assert len(set(sent)) == 2
+
+    idle = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 19, 3, 0))
+    assert idle["due"] == 0
+
+
+@pytest.mark.asyncio
+async def test_deliver_due_retries_failed_sends_with_backoff(sqlite_db):
+    """Test only sent parents are acknowledged; a failed one comes back later, then gives up"""
+    from api.models import Child, Item
+    from api.services.delivery_scheduler import DeliveryScheduler, MemorySchedule, deliver_due
+
+    db = sqlite_db
+
+    parents = []
+    for n in range(2):
+        parent = _parent("America/Toronto", quiet=(None, None))
+        parent.channel_type, parent.channel_id, parent.status = "whatsapp", f"+1{n}", "active"
+        parent.children = [Child(id=str(uuid.uuid4()), name=f"Kid{n}", grade=5)]
+        db.add(parent)
+        parents.append(parent)
+    db.add(Item(id=str(uuid.uuid4()), type="Event", title="Pizza day", audience_tags=["all"],
+                date=date(2024, 11, 20), status="approved", created_at=datetime.utcnow()))
+    db.commit()
+    ok, broken = str(parents[0].id), str(parents[1].id)
+
+    sent = []
+
+    async def send(parent_id, digest):
+        if parent_id == broken:
+            raise RuntimeError("provider rejected the message")
+        sent.append(parent_id)
+        return "whatsapp", None
+
+    schedule = MemorySchedule(300)
+    scheduler = DeliveryScheduler(schedule, slot_seconds=300, rate_per_second=10,
+                                  send_time=time(18, 0), retry_seconds=300, max_retries=2)
+    scheduler.plan_active_parents(db, now=datetime(2024, 11, 18, 12, 0))
+
+    first = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 1))
+    assert (first["due"], first["sent"], first["retried"]) == (2, 1, 1)
+    assert first["failed_parent_ids"] == [broken]
+    assert len(schedule) == 1  # the failed parent, re-scheduled
+
+    # Not before the backoff, and never re-queued as an expired lease
+    early = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 4))
+    assert early["due"] == 0
+
+    # Retried in the slot 300s later, then 600s after that, then dropped
+    second = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 6))
+    assert (second["due"], second["retried"]) == (1, 1)
+    assert (await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 14)))["due"] == 0
+    third = await deliver_due(db, send, scheduler, now=datetime(2024, 11, 18, 23, 16))
+    assert (third["due"], third["retried"]) == (1, 0)
+
+    assert sent == [ok]
+    assert len(schedule) == 0
+    assert (await deliver_due(db, send, scheduler, now=datetime(2024, 11, 19, 6, 0)))["due"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sends_paced_at_provider_rate():
+    """Test deliver_digests spaces sends at rate_per_second across all senders"""
+    import asyncio
+    from unittest.mock import MagicMock
+    from api.services.digest_delivery import deliver_digests
+
+    sent_at = []
+
+    async def stream():
+        for n in range(6):
+            yield f"p{n}", "digest"
+
+    async def send(parent_id, digest):
+        sent_at.append(asyncio.get_running_loop().time())
+        return "whatsapp", None
+
+    stats = await deliver_digests(stream(), send, MagicMock(), senders=4, rate_per_second=50)
+
+    assert stats["sent"] == 6
+    assert sent_at[-1] - sent_at[0] >= 5 / 50 * 0.9
@@ -0,0 +1,62 @@
+"""Tests for multi-process sharded digest generation"""
+import asyncio
+import uuid
+from datetime import date, datetime
+
+import pytest
+
+
+def test_shard_of_stable_and_partitions_every_parent():
+    """Test shards are deterministic and cover each parent exactly once"""
+    from api.services.digest_shards import shard_of, partition_parents
+
+    ids = [str(uuid.UUID(int=i)) for i in range(1000)]
+    partitions = partition_parents(ids, 4)
+
+    assert sorted(sum(partitions, [])) == sorted(ids)
+    assert all(150 < len(part) < 350 for part in partitions)  # roughly even
+    assert shard_of(ids[0], 4) == shard_of(uuid.UUID(ids[0]), 4)
+    assert all(shard_of(i, 4) == n for n, part in enumerate(partitions) for i in part)
+
+
+def test_sharded_run_matches_single_process(sqlite_db):
+    """Test K worker processes produce the same digests as one BatchAnalyzer"""
+    from api.models import Parent, Child, Subscription, Item
+    from api.services.batch_analyzer import BatchAnalyzer
+    from api.services.digest_shards import run_sharded_digests
+
+    db = sqlite_db
+    database_url = db.get_bind().url.render_as_string(hide_password=False)
+
+    parent_ids = []
+    for n in range(40):
+        parent = Parent(id=str(uuid.uuid4()), channel_type="whatsapp",
+                        channel_id=f"+1604555{n:04d}", language="en", status="active")
+        child = Child(id=str(uuid.uuid4()), name=f"Kid{n}", grade=n % 4)
+        parent.children = [child]
+        if n % 3 == 0:
+            parent.subscriptions = [
+                Subscription(id=str(uuid.uuid4()), child_id=child.id, activity="Basketball")
+            ]
+        db.add(parent)
+        parent_ids.append(parent.id)
+    db.add(Parent(id=str(uuid.uuid4()), channel_type="sms", channel_id="+16045559999",
+                  status="paused"))
+    for n, tags in enumerate([["all"], ["grade_1"], ["grade_2", "grade_3"], ["Basketball"]]):
+        db.add(Item(id=str(uuid.uuid4()), type="Event", title=f"Item {n}", audience_tags=tags,
+                    date=date(2024, 11, 20 + n), status="approved",
+                    created_at=datetime.utcnow(), updated_at=datetime(2024, 11, 1)))
+    db.commit()
+
+    digests, stats = run_sharded_digests(shards=3, database_url=database_url)
+    expected = asyncio.run(BatchAnalyzer(db).generate_batch_digests())
+
+    assert digests == expected
+    assert len(digests) == 40  # paused parent excluded
+    assert stats["shards"] == 3
+    assert stats["items"] == 4
+
+    # Grade 0 + Basketball: "all" and Basketball items only
+    assert "Item 0" in digests[parent_ids[0]]
+    assert "Item 3" in digests[parent_ids[0]]
+    assert "Item 1" not in digests[parent_ids[0]]
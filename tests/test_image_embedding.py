@@ -0,0 +1,118 @@
+"""Tests for flyer image vectors"""
+import io
+import uuid
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from PIL import Image, ImageDraw
+
+from api.config import settings
+from api.services.image_embedding import embed_image, IMAGE_VECTOR_SIZE
+
+
+def _flyer(size=(600, 800), text="BASKETBALL PRACTICE") -> Image.Image:
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, size[0] - 40, size[1] // 3), fill="navy")
+    draw.text((60, size[1] // 2), text, fill="black")
+    return image
+
+
+def _jpeg(image: Image.Image, quality: int = 85) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _cosine(a, b) -> float:
+    return float(np.dot(a, b))
+
+
+def test_vector_shape_and_norm():
+    """Test vectors are IMAGE_VECTOR_SIZE long and unit length"""
+    vector = embed_image(_jpeg(_flyer()))
+
+    assert len(vector) == IMAGE_VECTOR_SIZE
+    assert abs(np.linalg.norm(vector) - 1.0) < 1e-5
+
+
+def test_resent_copy_matches():
+    """Test re-compressed, resized, darker copies stay near-identical"""
+    original = embed_image(_jpeg(_flyer()))
+
+    smaller = embed_image(_jpeg(_flyer().resize((300, 400)), quality=40))
+    darker = embed_image(_jpeg(_flyer().point(lambda p: int(p * 0.7))))
+
+    assert _cosine(original, smaller) > 0.95
+    assert _cosine(original, darker) > 0.95
+
+
+def test_different_flyer_does_not_match():
+    """Test a different layout scores well below the match threshold"""
+    other = Image.new("RGB", (600, 800), "white")
+    ImageDraw.Draw(other).ellipse((100, 400, 500, 750), fill="red")
+
+    assert _cosine(embed_image(_jpeg(_flyer())), embed_image(_jpeg(other))) < 0.5
+
+
+def test_same_template_different_text_below_threshold():
+    """Test a flyer reusing the layout with other wording is not a match"""
+    original = embed_image(_jpeg(_flyer()))
+    resent = embed_image(_jpeg(_flyer().resize((300, 400)), quality=40))
+    reworded = embed_image(_jpeg(_flyer(text="PIZZA DAY FRIDAY")))
+
+    assert _cosine(original, resent) >= settings.flyer_image_match_threshold
+    assert _cosine(original, reworded) < settings.flyer_image_match_threshold
+
+
+def test_blank_image_has_no_vector():
+    """Test a uniform image returns None"""
+    assert embed_image(_jpeg(Image.new("RGB", (100, 100), "gray"))) is None
+
+
+async def _upload(content: bytes, school_id=None, match=None, tmp_path=None):
+    """Call upload_newsletter with a mocked session; returns (response, db, lookup)"""
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+    from api.routers import intake
+
+    empty = MagicMock()
+    empty.scalar_one_or_none.return_value = None
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=empty)
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock(side_effect=lambda newsletter: setattr(newsletter, "id", uuid.uuid4()))
+
+    upload = UploadFile(
+        file=io.BytesIO(content), filename="flyer.jpg", headers=Headers({"content-type": "image/jpeg"})
+    )
+    with patch.object(intake, "UPLOAD_DIR", tmp_path), \
+         patch.object(intake, "find_item_by_image", AsyncMock(return_value=match)) as lookup:
+        response = await intake.upload_newsletter(file=upload, school_id=school_id, db=db)
+
+    return response, db, lookup
+
+
+@pytest.mark.asyncio
+async def test_upload_matching_flyer_is_stored_with_hint(tmp_path):
+    """Test a matching flyer photo is still saved and queued, with the match as a hint"""
+    school_id = uuid.uuid4()
+    match = {"id": "item-1", "title": "Basketball practice", "score": 0.999}
+
+    response, db, lookup = await _upload(_jpeg(_flyer()), school_id, match, tmp_path)
+
+    assert response["status"] == "queued"
+    assert response["possible_duplicate"] == {"item_id": "item-1", "title": "Basketball practice", "score": 0.999}
+    assert lookup.call_args.kwargs["school_id"] == str(school_id)
+    db.add.assert_called_once()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_without_school_skips_flyer_lookup(tmp_path):
+    """Test flyer matching is never run across schools"""
+    response, db, lookup = await _upload(_jpeg(_flyer()), tmp_path=tmp_path)
+
+    assert response["status"] == "queued"
+    assert "possible_duplicate" not in response
+    lookup.assert_not_called()
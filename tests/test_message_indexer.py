@@ -0,0 +1,101 @@
+"""Tests for the write-behind message indexer"""
+import asyncio
+import pytest
+import uuid
+from unittest.mock import patch
+
+from api.config import settings
+from api.services.message_indexer import MessageIndexBuffer
+from api.services.qdrant_service import init_qdrant_collections, COLLECTION_MESSAGES
+
+
+def _message(i: int) -> dict:
+    return {
+        "message_id": str(uuid.uuid4()),
+        "parent_id": str(uuid.uuid4()),
+        "message_text": f"When is practice {i}?",
+        "intent": "query"
+    }
+
+
+@pytest.mark.asyncio
+async def test_flush_by_size_and_on_stop(mock_gemini, qdrant_memory):
+    """Test messages are upserted in batches and the tail is flushed on stop"""
+    await init_qdrant_collections()
+    buffer = MessageIndexBuffer(batch_size=3, flush_interval=60, max_pending=100)
+    buffer.start()
+
+    with patch.object(qdrant_memory, "upsert", wraps=qdrant_memory.upsert) as spy:
+        for i in range(7):
+            await buffer.submit(**_message(i))
+        await buffer.stop()
+
+    assert [len(call.kwargs["points"]) for call in spy.call_args_list] == [3, 3, 1]
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 7
+    assert buffer.stats["indexed"] == 7
+    assert not buffer.running
+
+
+@pytest.mark.asyncio
+async def test_flush_by_time(mock_gemini, qdrant_memory):
+    """Test a lone message is flushed after flush_interval"""
+    await init_qdrant_collections()
+    buffer = MessageIndexBuffer(batch_size=100, flush_interval=0.05, max_pending=100)
+    buffer.start()
+
+    await buffer.submit(**_message(0))
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 0  # acknowledged, not yet indexed
+
+    await asyncio.sleep(0.2)
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 1
+
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_when_full(mock_gemini):
+    """Test submit waits instead of growing past max_pending"""
+    release = asyncio.Event()
+
+    async def slow_index(batch):
+        await release.wait()
+        return [m["message_id"] for m in batch]
+
+    with patch("api.services.message_indexer.index_messages", slow_index):
+        buffer = MessageIndexBuffer(batch_size=1, flush_interval=0.01, max_pending=2)
+        buffer.start()
+
+        # One message in the (blocked) flusher, two buffered
+        for i in range(3):
+            await asyncio.wait_for(buffer.submit(**_message(i)), timeout=1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(buffer.submit(**_message(3)), timeout=0.1)
+        assert buffer.stats["submitted"] == 3  # the timed-out submit was never enqueued
+
+        release.set()
+        await buffer.stop()
+
+    assert buffer.stats["indexed"] == 3
+
+
+def test_explicit_zero_settings_kept():
+    """Test an explicit 0 is not replaced by the configured default"""
+    buffer = MessageIndexBuffer(batch_size=5, flush_interval=0, max_pending=0)
+    assert (buffer.batch_size, buffer.flush_interval, buffer.max_pending) == (5, 0, 0)
+
+    default = MessageIndexBuffer()
+    assert default.flush_interval == settings.message_index_flush_seconds
+
+
+@pytest.mark.asyncio
+async def test_failures_do_not_raise(mock_gemini):
+    """Test a Qdrant outage is counted, not propagated to the reply path"""
+    with patch("api.services.message_indexer.index_messages", side_effect=RuntimeError("down")):
+        buffer = MessageIndexBuffer(batch_size=2, flush_interval=60, max_pending=10)
+        buffer.start()
+        await buffer.submit(**_message(0))
+        await buffer.submit(**_message(1))
+        await buffer.stop()
+
+    assert buffer.stats["failed"] == 2
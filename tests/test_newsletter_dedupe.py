@@ -0,0 +1,111 @@
+"""Tests for intra-newsletter duplicate detection"""
+import pytest
+import numpy as np
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.services.newsletter_dedupe import cluster_near_duplicates, dedupe_newsletter_items
+from api.services.qdrant_service import init_qdrant_collections, index_item
+
+
+def _unit(dim_index: int) -> list:
+    vector = [0.0] * 768
+    vector[dim_index] = 1.0
+    return vector
+
+
+# Deterministic embeddings keyed by title
+EMBEDDINGS = {
+    "Basketball practice": _unit(0),
+    "Basketball Practice!": _unit(0),
+    "Pizza day": _unit(1),
+    "Field trip": [0.1] * 768,  # same vector as mock_gemini's single embedding
+}
+
+
+async def fake_embed_batch(texts, *args, **kwargs):
+    return [EMBEDDINGS[text.split("  ")[0].strip()] for text in texts]
+
+
+def test_cluster_near_duplicates_transitive():
+    """Test A~B and B~C cluster together while D stays alone"""
+    a = np.array([1.0, 0.0, 0.0])
+    b = np.array([0.95, 0.31, 0.0])
+    c = np.array([0.81, 0.59, 0.0])
+    d = np.array([0.0, 0.0, 1.0])
+
+    clusters = cluster_near_duplicates(np.stack([a, b, c, d]), threshold=0.94)
+
+    assert clusters == [[0, 1, 2], [3]]
+
+
+def test_cluster_empty():
+    """Test empty input"""
+    assert cluster_near_duplicates(np.zeros((0, 768))) == []
+
+
+@pytest.mark.asyncio
+async def test_dedupe_newsletter_items(mock_gemini, qdrant_memory):
+    """Test repeated items collapse and survivors are matched in one Qdrant call"""
+    await init_qdrant_collections()
+    existing_id = str(uuid.uuid4())
+    await index_item(existing_id, {"title": "Field trip", "audience_tags": ["all"]})
+
+    items = [
+        {"title": "Basketball practice", "source_page": 2, "confidence_score": 0.8},
+        {"title": "Pizza day", "source_page": 3, "confidence_score": 0.9},
+        {"title": "Basketball Practice!", "source_page": 9, "confidence_score": 0.95},
+        {"title": "Field trip", "source_page": 10, "confidence_score": 0.9},
+    ]
+
+    with patch("api.services.newsletter_dedupe.generate_embeddings", fake_embed_batch), \
+         patch.object(qdrant_memory, "query_batch_points", wraps=qdrant_memory.query_batch_points) as spy:
+        results = await dedupe_newsletter_items(items)
+
+    assert spy.call_count == 1
+    assert len(spy.call_args.kwargs["requests"]) == 3
+
+    assert len(results) == 3
+    basketball = results[0]
+    assert basketball["item_index"] == 2  # higher confidence copy from page 9
+    assert basketball["duplicate_indices"] == [0]
+    assert basketball["existing_matches"] == []
+
+    field_trip = results[2]
+    assert [m["id"] for m in field_trip["existing_matches"]] == [existing_id]
+
+
+@pytest.mark.asyncio
+async def test_review_newsletter_duplicates(mock_gemini, qdrant_memory):
+    """Test the admin review endpoint groups a newsletter's pending items"""
+    from api.models import Item, Newsletter
+    from api.routers.admin import review_newsletter_duplicates
+
+    await init_qdrant_collections()
+    school_id = str(uuid.uuid4())
+    existing_id = str(uuid.uuid4())
+    await index_item(existing_id, {"title": "Field trip", "audience_tags": ["all"], "school_id": school_id})
+
+    newsletter = Newsletter(id=str(uuid.uuid4()), school_id=school_id)
+    items = [
+        Item(id=str(uuid.uuid4()), title="Basketball practice", source_page=2, confidence_score=0.8),
+        Item(id=str(uuid.uuid4()), title="Basketball Practice!", source_page=9, confidence_score=0.95),
+        Item(id=str(uuid.uuid4()), title="Field trip", source_page=10, confidence_score=0.9),
+    ]
+
+    newsletter_result, items_result = MagicMock(), MagicMock()
+    newsletter_result.scalar_one_or_none.return_value = newsletter
+    items_result.scalars.return_value.all.return_value = items
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[newsletter_result, items_result])
+
+    with patch("api.services.newsletter_dedupe.generate_embeddings", fake_embed_batch):
+        response = await review_newsletter_duplicates(newsletter.id, threshold=0.85, db=db)
+
+    assert response["total_items"] == 3
+    assert response["total_groups"] == 2
+
+    basketball, field_trip = response["groups"]
+    assert basketball["item_id"] == items[1].id
+    assert basketball["duplicate_item_ids"] == [items[0].id]
+    assert [m["id"] for m in field_trip["existing_matches"]] == [existing_id]
@@ -7,12 +7,20 @@ from api.services.qdrant_service import (
     search_items,
     find_duplicate_items,
     get_recommendations,
+    list_upcoming_items,
+    find_similar_tickets,
+    search_items_batch,
+    find_duplicate_items_batch,
+    find_similar_tickets_batch,
     COLLECTION_ITEMS,
     COLLECTION_MESSAGES,
-    COLLECTION_TICKETS
+    COLLECTION_TICKETS,
+    DENSE_VECTOR_NAME,
+    SPARSE_VECTOR_NAME,
+    TENANT_KEY
 )
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 
 
 @pytest.fixture
@@ -51,9 +59,11 @@ async def test_collections_created(mock_gemini):
         assert COLLECTION_MESSAGES in collection_names
         assert COLLECTION_TICKETS in collection_names
 
-        # Verify vector dimension is 768
+        # Verify vector dimension is 768 (items: the default named vector)
         for call in calls:
             vectors_config = call.kwargs["vectors_config"]
+            if call.kwargs["collection_name"] == COLLECTION_ITEMS:
+                vectors_config = vectors_config[DENSE_VECTOR_NAME]
             assert vectors_config.size == 768
 
 
@@ -73,7 +83,8 @@ async def test_index_single_item(mock_gemini, sample_item):
         points = call_args.kwargs["points"]
         assert len(points) == 1
         assert points[0].id == item_id
-        assert len(points[0].vector) == 768
+        assert len(points[0].vector[DENSE_VECTOR_NAME]) == 768
+        assert points[0].vector[SPARSE_VECTOR_NAME].indices
 
 
 @pytest.mark.asyncio
@@ -115,7 +126,7 @@ async def test_semantic_search_similarity(mock_gemini):
             "type": "Event",
             "date": "2024-11-20"
         }
-        mock_client.search.return_value = [mock_hit]
+        mock_client.query_points.return_value = MagicMock(points=[mock_hit])
 
         results = await search_items("basketball game", parent_grades=[5])
 
@@ -124,6 +135,38 @@ async def test_semantic_search_similarity(mock_gemini):
         assert "title" in results[0]
 
 
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_dense_and_sparse(mock_gemini):
+    """Test hybrid search sends dense + sparse prefetches fused by RRF"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.query_points.return_value = MagicMock(points=[])
+
+        await search_items("hot lunch", limit=5)
+
+        assert mock_client.query_points.call_count == 1
+        call_kwargs = mock_client.query_points.call_args.kwargs
+        assert call_kwargs["query"].fusion == "rrf"
+
+        dense, sparse = call_kwargs["prefetch"]
+        assert len(dense.query) == 768
+        assert dense.score_threshold == 0.7
+        assert sparse.using == SPARSE_VECTOR_NAME
+        assert len(sparse.query.indices) == 2  # "hot", "lunch"
+
+
+@pytest.mark.asyncio
+async def test_dense_only_search(mock_gemini):
+    """Test dense-only search skips fusion"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.query_points.return_value = MagicMock(points=[])
+
+        await search_items("hot lunch", hybrid=False)
+
+        call_kwargs = mock_client.query_points.call_args.kwargs
+        assert call_kwargs["prefetch"] is None
+        assert len(call_kwargs["query"]) == 768
+
+
 @pytest.mark.asyncio
 async def test_duplicate_detection(mock_gemini):
     """Test duplicate item detection"""
@@ -148,33 +191,49 @@ async def test_duplicate_detection(mock_gemini):
 async def test_recommendations(mock_gemini):
     """Test recommendation engine"""
     with patch("api.services.qdrant_service.client") as mock_client:
-        # Mock engaged items retrieval
         engaged_id = str(uuid.uuid4())
-        mock_point = MagicMock()
-        mock_point.vector = [0.1] * 768
-        mock_client.retrieve.return_value = [mock_point]
+        dismissed_id = str(uuid.uuid4())
+        delivered_id = str(uuid.uuid4())
 
         # Mock recommendations
         mock_hit = MagicMock()
         mock_hit.id = str(uuid.uuid4())
         mock_hit.score = 0.88
         mock_hit.payload = {"title": "Similar event"}
-        mock_client.search.return_value = [mock_hit]
+        mock_client.query_points.return_value = MagicMock(points=[mock_hit])
 
         recommendations = await get_recommendations(
             engaged_item_ids=[engaged_id],
-            delivered_item_ids=[],
-            limit=5
+            delivered_item_ids=[delivered_id],
+            limit=5,
+            dismissed_item_ids=[dismissed_id],
+            parent_grades=[5]
         )
 
-        assert isinstance(recommendations, list)
+        assert len(recommendations) == 1
+        assert recommendations[0]["title"] == "Similar event"
+
+        # Single server-side recommend call, no client-side vector math
+        assert mock_client.query_points.call_count == 1
+        assert not mock_client.retrieve.called
+        assert not mock_client.search.called
+
+        call_kwargs = mock_client.query_points.call_args.kwargs
+        recommend = call_kwargs["query"].recommend
+        assert recommend.positive == [engaged_id]
+        assert recommend.negative == [dismissed_id]
+        assert call_kwargs["limit"] == 5
+
+        query_filter = call_kwargs["query_filter"]
+        assert query_filter.must_not[0].has_id == [delivered_id]
+        assert query_filter.should
 
 
 @pytest.mark.asyncio
 async def test_audience_filtering(mock_gemini):
     """Test audience tag filtering"""
     with patch("api.services.qdrant_service.client") as mock_client:
-        mock_client.search.return_value = []
+        mock_client.query_points.return_value = MagicMock(points=[])
 
         # Search with grade filter
         await search_items(
@@ -183,13 +242,13 @@ async def test_audience_filtering(mock_gemini):
             parent_activities=["Basketball"]
         )
 
-        # Verify filter was applied
-        assert mock_client.search.called
-        call_args = mock_client.search.call_args
-        query_filter = call_args.kwargs.get("query_filter")
-
-        # Should have filter conditions
-        assert query_filter is not None
+        # Verify filter was applied to both prefetch branches
+        assert mock_client.query_points.called
+        call_args = mock_client.query_points.call_args
+        for prefetch in call_args.kwargs["prefetch"]:
+            # Should have filter conditions
+            assert prefetch.filter is not None
+            assert len(prefetch.filter.should) == 3
 
 
 @pytest.mark.asyncio
@@ -198,7 +257,7 @@ async def test_search_latency_under_100ms(mock_gemini):
     import time
 
     with patch("api.services.qdrant_service.client") as mock_client:
-        mock_client.search.return_value = []
+        mock_client.query_points.return_value = MagicMock(points=[])
 
         start = time.time()
         await search_items("test query")
@@ -229,6 +288,363 @@ async def test_vector_dimension_correct(mock_gemini, sample_item):
 
         # Get the vector from upsert call
         points = mock_client.upsert.call_args.kwargs["points"]
-        vector = points[0].vector
+        vector = points[0].vector[DENSE_VECTOR_NAME]
 
         assert len(vector) == 768, "Vector dimension must match Gemini embedding (768)"
+
+
+@pytest.mark.asyncio
+async def test_item_dates_indexed(mock_gemini, sample_item):
+    """Test item dates are stored as ISO dates with datetime payload indexes"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.collection_exists.return_value = False
+        await init_qdrant_collections()
+
+        indexed = {
+            call.kwargs["field_name"]: call.kwargs["field_schema"]
+            for call in mock_client.create_payload_index.call_args_list
+        }
+        assert indexed["date"] == "datetime"
+        assert indexed["end_date"] == "datetime"
+
+        await index_item(str(uuid.uuid4()), {**sample_item, "date": date(2024, 11, 20)})
+
+        payload = mock_client.upsert.call_args.kwargs["points"][0].payload
+        assert payload["date"] == "2024-11-20"
+        assert payload["end_date"] == "2024-11-20"  # single-day event
+
+
+@pytest.mark.asyncio
+async def test_search_date_window(mock_gemini):
+    """Test date_from/date_to filter and date ordering"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        later, sooner = MagicMock(), MagicMock()
+        later.id, later.score, later.payload = "a", 0.9, {"date": "2024-11-22"}
+        sooner.id, sooner.score, sooner.payload = "b", 0.8, {"date": "2024-11-19"}
+        mock_client.query_points.return_value = MagicMock(points=[later, sooner])
+
+        results = await search_items(
+            "events",
+            date_from=date(2024, 11, 18),
+            date_to=date(2024, 11, 24),
+            order_by_date=True
+        )
+
+        assert [r["id"] for r in results] == ["b", "a"]
+
+        prefetch = mock_client.query_points.call_args.kwargs["prefetch"][0]
+        date_keys = {c.key: c.range for c in prefetch.filter.must}
+        assert date_keys["date"].lte == date(2024, 11, 24)
+        assert date_keys["end_date"].gte == date(2024, 11, 18)
+
+
+@pytest.mark.asyncio
+async def test_list_upcoming_items_skips_embedding(mock_gemini):
+    """Test upcoming items is a filtered, date-ordered query without embedding"""
+    with patch("api.services.qdrant_service.client") as mock_client, \
+         patch("api.services.qdrant_service.generate_embedding") as mock_embed:
+        mock_client.query_points.return_value = MagicMock(points=[])
+
+        await list_upcoming_items(date(2024, 11, 18), date(2024, 11, 24), parent_grades=[5])
+
+        assert not mock_embed.called
+        call_kwargs = mock_client.query_points.call_args.kwargs
+        assert call_kwargs["query"].order_by.key == "date"
+        assert len(call_kwargs["query_filter"].must) == 2
+
+
+@pytest.mark.asyncio
+async def test_tenant_index_per_collection(mock_gemini):
+    """Test school_id is a tenant index with per-tenant HNSW on every collection"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.collection_exists.return_value = False
+
+        await init_qdrant_collections()
+
+        for call in mock_client.create_collection.call_args_list:
+            hnsw = call.kwargs["hnsw_config"]
+            assert hnsw.payload_m > 0
+            assert hnsw.m == hnsw.payload_m  # global graph kept for unscoped queries
+
+        tenant_calls = [
+            call.kwargs for call in mock_client.create_payload_index.call_args_list
+            if call.kwargs["field_name"] == TENANT_KEY
+        ]
+        assert {c["collection_name"] for c in tenant_calls} == {
+            COLLECTION_ITEMS, COLLECTION_MESSAGES, COLLECTION_TICKETS
+        }
+        assert all(c["field_schema"].is_tenant for c in tenant_calls)
+
+
+@pytest.mark.asyncio
+async def test_hnsw_profile_applied(mock_gemini):
+    """Test the configured profile sets index params and search-time ef"""
+    from api.services.qdrant_service import settings, hnsw_config, HNSW_PROFILES
+
+    profile = HNSW_PROFILES["high-recall"]
+
+    with patch.object(settings, "qdrant_hnsw_profile", "high-recall"), \
+         patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.collection_exists.return_value = False
+        mock_client.query_points.return_value = MagicMock(points=[])
+
+        await init_qdrant_collections()
+        await search_items("practice", parent_grades=[5], hybrid=False)
+
+        hnsw = mock_client.create_collection.call_args.kwargs["hnsw_config"]
+        assert (hnsw.payload_m, hnsw.ef_construct) == (profile["m"], profile["ef_construct"])
+        assert mock_client.query_points.call_args.kwargs["search_params"].hnsw_ef == profile["hnsw_ef"]
+
+        # Existing collections are moved to the profile
+        mock_client.collection_exists.return_value = True
+        mock_client.get_collection.return_value.config.hnsw_config.payload_m = 16
+        await init_qdrant_collections()
+        assert mock_client.update_collection.call_count == 3
+        assert all(
+            call.kwargs["hnsw_config"].m == profile["m"]
+            for call in mock_client.update_collection.call_args_list
+        )
+
+    with pytest.raises(ValueError):
+        hnsw_config("fastest")
+
+
+@pytest.mark.asyncio
+async def test_queries_scoped_by_school(mock_gemini, sample_item):
+    """Test indexing stores school_id and every query filters on it"""
+    school_id = str(uuid.uuid4())
+
+    with patch("api.services.qdrant_service.client") as mock_client:
+        mock_client.query_points.return_value = MagicMock(points=[])
+        mock_client.search.return_value = []
+
+        await index_item(str(uuid.uuid4()), {**sample_item, "school_id": school_id})
+        payload = mock_client.upsert.call_args.kwargs["points"][0].payload
+        assert payload[TENANT_KEY] == school_id
+
+        def tenant_values(query_filter):
+            return [c.match.value for c in query_filter.must if c.key == TENANT_KEY]
+
+        await search_items("events", school_id=school_id)
+        for prefetch in mock_client.query_points.call_args.kwargs["prefetch"]:
+            assert tenant_values(prefetch.filter) == [school_id]
+
+        await get_recommendations([str(uuid.uuid4())], [], school_id=school_id)
+        assert tenant_values(mock_client.query_points.call_args.kwargs["query_filter"]) == [school_id]
+
+        await find_duplicate_items("Basketball practice", school_id=school_id)
+        assert tenant_values(mock_client.search.call_args.kwargs["query_filter"]) == [school_id]
+
+        await find_similar_tickets("Wrong date", school_id=school_id)
+        assert tenant_values(mock_client.search.call_args.kwargs["query_filter"]) == [school_id]
+
+
+def test_create_client_modes(tmp_path):
+    """Test embedded memory/local modes and invalid mode"""
+    from api.services.qdrant_service import create_client
+
+    memory_client = create_client(mode="memory")
+    assert memory_client.get_collections().collections == []
+
+    local_client = create_client(mode="local", path=str(tmp_path / "qdrant"))
+    local_client.create_collection(
+        collection_name="pilot",
+        vectors_config={"size": 4, "distance": "Cosine"}
+    )
+    local_client.close()
+
+    # On-disk data survives a restart
+    reopened = create_client(mode="local", path=str(tmp_path / "qdrant"))
+    assert reopened.collection_exists("pilot")
+    reopened.close()
+
+    with pytest.raises(ValueError):
+        create_client(mode="cluster")
+
+
+@pytest.mark.asyncio
+async def test_embedded_round_trip(mock_gemini, qdrant_memory, sample_item):
+    """Test index -> search -> recommend against embedded Qdrant"""
+    school_a, school_b = str(uuid.uuid4()), str(uuid.uuid4())
+    await init_qdrant_collections()
+
+    engaged_id, candidate_id, other_school_id = (str(uuid.uuid4()) for _ in range(3))
+    await index_item(engaged_id, {**sample_item, "school_id": school_a})
+    await index_item(candidate_id, {**sample_item, "title": "Basketball game", "school_id": school_a})
+    await index_item(other_school_id, {**sample_item, "school_id": school_b})
+
+    results = await search_items("basketball", parent_grades=[5], school_id=school_a)
+    assert {r["id"] for r in results} == {engaged_id, candidate_id}
+
+    upcoming = await list_upcoming_items(
+        date(2024, 11, 18), date(2024, 11, 24), parent_grades=[5], school_id=school_b
+    )
+    assert [r["id"] for r in upcoming] == [other_school_id]
+
+    recommendations = await get_recommendations(
+        engaged_item_ids=[engaged_id],
+        delivered_item_ids=[],
+        parent_grades=[5],
+        school_id=school_a
+    )
+    assert [r["id"] for r in recommendations] == [candidate_id]
+
+    recommendations = await get_recommendations(
+        engaged_item_ids=[engaged_id],
+        delivered_item_ids=[candidate_id],
+        school_id=school_a
+    )
+    assert recommendations == []
+
+
+@pytest.mark.asyncio
+async def test_legacy_items_collection_falls_back_to_dense(mock_gemini, qdrant_memory, sample_item):
+    """Test a pre-hybrid items collection (dense vector only) still indexes and searches"""
+    from qdrant_client.models import Distance, VectorParams
+
+    qdrant_memory.create_collection(
+        COLLECTION_ITEMS, vectors_config=VectorParams(size=768, distance=Distance.COSINE)
+    )
+    await init_qdrant_collections()
+
+    item_id = str(uuid.uuid4())
+    await index_item(item_id, sample_item)
+    assert qdrant_memory.count(COLLECTION_ITEMS).count == 1
+
+    results = await search_items("basketball", parent_grades=[5])  # hybrid by default
+    assert [r["id"] for r in results] == [item_id]
+
+
+@pytest.mark.asyncio
+async def test_batch_variants_single_round_trip(mock_gemini):
+    """Test batch search/dedupe/ticket lookups issue one query_batch_points each"""
+    with patch("api.services.qdrant_service.client") as mock_client:
+        hit = MagicMock()
+        hit.id, hit.score, hit.payload = "item-1", 0.9, {"title": "Basketball practice"}
+        mock_client.query_batch_points.side_effect = lambda collection_name, requests: [
+            MagicMock(points=[hit]) for _ in requests
+        ]
+
+        queries = [f"query {i}" for i in range(20)]
+        results = await search_items_batch(queries, parent_grades=[5], school_id="school-1")
+
+        assert mock_client.query_batch_points.call_count == 1
+        assert len(results) == 20
+        requests = mock_client.query_batch_points.call_args.kwargs["requests"]
+        assert len(requests) == 20
+        assert all(r.query.fusion == "rrf" for r in requests)
+
+        duplicates = await find_duplicate_items_batch(
+            ["Basketball practice", "Pizza day"],
+            exclude_ids=["item-1", None]
+        )
+        assert mock_client.query_batch_points.call_count == 2
+        assert duplicates[0] == []  # the item itself is excluded
+        assert duplicates[1][0]["id"] == "item-1"
+
+        tickets = await find_similar_tickets_batch(["Wrong date", "Wrong time"])
+        assert mock_client.query_batch_points.call_count == 3
+        assert mock_client.query_batch_points.call_args.kwargs["collection_name"] == COLLECTION_TICKETS
+        assert len(tickets) == 2
+        assert not mock_client.search.called
+
+
+@pytest.mark.asyncio
+async def test_review_page_duplicates_scoped_per_school(mock_gemini):
+    """Test the admin review page looks up duplicates once per school, by that school"""
+    from api.models import Item
+    from api.routers.admin import _similar_items
+
+    school_a, school_b = str(uuid.uuid4()), str(uuid.uuid4())
+    items = [
+        Item(id=uuid.uuid4(), title="Pizza day", school_id=school_a),
+        Item(id=uuid.uuid4(), title="Book fair", school_id=school_b),
+        Item(id=uuid.uuid4(), title="Pizza lunch", school_id=school_a),
+    ]
+
+    async def duplicates(texts, exclude_ids=None, school_id=None):
+        return [[{"id": f"{school_id}:{text}", "title": text, "score": 0.9}] for text in texts]
+
+    with patch("api.routers.admin.find_duplicate_items_batch", side_effect=duplicates) as mock_batch:
+        similar = await _similar_items(items)
+
+    assert sorted(call.kwargs["school_id"] for call in mock_batch.call_args_list) == sorted([school_a, school_b])
+    assert similar[str(items[2].id)][0]["id"].startswith(school_a)
+    assert similar[str(items[1].id)][0]["id"].startswith(school_b)
+
+
+@pytest.mark.asyncio
+async def test_batch_search_matches_single(mock_gemini, qdrant_memory, sample_item):
+    """Test batch search returns the same results, in order, as single search"""
+    await init_qdrant_collections()
+    for title in ["Basketball practice", "Hot lunch", "Band concert"]:
+        await index_item(str(uuid.uuid4()), {**sample_item, "title": title})
+
+    queries = ["hot lunch", "band"]
+    batch = await search_items_batch(queries, parent_grades=[5])
+    single = [await search_items(q, parent_grades=[5]) for q in queries]
+
+    assert batch == single
+
+
+def test_event_key_canonical():
+    """Test repeats of one event share a key; other dates/titles do not"""
+    from api.services.qdrant_service import event_key
+
+    practice = {"type": "Event", "title": "Basketball Practice!", "date": date(2024, 11, 20)}
+
+    assert event_key(practice) == event_key({**practice, "title": "practice - basketball"})
+    assert event_key(practice) != event_key({**practice, "date": date(2024, 11, 27)})
+    assert event_key(practice) != event_key({**practice, "title": "Basketball game"})
+    assert event_key({"title": "The"}) is None
+
+
+@pytest.mark.asyncio
+async def test_grouped_search_one_hit_per_event(mock_gemini, qdrant_memory, sample_item):
+    """Test the same event from several newsletters is returned once"""
+    from api.services.qdrant_service import EVENT_KEY, NEWSLETTER_KEY
+
+    await init_qdrant_collections()
+    for _ in range(3):
+        await index_item(str(uuid.uuid4()), {**sample_item, "source_newsletter_id": uuid.uuid4()})
+    await index_item(str(uuid.uuid4()), {**sample_item, "title": "Pizza day"})
+
+    flat = await search_items("basketball", parent_grades=[5])
+    grouped = await search_items("basketball", parent_grades=[5], group_by=EVENT_KEY)
+    by_newsletter = await search_items("basketball", parent_grades=[5], group_by=NEWSLETTER_KEY)
+
+    assert len(flat) == 4
+    assert sorted(r["title"] for r in grouped) == ["Basketball practice", "Pizza day"]
+    assert len(by_newsletter) == 3  # the item without a newsletter has no group
+
+
+@pytest.mark.asyncio
+async def test_find_item_by_image(mock_gemini, qdrant_memory, sample_item, tmp_path):
+    """Test a re-sent flyer photo matches the item parsed from it"""
+    from PIL import Image, ImageDraw
+    from api.services.qdrant_service import find_item_by_image, IMAGE_VECTOR_NAME
+    from api.services.image_embedding import embed_image
+
+    flyer = Image.new("RGB", (600, 800), "white")
+    ImageDraw.Draw(flyer).rectangle((50, 50, 550, 300), fill="navy")
+    flyer_path = tmp_path / "flyer.png"
+    flyer.save(flyer_path)
+
+    await init_qdrant_collections()
+    flyer_item_id = str(uuid.uuid4())
+    await index_item(flyer_item_id, {**sample_item, "image_path": str(flyer_path)})
+    await index_item(str(uuid.uuid4()), {**sample_item, "title": "Pizza day"})  # text-only item
+
+    [point] = qdrant_memory.retrieve(COLLECTION_ITEMS, ids=[flyer_item_id], with_vectors=True)
+    assert IMAGE_VECTOR_NAME in point.vector
+
+    resent = tmp_path / "resent.jpg"
+    flyer.resize((300, 400)).save(resent, quality=60)
+    match = await find_item_by_image(embed_image(str(resent)))
+    assert match["id"] == flyer_item_id
+
+    other = Image.new("RGB", (600, 800), "white")
+    ImageDraw.Draw(other).ellipse((100, 400, 500, 750), fill="red")
+    other_path = tmp_path / "other.png"
+    other.save(other_path)
+    assert await find_item_by_image(embed_image(str(other_path))) is None
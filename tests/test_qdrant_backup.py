@@ -0,0 +1,93 @@
+"""Tests for Qdrant export/import, snapshots and warm-up"""
+import pytest
+import uuid
+from unittest.mock import MagicMock, patch
+
+from api.services.qdrant_backup import (
+    export_collection,
+    import_collection,
+    restore_collections,
+    warm_up_collections,
+)
+from api.services.qdrant_service import (
+    init_qdrant_collections,
+    index_item,
+    index_messages,
+    COLLECTION_ITEMS,
+    COLLECTION_MESSAGES,
+    COLLECTION_TICKETS,
+    DENSE_VECTOR_NAME,
+    SPARSE_VECTOR_NAME,
+)
+
+
+async def _seed():
+    await init_qdrant_collections()
+    item_id = str(uuid.uuid4())
+    await index_item(item_id, {
+        "title": "Basketball practice",
+        "audience_tags": ["grade_5"],
+        "school_id": uuid.uuid4()
+    })
+    await index_messages([
+        {"message_id": str(uuid.uuid4()), "parent_id": str(uuid.uuid4()),
+         "message_text": f"Question {i}", "intent": "query"}
+        for i in range(3)
+    ])
+    return item_id
+
+
+@pytest.mark.asyncio
+async def test_export_import_round_trip(mock_gemini, qdrant_memory, tmp_path):
+    """Test vectors and payloads survive export -> empty store -> import"""
+    item_id = await _seed()
+    [before] = qdrant_memory.retrieve(COLLECTION_ITEMS, ids=[item_id], with_vectors=True)
+
+    assert export_collection(COLLECTION_ITEMS, tmp_path / "items.npz") == 1
+    assert export_collection(COLLECTION_MESSAGES, tmp_path / "messages.npz", half_precision=True) == 3
+
+    for collection_name in (COLLECTION_ITEMS, COLLECTION_MESSAGES, COLLECTION_TICKETS):
+        qdrant_memory.delete_collection(collection_name)
+
+    with patch("api.services.qdrant_service.generate_embeddings") as embed:
+        assert await import_collection(COLLECTION_ITEMS, tmp_path / "items.npz") == 1
+        assert await import_collection(COLLECTION_MESSAGES, tmp_path / "messages.npz") == 3
+    embed.assert_not_called()
+
+    [after] = qdrant_memory.retrieve(COLLECTION_ITEMS, ids=[item_id], with_vectors=True)
+    assert after.payload == before.payload
+    assert after.vector[DENSE_VECTOR_NAME] == pytest.approx(before.vector[DENSE_VECTOR_NAME])
+    assert after.vector[SPARSE_VECTOR_NAME].indices == before.vector[SPARSE_VECTOR_NAME].indices
+    assert after.vector[SPARSE_VECTOR_NAME].values == pytest.approx(before.vector[SPARSE_VECTOR_NAME].values)
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_scoped_searches(mock_gemini, qdrant_memory):
+    """Test warm-up samples stored points and searches with them"""
+    await _seed()
+
+    with patch.object(qdrant_memory, "query_points", wraps=qdrant_memory.query_points) as spy:
+        stats = warm_up_collections(queries_per_collection=2)
+
+    assert stats[COLLECTION_ITEMS]["queries"] == 1
+    assert stats[COLLECTION_MESSAGES]["queries"] == 2
+    assert stats[COLLECTION_TICKETS]["queries"] == 0
+    # 3 samples + 3 searches
+    assert spy.call_count == 6
+
+    item_search = [c.kwargs for c in spy.call_args_list if isinstance(c.kwargs["query"], list)][0]
+    assert item_search["query_filter"] is not None  # scoped to the point's school
+
+
+def test_restore_builds_server_location():
+    """Test bare snapshot names resolve to the configured server"""
+    with patch("api.services.qdrant_service.client", MagicMock()) as mock_client:
+        restore_collections({
+            COLLECTION_ITEMS: "items-2024.snapshot",
+            COLLECTION_TICKETS: "file:///qdrant/snapshots/tickets.snapshot"
+        })
+
+    locations = [c.kwargs["location"] for c in mock_client.recover_snapshot.call_args_list]
+    assert locations[0].endswith(f"/collections/{COLLECTION_ITEMS}/snapshots/items-2024.snapshot")
+    assert locations[1] == "file:///qdrant/snapshots/tickets.snapshot"
@@ -0,0 +1,152 @@
+"""Tests for the Qdrant outbox relay and reconciliation"""
+import pytest
+import uuid
+from datetime import date
+from unittest.mock import MagicMock, patch
+from sqlalchemy import select
+
+from api.models import Item, Newsletter, QdrantOutbox
+from api.services.qdrant_outbox import (
+    enqueue_item_sync,
+    item_index_data,
+    relay_outbox_batch,
+    reconcile_qdrant_items,
+)
+from api.services.qdrant_service import (
+    init_qdrant_collections,
+    index_items,
+    list_item_point_ids,
+)
+
+
+def test_enqueue_operation_follows_status():
+    """Test approved items enqueue upserts and others enqueue deletes"""
+    db = MagicMock()
+
+    approved = enqueue_item_sync(db, Item(id=uuid.uuid4(), status="approved"))
+    rejected = enqueue_item_sync(db, Item(id=uuid.uuid4(), status="rejected"))
+
+    assert approved.operation == "upsert"
+    assert rejected.operation == "delete"
+    assert db.add.call_count == 2
+
+
+def test_items_inherit_newsletter_school(sqlite_db):
+    """Test new items take their newsletter's school_id, the Qdrant tenant key"""
+    school_id = str(uuid.uuid4())
+
+    newsletter = Newsletter(id=str(uuid.uuid4()), school_id=school_id, publish_date=date(2024, 11, 1),
+                            file_hash="abc", file_path="uploads/abc.pdf")
+    item = Item(id=str(uuid.uuid4()), type="Event", title="Basketball practice",
+                audience_tags=["grade_5"], source_newsletter_id=newsletter.id)
+    sqlite_db.add_all([newsletter, item])
+    sqlite_db.commit()
+
+    assert item.school_id == school_id
+    assert item_index_data(item)["school_id"] == school_id
+
+    # Rows written before the column was filled fall back to the newsletter
+    legacy = Item(school_id=None, newsletter=Newsletter(school_id=school_id))
+    assert item_index_data(legacy)["school_id"] == school_id
+
+
+@pytest.mark.asyncio
+async def test_relay_syncs_current_state(test_db, mock_gemini, qdrant_memory):
+    """Test relay upserts approved items, deletes rejected ones, keeps updated_at"""
+    await init_qdrant_collections()
+
+    kept = Item(type="Event", title="Basketball practice", audience_tags=["grade_5"],
+                status="approved", date=date(2024, 11, 20))
+    dropped = Item(type="Event", title="Cancelled assembly", audience_tags=["all"],
+                   status="approved")
+    test_db.add_all([kept, dropped])
+    await test_db.flush()
+    enqueue_item_sync(test_db, kept)
+    enqueue_item_sync(test_db, dropped)
+    await test_db.commit()
+
+    stats = await relay_outbox_batch(test_db)
+    assert stats == {"entries": 2, "upserted": 2, "deleted": 0, "failed": 0}
+    assert set(list_item_point_ids()) == {str(kept.id), str(dropped.id)}
+
+    updated_at = kept.updated_at
+    dropped.status = "rejected"
+    enqueue_item_sync(test_db, dropped)
+    await test_db.commit()
+
+    stats = await relay_outbox_batch(test_db)
+    assert stats["deleted"] == 1
+    assert list_item_point_ids() == [str(kept.id)]
+
+    await test_db.refresh(kept)
+    assert kept.qdrant_id == str(kept.id)
+    assert kept.updated_at == updated_at
+
+
+@pytest.mark.asyncio
+async def test_relay_retries_with_backoff(test_db, mock_gemini, qdrant_memory):
+    """Test a Qdrant failure leaves entries pending with backoff"""
+    item = Item(type="Event", title="Pizza day", audience_tags=["all"], status="approved")
+    test_db.add(item)
+    await test_db.flush()
+    enqueue_item_sync(test_db, item)
+    await test_db.commit()
+
+    with patch("api.services.qdrant_outbox.index_items", side_effect=RuntimeError("down")):
+        stats = await relay_outbox_batch(test_db)
+
+    assert stats["entries"] == 1
+    entry = (await test_db.execute(select(QdrantOutbox))).scalars().one()
+    assert entry.status == "pending"
+    assert entry.attempts == 1
+    assert entry.last_error == "down"
+
+    # Not due yet
+    assert (await relay_outbox_batch(test_db))["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_enqueues_missing_and_orphaned(test_db, mock_gemini, qdrant_memory):
+    """Test reconciliation finds approved items without points and stray points"""
+    await init_qdrant_collections()
+
+    item = Item(type="Event", title="Band concert", audience_tags=["all"], status="approved")
+    test_db.add(item)
+    await test_db.commit()
+
+    orphan_id = str(uuid.uuid4())
+    await index_items([(orphan_id, {"title": "Deleted item"})])
+
+    assert await reconcile_qdrant_items(test_db) == {"missing": 1, "orphaned": 1}
+
+    await relay_outbox_batch(test_db)
+    assert list_item_point_ids() == [str(item.id)]
+
+
+@pytest.mark.asyncio
+async def test_relay_and_reconcile_on_sqlite(sqlite_db, mock_gemini, qdrant_memory):
+    """Test the relay runs on a sync SQLite session and reconcile leaves pending items alone"""
+    await init_qdrant_collections()
+    db = sqlite_db
+
+    item = Item(id=str(uuid.uuid4()), type="Event", title="Band concert",
+                audience_tags=["all"], status="approved")
+    db.add(item)
+    enqueue_item_sync(db, item)
+    db.commit()
+
+    # Not indexed yet, but the relay already has it: nothing to repair
+    assert await reconcile_qdrant_items(db) == {"missing": 0, "orphaned": 0}
+    assert db.query(QdrantOutbox).count() == 1
+
+    stats = await relay_outbox_batch(db)
+    assert (stats["entries"], stats["upserted"]) == (1, 1)
+    assert list_item_point_ids() == [item.id]
+    db.refresh(item)
+    assert item.qdrant_id == item.id
+
+    orphan_id = str(uuid.uuid4())
+    await index_items([(orphan_id, {"title": "Deleted item"})])
+    assert await reconcile_qdrant_items(db) == {"missing": 0, "orphaned": 1}
+    await relay_outbox_batch(db)
+    assert list_item_point_ids() == [item.id]
@@ -0,0 +1,175 @@
+"""Tests for Qdrant retention pruning and history compaction"""
+import pytest
+import threading
+import time
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+from qdrant_client.models import PointStruct
+
+from api.services.qdrant_retention import (
+    prune_collection,
+    compact_parent_history,
+    backfill_timestamps,
+    summary_point_id,
+    UUID1_EPOCH,
+)
+from api.services.qdrant_service import (
+    init_qdrant_collections,
+    index_messages,
+    index_ticket,
+    COLLECTION_MESSAGES,
+    COLLECTION_TICKETS,
+)
+
+NOW = time.time()
+DAY = 86400
+
+
+def _messages(parent_id: str, ages_in_days: list) -> list:
+    return [
+        {
+            "message_id": str(uuid.uuid4()),
+            "parent_id": parent_id,
+            "message_text": f"Question {i}",
+            "intent": "query",
+            "timestamp": int(NOW - age * DAY)
+        }
+        for i, age in enumerate(ages_in_days)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_payload_timestamp_is_epoch_int(mock_gemini, qdrant_memory):
+    """Test messages and tickets store integer epoch timestamps"""
+    await init_qdrant_collections()
+    [message_id] = await index_messages(_messages(str(uuid.uuid4()), [0]))
+    ticket_id = str(uuid.uuid4())
+    await index_ticket(ticket_id, str(uuid.uuid4()), "Wrong date", "correction")
+
+    [message] = qdrant_memory.retrieve(COLLECTION_MESSAGES, ids=[message_id])
+    [ticket] = qdrant_memory.retrieve(COLLECTION_TICKETS, ids=[ticket_id])
+    assert isinstance(message.payload["timestamp"], int)
+    assert abs(ticket.payload["timestamp"] - NOW) < 60
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_only_expired_in_batches(mock_gemini, qdrant_memory):
+    """Test points past retention are deleted across several batches"""
+    await init_qdrant_collections()
+    await index_messages(_messages(str(uuid.uuid4()), [1, 10, 100, 120, 200, 365, 400]))
+
+    deleted = await prune_collection(COLLECTION_MESSAGES, retention_days=90, batch_size=2, now=NOW)
+
+    assert deleted == 5
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 2
+
+
+@pytest.mark.asyncio
+async def test_compact_parent_history(mock_gemini, qdrant_memory):
+    """Test expired messages fold into one summary per parent, merged on rerun"""
+    await init_qdrant_collections()
+    parent_a, parent_b = str(uuid.uuid4()), str(uuid.uuid4())
+    await index_messages(_messages(parent_a, [100, 120, 5]) + _messages(parent_b, [200]))
+
+    assert await compact_parent_history(90, now=NOW) == {"messages": 3, "parents": 2}
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 3  # 1 recent + 2 summaries
+
+    # Summaries survive pruning and absorb later expiries
+    await prune_collection(COLLECTION_MESSAGES, retention_days=90, now=NOW)
+    await compact_parent_history(1, now=NOW)
+
+    [summary] = qdrant_memory.retrieve(COLLECTION_MESSAGES, ids=[summary_point_id(parent_a)])
+    assert summary.payload["summary"] is True
+    assert summary.payload["message_count"] == 3
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 2
+
+
+@pytest.mark.asyncio
+async def test_compact_keeps_finished_pages_on_failure(mock_gemini, qdrant_memory):
+    """Test each page is folded and deleted before the next is read"""
+    await init_qdrant_collections()
+    parent_id = str(uuid.uuid4())
+    await index_messages(_messages(parent_id, [100, 120, 150, 200]))
+
+    scroll = qdrant_memory.scroll
+    calls = []
+
+    def failing_second_page(*args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return scroll(*args, **kwargs)
+
+    with patch.object(qdrant_memory, "scroll", failing_second_page):
+        with pytest.raises(RuntimeError):
+            await compact_parent_history(90, batch_size=2, now=NOW)
+
+    # First page already folded: 2 messages left + 1 summary
+    [summary] = qdrant_memory.retrieve(COLLECTION_MESSAGES, ids=[summary_point_id(parent_id)])
+    assert summary.payload["message_count"] == 2
+    assert qdrant_memory.count(COLLECTION_MESSAGES).count == 3
+
+    assert await compact_parent_history(90, batch_size=2, now=NOW) == {"messages": 2, "parents": 1}
+    [summary] = qdrant_memory.retrieve(COLLECTION_MESSAGES, ids=[summary_point_id(parent_id)])
+    assert summary.payload["message_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_backfill_legacy_timestamps(mock_gemini, qdrant_memory):
+    """Test uuid1-time string and missing timestamps become epoch ints, then expire"""
+    await init_qdrant_collections()
+    old, recent = str(uuid.uuid4()), str(uuid.uuid4())
+    qdrant_memory.upsert(COLLECTION_MESSAGES, points=[
+        PointStruct(id=point_id, vector=[0.1] * 768, payload={
+            "parent_id": str(uuid.uuid4()),
+            "timestamp": str(int((NOW - age * DAY) * 10_000_000) + UUID1_EPOCH)
+        })
+        for point_id, age in ((old, 200), (recent, 1))
+    ])
+    ticket_id = str(uuid.uuid4())
+    qdrant_memory.upsert(COLLECTION_TICKETS, points=[
+        PointStruct(id=ticket_id, vector=[0.1] * 768, payload={"parent_id": str(uuid.uuid4())})
+    ])
+
+    # Before backfill the range filter cannot see them
+    assert await prune_collection(COLLECTION_MESSAGES, retention_days=90, now=NOW) == 0
+
+    assert await backfill_timestamps(COLLECTION_MESSAGES, batch_size=1, now=NOW) == 2
+    assert await backfill_timestamps(COLLECTION_TICKETS, now=NOW) == 1
+    assert await backfill_timestamps(COLLECTION_MESSAGES, now=NOW) == 0
+
+    [message] = qdrant_memory.retrieve(COLLECTION_MESSAGES, ids=[old])
+    assert abs(message.payload["timestamp"] - (NOW - 200 * DAY)) < 2
+    [ticket] = qdrant_memory.retrieve(COLLECTION_TICKETS, ids=[ticket_id])
+    assert ticket.payload["timestamp"] == int(NOW)
+
+    assert await prune_collection(COLLECTION_MESSAGES, retention_days=90, now=NOW) == 1
+    assert [p.id for p in qdrant_memory.scroll(COLLECTION_MESSAGES)[0]] == [recent]
+
+
+@pytest.mark.asyncio
+async def test_client_calls_off_event_loop(mock_gemini, qdrant_memory):
+    """Test scroll/delete/upsert run in worker threads, not on the event loop"""
+    await init_qdrant_collections()
+    await index_messages(_messages(str(uuid.uuid4()), [100, 200]))
+    await index_ticket(str(uuid.uuid4()), str(uuid.uuid4()), "Wrong date", "correction",
+                       created_at=datetime.utcfromtimestamp(NOW - 400 * DAY))
+
+    threads = []
+
+    def spy(method):
+        def call(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return method(*args, **kwargs)
+        return call
+
+    with patch.object(qdrant_memory, "scroll", spy(qdrant_memory.scroll)), \
+         patch.object(qdrant_memory, "delete", spy(qdrant_memory.delete)), \
+         patch.object(qdrant_memory, "upsert", spy(qdrant_memory.upsert)):
+        await compact_parent_history(90, now=NOW)
+        await prune_collection(COLLECTION_TICKETS, retention_days=90, now=NOW)
+
+    assert len(threads) >= 5
+    assert threading.get_ident() not in threads